@@ -13,14 +13,26 @@
 #    limitations under the License.
 
 import os
+from io import BytesIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Any
 
+import numpy as np
 import pytest
+import tifffile
+from czifile import (
+    CziCompressionType,
+    CziDirectoryEntryDV,
+    CziFile,
+    CziSubBlockSegmentData,
+)
+from decoy import Decoy
+from PIL import Image
 from pydicom.uid import JPEG2000, UID, JPEGBaseline8Bit
 from wsidicom import WsiDicom
 from wsidicom.codec.encoder import Encoder, Jpeg2kEncoder, Jpeg2kSettings
+from wsidicom.geometry import Point
 
 from wsidicomizer.wsidicomizer import WsiDicomizer
 
@@ -702,6 +714,105 @@ class Jpeg2kTestEncoder(Jpeg2kEncoder):
         return "YBR_ICT"
 
 
+def write_jpeg_tables_tiff(path: Path, array: np.ndarray, tile_size: int) -> None:
+    """Write a tiled JPEG tiff with the quantization and huffman tables shared in
+    the JPEGTables tag and left out of the tiles, as libtiff writes them."""
+    tables: bytes | None = None
+    tiles: list[bytes] = []
+    for y in range(0, array.shape[0], tile_size):
+        for x in range(0, array.shape[1], tile_size):
+            tile = np.zeros((tile_size, tile_size, 3), np.uint8)
+            stored = array[y : y + tile_size, x : x + tile_size]
+            tile[: stored.shape[0], : stored.shape[1]] = stored
+            with BytesIO() as buffer:
+                Image.fromarray(tile).save(buffer, format="jpeg", quality=90)
+                frame = buffer.getvalue()
+            tile_tables, abbreviated = _split_jpeg_tables(frame)
+            assert tables is None or tables == tile_tables
+            tables = tile_tables
+            tiles.append(abbreviated)
+    assert tables is not None
+    tifffile.imwrite(
+        path,
+        iter(tiles),
+        shape=array.shape,
+        dtype=np.uint8,
+        tile=(tile_size, tile_size),
+        photometric="ycbcr",
+        subsampling=(2, 2),
+        compression="jpeg",
+        extratags=[(347, 7, len(tables), tables, True)],
+    )
+
+
+def _split_jpeg_tables(frame: bytes) -> tuple[bytes, bytes]:
+    """Split a JPEG frame into a tables-only frame and an abbreviated frame."""
+    tables: list[bytes] = []
+    segments: list[bytes] = []
+    index = 2
+    while True:
+        marker = frame[index + 1]
+        length = int.from_bytes(frame[index + 2 : index + 4], "big")
+        segment = frame[index : index + 2 + length]
+        if marker in (0xDB, 0xC4):
+            tables.append(segment)
+        elif marker in (0xC0, 0xDA):
+            segments.append(segment)
+        if marker == 0xDA:
+            segments.append(frame[index + 2 + length :])
+            break
+        index += 2 + length
+    return (
+        b"\xff\xd8" + b"".join(tables) + b"\xff\xd9",
+        b"\xff\xd8" + b"".join(segments),
+    )
+
+
+def _encode_jpeg(pixels: np.ndarray) -> bytes:
+    with BytesIO() as buffer:
+        Image.fromarray(pixels).save(buffer, format="jpeg")
+        return buffer.getvalue()
+
+
+class CziBlocks:
+    """Builds a czi file mock holding RGB subblocks."""
+
+    def __init__(self, decoy: Decoy):
+        self._decoy = decoy
+        self.czi = decoy.mock(cls=CziFile)
+        self.blocks: list[CziDirectoryEntryDV] = []
+
+    def add(
+        self,
+        start: Point,
+        pixels: np.ndarray,
+        compression: CziCompressionType = CziCompressionType.UNCOMPRESSED,
+        scene: int = -1,
+    ) -> bytes:
+        """Add subblock with pixels at start, returning the stored bytes."""
+        stored = (
+            _encode_jpeg(pixels)
+            if compression == CziCompressionType.JPEG
+            else pixels.tobytes()
+        )
+        block = self._decoy.mock(cls=CziDirectoryEntryDV)
+        self._decoy.when(block.dims).then_return(("Y", "X", "S"))
+        self._decoy.when(block.start).then_return((start.y, start.x, 0))
+        self._decoy.when(block.shape).then_return(pixels.shape)
+        self._decoy.when(block.dtype).then_return(np.dtype(np.uint8))
+        self._decoy.when(block.compression).then_return(compression)
+        self._decoy.when(block.scene_index).then_return(scene)
+        segment = self._decoy.mock(cls=CziSubBlockSegmentData)
+        self._decoy.when(segment.data()).then_return(pixels)
+        self._decoy.when(segment.data(raw=True)).then_return(stored)
+        self._decoy.when(block.read_segment_data(self.czi)).then_return(segment)
+        self.blocks.append(block)
+        self._decoy.when(self.czi.filtered_subblock_directory).then_return(
+            tuple(self.blocks)
+        )
+        return stored
+
+
 def convert_wsi(file_path: Path, file_parameters: dict[str, Any], encoder: Encoder):
     # `convert_levels` (optional, None = all) bounds cost when transcoding. A
     # passthrough-capable format can set `force_transcoding: False` to wrap its native
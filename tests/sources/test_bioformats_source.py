@@ -0,0 +1,543 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+from decoy import Decoy, matchers
+from PIL import Image
+from pydicom.uid import JPEGBaseline8Bit
+from upath import UPath
+from wsidicom.codec import Encoder, JpegSettings
+from wsidicom.geometry import Point, PointMm, Region, Size, SizeMm
+
+from wsidicomizer.config import Settings, use_settings
+from wsidicomizer.extras.bioformats import bioformats_reader, bioformats_source
+from wsidicomizer.extras.bioformats.bioformats_image_data import BioformatsImageData
+from wsidicomizer.extras.bioformats.bioformats_reader import (
+    BioformatsReader,
+    BioFormatsReaderPool,
+)
+from wsidicomizer.extras.bioformats.bioformats_source import BioformatsSource
+from wsidicomizer.extras.bioformats.memo_cache import evict_memo_files
+
+
+@contextmanager
+def read_image(pixels: np.ndarray) -> Iterator[np.ndarray]:
+    """Context returning the pixels, as `BioformatsReader.read_image()`."""
+    yield pixels
+
+
+@contextmanager
+def get_reader(java_reader: Any) -> Iterator[Any]:
+    """Context returning the reader, as `BioFormatsReaderPool.get_reader()`."""
+    yield java_reader
+
+
+@pytest.fixture
+def reader(decoy: Decoy) -> BioformatsReader:
+    reader = decoy.mock(cls=BioformatsReader)
+    decoy.when(reader.size(0, 0)).then_return(Size(100, 70))
+    decoy.when(reader.optimal_tile_size(0, 0)).then_return(Size(32, 32))
+    return reader
+
+
+@pytest.fixture
+def java_reader(decoy: Decoy) -> Any:
+    """Bio-Formats reader leased from the pool of the file reader."""
+    return decoy.mock(name="java_reader")
+
+
+@pytest.fixture
+def metadata_store(decoy: Decoy) -> Any:
+    """Bio-Formats metadata store of the file reader."""
+    return decoy.mock(name="metadata_store")
+
+
+@pytest.fixture
+def file_reader(
+    decoy: Decoy,
+    monkeypatch: pytest.MonkeyPatch,
+    java_reader: Any,
+    metadata_store: Any,
+    tmp_path: Path,
+) -> BioformatsReader:
+    """Reader reading through a pool of Bio-Formats readers, without a JVM."""
+    pool = decoy.mock(cls=BioFormatsReaderPool)
+    decoy.when(pool.get_reader()).then_do(lambda: get_reader(java_reader))
+    monkeypatch.setattr(
+        bioformats_reader, "BioFormatsReaderPool", lambda *args, **kwargs: pool
+    )
+    file_reader = BioformatsReader(tmp_path.joinpath("slide.vsi"), 1)
+    monkeypatch.setattr(file_reader, "_metadata_store", metadata_store)
+    return file_reader
+
+
+def stub_java_value(decoy: Decoy, value: object) -> Any:
+    """Return a Java object mock that returns value from the methods used to
+    get the value of Java boxed values and enumerations."""
+    java_value = decoy.mock(name="java_value")
+    decoy.when(java_value.getValue()).then_return(value)
+    decoy.when(java_value.booleanValue()).then_return(value)
+    decoy.when(java_value.doubleValue()).then_return(value)
+    return java_value
+
+
+@pytest.mark.unittest
+class TestBioformatsReader:
+    @pytest.mark.parametrize(
+        ["settings", "expected_warm_readers"],
+        [(Settings(), 1), (Settings(bioformats_warm_readers=None), 4)],
+    )
+    def test_readers_are_warmed_on_open(
+        self,
+        decoy: Decoy,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        settings: Settings,
+        expected_warm_readers: int,
+    ):
+        # Arrange
+        pool = decoy.mock(cls=BioFormatsReaderPool)
+        monkeypatch.setattr(
+            bioformats_reader, "BioFormatsReaderPool", lambda *args, **kwargs: pool
+        )
+
+        # Act
+        with use_settings(settings):
+            BioformatsReader(tmp_path.joinpath("slide.vsi"), 4)
+
+        # Assert
+        decoy.verify(pool.warm(expected_warm_readers), times=1)
+
+    @pytest.mark.parametrize(
+        ["physical_size", "expected_pixel_spacing"],
+        [
+            # Given in another unit, e.g. 250 nm, converted to micrometers.
+            (0.25, SizeMm(0.00025, 0.0005)),
+            # Not convertible to micrometers, e.g. given in pixels.
+            (None, None),
+        ],
+    )
+    def test_pixel_spacing_is_converted_to_mm(
+        self,
+        decoy: Decoy,
+        monkeypatch: pytest.MonkeyPatch,
+        file_reader: BioformatsReader,
+        java_reader: Any,
+        metadata_store: Any,
+        physical_size: float | None,
+        expected_pixel_spacing: SizeMm | None,
+    ):
+        # Arrange
+        micrometer = object()
+        monkeypatch.setattr(
+            bioformats_reader, "_get_micrometer_unit", lambda: micrometer
+        )
+        length_x = decoy.mock(name="length_x")
+        decoy.when(length_x.value(micrometer)).then_return(
+            None if physical_size is None else stub_java_value(decoy, physical_size)
+        )
+        length_y = decoy.mock(name="length_y")
+        decoy.when(length_y.value(micrometer)).then_return(stub_java_value(decoy, 0.5))
+        decoy.when(metadata_store.getPixelsPhysicalSizeX(0)).then_return(length_x)
+        decoy.when(metadata_store.getPixelsPhysicalSizeY(0)).then_return(length_y)
+        decoy.when(java_reader.getSizeX()).then_return(1000)
+        decoy.when(java_reader.getResolutionCount()).then_return(1)
+
+        # Act
+        pixel_spacing = file_reader.pixel_spacing(0)
+
+        # Assert
+        assert pixel_spacing == expected_pixel_spacing
+
+    def test_pixel_spacing_is_none_if_physical_size_is_not_set(
+        self, decoy: Decoy, file_reader: BioformatsReader, metadata_store: Any
+    ):
+        # Arrange
+        decoy.when(metadata_store.getPixelsPhysicalSizeX(0)).then_return(None)
+        decoy.when(metadata_store.getPixelsPhysicalSizeY(0)).then_return(None)
+
+        # Act
+        pixel_spacing = file_reader.pixel_spacing(0)
+
+        # Assert
+        assert pixel_spacing is None
+
+    @pytest.mark.parametrize("interleaved", [True, False])
+    def test_read_image_has_samples_last(
+        self,
+        decoy: Decoy,
+        file_reader: BioformatsReader,
+        java_reader: Any,
+        metadata_store: Any,
+        interleaved: bool,
+    ):
+        # Arrange
+        pixels = np.random.default_rng(0).integers(0, 255, (2, 4, 3), np.uint8)
+        stored = pixels if interleaved else np.moveaxis(pixels, 2, 0)
+        decoy.when(metadata_store.getPixelsType(0)).then_return(
+            stub_java_value(decoy, "uint8")
+        )
+        decoy.when(metadata_store.getPixelsInterleaved(0)).then_return(
+            stub_java_value(decoy, interleaved)
+        )
+        decoy.when(metadata_store.getChannelSamplesPerPixel(0, 0)).then_return(
+            stub_java_value(decoy, 3)
+        )
+        decoy.when(java_reader.openBytes(0, 8, 16, 4, 2)).then_return(stored.tobytes())
+
+        # Act
+        with file_reader.read_image(
+            0, 0, Region(Point(8, 16), Size(4, 2)), Size(5, 3)
+        ) as data:
+            read = data.copy()
+
+        # Assert
+        expected = np.zeros((3, 5, 3), np.uint8)
+        expected[:2, :4] = pixels
+        assert np.array_equal(read, expected)
+
+
+@pytest.mark.unittest
+class TestBioformatsImageData:
+    def test_tiles_are_read_in_one_block_and_padded(
+        self, decoy: Decoy, reader: BioformatsReader
+    ):
+        # Arrange
+        pixels = np.random.default_rng(0).integers(0, 255, (70, 100, 3), np.uint8)
+        decoy.when(
+            reader.read_image(0, 0, Region(Point(0, 0), Size(100, 70)))
+        ).then_return(read_image(pixels))
+        image_data = BioformatsImageData(reader, 32, decoy.mock(cls=Encoder), 0, 0)
+        tiles = list(Region(Point(0, 0), Size(4, 3)).iterate_all())
+
+        # Act
+        decoded_tiles = list(image_data.get_decoded_tiles(tiles, 0.0, "0"))
+
+        # Assert
+        for tile, decoded_tile in zip(tiles, decoded_tiles, strict=True):
+            expected = np.zeros((32, 32, 3), np.uint8)
+            source = pixels[
+                tile.y * 32 : (tile.y + 1) * 32, tile.x * 32 : (tile.x + 1) * 32
+            ]
+            expected[: source.shape[0], : source.shape[1]] = source
+            assert np.array_equal(decoded_tile, expected)
+            assert decoded_tile.flags.c_contiguous
+
+    def test_edge_tile_is_read_alone_and_padded(
+        self, decoy: Decoy, reader: BioformatsReader
+    ):
+        # Arrange
+        pixels = np.random.default_rng(0).integers(0, 255, (6, 4, 3), np.uint8)
+        # Non-interleaved data is read as a view with samples last.
+        planar = np.ascontiguousarray(np.moveaxis(pixels, 2, 0))
+        decoy.when(
+            reader.read_image(0, 0, Region(Point(96, 64), Size(4, 6)))
+        ).then_return(read_image(np.moveaxis(planar, 0, 2)))
+        image_data = BioformatsImageData(reader, 32, decoy.mock(cls=Encoder), 0, 0)
+
+        # Act
+        decoded_tile = image_data.get_decoded_tile(Point(3, 2), 0.0, "0")
+
+        # Assert
+        expected = np.zeros((32, 32, 3), np.uint8)
+        expected[:6, :4] = pixels
+        assert np.array_equal(decoded_tile, expected)
+        assert decoded_tile.flags.c_contiguous
+
+    def test_tile_filling_block_is_copied_out_of_read_data(
+        self, decoy: Decoy, reader: BioformatsReader
+    ):
+        # Arrange
+        pixels = np.random.default_rng(0).integers(0, 255, (32, 32, 3), np.uint8)
+        decoy.when(
+            reader.read_image(0, 0, Region(Point(32, 0), Size(32, 32)))
+        ).then_return(read_image(pixels))
+        image_data = BioformatsImageData(reader, 32, decoy.mock(cls=Encoder), 0, 0)
+
+        # Act
+        decoded_tile = image_data.get_decoded_tile(Point(1, 0), 0.0, "0")
+
+        # Assert
+        assert np.array_equal(decoded_tile, pixels)
+        assert not np.shares_memory(decoded_tile, pixels)
+
+    @pytest.mark.parametrize(
+        ["optimal_tile_size", "expected_tile_size"],
+        [
+            (Size(240, 240), Size(480, 480)),
+            (Size(1024, 1024), Size(1024, 1024)),
+            (Size(100, 8), Size(512, 512)),
+        ],
+    )
+    def test_tile_size_is_aligned_to_optimal_tile_size(
+        self,
+        decoy: Decoy,
+        reader: BioformatsReader,
+        optimal_tile_size: Size,
+        expected_tile_size: Size,
+    ):
+        # Arrange
+        decoy.when(reader.optimal_tile_size(0, 0)).then_return(optimal_tile_size)
+
+        # Act
+        with use_settings(Settings(default_tile_size=512)):
+            image_data = BioformatsImageData(
+                reader, None, decoy.mock(cls=Encoder), 0, 0
+            )
+
+        # Assert
+        assert image_data.tile_size == expected_tile_size
+
+    @pytest.mark.parametrize(
+        [
+            "tile_size",
+            "align_tile_size",
+            "optimal_tile_size",
+            "expected_tile_size",
+            "expected_regions",
+        ],
+        [
+            (
+                512,
+                True,
+                Size(240, 240),
+                Size(480, 480),
+                [
+                    Region(Point(0, 0), Size(960, 200)),
+                    Region(Point(960, 0), Size(480, 200)),
+                ],
+            ),
+            (
+                256,
+                False,
+                Size(384, 384),
+                Size(256, 256),
+                [
+                    Region(Point(0, 0), Size(768, 200)),
+                    Region(Point(768, 0), Size(672, 200)),
+                ],
+            ),
+        ],
+    )
+    def test_blocks_are_aligned_to_optimal_tiles(
+        self,
+        decoy: Decoy,
+        reader: BioformatsReader,
+        tile_size: int,
+        align_tile_size: bool,
+        optimal_tile_size: Size,
+        expected_tile_size: Size,
+        expected_regions: list[Region],
+    ):
+        # Arrange
+        pixels = np.random.default_rng(0).integers(0, 255, (200, 1440, 3), np.uint8)
+        decoy.when(reader.size(0, 0)).then_return(Size(1440, 200))
+        decoy.when(reader.optimal_tile_size(0, 0)).then_return(optimal_tile_size)
+        for region in expected_regions:
+            decoy.when(reader.read_image(0, 0, region)).then_return(
+                read_image(pixels[:, region.start.x : region.end.x])
+            )
+        with use_settings(Settings(default_tile_size=512, region_read_max_width=1000)):
+            image_data = BioformatsImageData(
+                reader,
+                tile_size,
+                decoy.mock(cls=Encoder),
+                0,
+                0,
+                align_tile_size=align_tile_size,
+            )
+        tiles = list(
+            Region(Point(0, 0), Size(image_data.tiled_size.width, 1)).iterate_all()
+        )
+
+        # Act
+        decoded_tiles = list(image_data.get_decoded_tiles(tiles, 0.0, "0"))
+
+        # Assert
+        assert image_data.tile_size == expected_tile_size
+        width = expected_tile_size.width
+        for tile, decoded_tile in zip(tiles, decoded_tiles, strict=True):
+            source = pixels[:, tile.x * width : (tile.x + 1) * width]
+            assert np.array_equal(decoded_tile[:200, : source.shape[1]], source)
+
+    def test_compressed_tiles_inside_image_are_passed_through(
+        self, decoy: Decoy, reader: BioformatsReader
+    ):
+        # Arrange
+        with BytesIO() as buffer:
+            Image.new("RGB", (32, 32), (255, 0, 0)).save(buffer, format="jpeg")
+            frame = buffer.getvalue()
+        decoy.when(reader.dtype(0)).then_return(np.dtype(np.uint8))
+        decoy.when(reader.samples_per_pixel(0)).then_return(3)
+        decoy.when(reader.compressed_tile_codec(0, 0)).then_return("JPEGCodec")
+        decoy.when(reader.compressed_tiled_size(0, 0)).then_return(Size(4, 3))
+        decoy.when(reader.read_compressed_tile(0, 0, Point(0, 0))).then_return(frame)
+        decoy.when(reader.read_compressed_tile(0, 0, Point(1, 1))).then_return(
+            b"passed through"
+        )
+        edge_pixels = np.zeros((32, 4, 3), np.uint8)
+        decoy.when(
+            reader.read_image(0, 0, Region(Point(96, 0), Size(4, 32)))
+        ).then_return(read_image(edge_pixels))
+        encoder = decoy.mock(cls=Encoder)
+        decoy.when(encoder.transfer_syntax).then_return(JPEGBaseline8Bit)
+        decoy.when(encoder.photometric_interpretation).then_return("YBR_FULL_422")
+        decoy.when(encoder.encode(matchers.Anything())).then_return(b"encoded")
+        image_data = BioformatsImageData(reader, 32, encoder, 0, 0)
+
+        # Act
+        encoded_tiles = list(
+            image_data.get_encoded_tiles([Point(1, 1), Point(3, 0)], 0.0, "0")
+        )
+
+        # Assert
+        assert image_data.transcoder is None
+        assert encoded_tiles == [b"passed through", b"encoded"]
+
+    def test_compressed_tiles_are_not_passed_through_if_forced(
+        self, decoy: Decoy, reader: BioformatsReader
+    ):
+        # Arrange
+        encoder = decoy.mock(cls=Encoder)
+        decoy.when(encoder.transfer_syntax).then_return(JPEGBaseline8Bit)
+
+        # Act
+        image_data = BioformatsImageData(
+            reader, 32, encoder, 0, 0, force_transcoding=True
+        )
+
+        # Assert
+        assert image_data.transcoder is encoder
+
+
+@pytest.fixture
+def source_reader(decoy: Decoy, monkeypatch: pytest.MonkeyPatch) -> BioformatsReader:
+    """Reader of a file with two images, the first smaller than the second, and a
+    label, used by sources created in the test."""
+    reader = decoy.mock(cls=BioformatsReader)
+    decoy.when(reader.images_count).then_return(3)
+    decoy.when(reader.image_name(2)).then_return("Label")
+    decoy.when(reader.max_readers).then_return(2)
+    decoy.when(reader.samples_per_pixel(matchers.Anything())).then_return(3)
+    decoy.when(reader.dtype(matchers.Anything())).then_return(np.dtype(np.uint8))
+    for image_index, size in enumerate((Size(64, 32), Size(128, 96), Size(16, 8))):
+        decoy.when(reader.size(image_index)).then_return(size)
+        decoy.when(reader.size(image_index, 0)).then_return(size)
+        decoy.when(reader.optimal_tile_size(image_index, 0)).then_return(Size(32, 32))
+        decoy.when(reader.pixel_spacing(image_index, 0)).then_return(
+            SizeMm(0.001, 0.001)
+        )
+        decoy.when(reader.pyramid_levels(image_index)).then_return({(0, 0.0, "0"): 0})
+    monkeypatch.setattr(
+        bioformats_source, "BioformatsReader", lambda *args, **kwargs: reader
+    )
+    return reader
+
+
+@pytest.mark.unittest
+class TestBioformatsSource:
+    def test_images_with_positions_are_opened_as_separate_pyramids(
+        self, decoy: Decoy, source_reader: BioformatsReader, tmp_path: Path
+    ):
+        # Arrange
+        decoy.when(source_reader.position(0)).then_return(PointMm(12, 8))
+        decoy.when(source_reader.position(1)).then_return(PointMm(10, 5))
+        source = BioformatsSource(
+            UPath(tmp_path.joinpath("slide.vsi")),
+            Encoder.create_for_settings(JpegSettings()),
+        )
+
+        # Act
+        instances = source.level_instances
+
+        # Assert
+        assert source.pyramid_image_indices == [1, 0]
+        assert [instance.size for instance in instances] == [
+            Size(128, 96),
+            Size(64, 32),
+        ]
+        first_system = instances[0].image_data.image_coordinate_system
+        second_system = instances[1].image_data.image_coordinate_system
+        assert first_system is not None
+        assert second_system is not None
+        assert first_system.origin == PointMm(10, 5)
+        assert second_system.origin == first_system.image_to_slide(PointMm(2, 3))
+        assert [instance.size for instance in source.label_instances] == [Size(16, 8)]
+
+    def test_only_largest_image_is_opened_if_positions_are_missing(
+        self, decoy: Decoy, source_reader: BioformatsReader, tmp_path: Path
+    ):
+        # Arrange
+        decoy.when(source_reader.position(1)).then_return(PointMm(10, 5))
+        source = BioformatsSource(
+            UPath(tmp_path.joinpath("slide.vsi")),
+            Encoder.create_for_settings(JpegSettings()),
+        )
+
+        # Act
+        instances = source.level_instances
+
+        # Assert
+        assert source.pyramid_image_indices == [1]
+        assert [instance.size for instance in instances] == [Size(128, 96)]
+        assert instances[0].image_data.image_coordinate_system is None
+
+
+@pytest.mark.unittest
+class TestEvictMemoFiles:
+    def test_expired_and_least_recently_used_are_removed(self, tmp_path: Path):
+        # Arrange
+        now = time.time()
+        memo_files = {
+            "folder/.expired.bfmemo": 100,
+            "folder/nested/.oldest.bfmemo": 50,
+            ".newest.bfmemo": 10,
+        }
+        for name, age in memo_files.items():
+            memo_file = tmp_path.joinpath(name)
+            memo_file.parent.mkdir(parents=True, exist_ok=True)
+            memo_file.write_bytes(bytes(100))
+            os.utime(memo_file, (now - age, now - age))
+        other_file = tmp_path.joinpath("other")
+        other_file.write_bytes(bytes(1000))
+        os.utime(other_file, (now - 1000, now - 1000))
+
+        # Act
+        evict_memo_files(tmp_path, max_size=150, max_age=80)
+
+        # Assert
+        assert sorted(path.name for path in tmp_path.rglob("*.bfmemo")) == [
+            ".newest.bfmemo"
+        ]
+        assert other_file.exists()
+
+    def test_no_limits_keeps_memo_files(self, tmp_path: Path):
+        # Arrange
+        memo_file = tmp_path.joinpath(".memo.bfmemo")
+        memo_file.write_bytes(bytes(100))
+
+        # Act
+        evict_memo_files(tmp_path, max_size=None, max_age=None)
+
+        # Assert
+        assert memo_file.exists()
@@ -0,0 +1,206 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from fsspec.core import url_to_fs
+from fsspec.implementations.memory import MemoryFileSystem
+from upath import UPath
+
+from wsidicomizer.sources.opentile.block_cache import (
+    BlockCache,
+    BlockCacheFileSystem,
+    get_block_cached_path,
+)
+
+BLOCK_SIZE = 16
+
+
+class RecordingFileSystem(MemoryFileSystem):
+    """Memory filesystem recording the ranges read with `cat_file()`."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.ranges: list[tuple[int | None, int | None]] = []
+
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        self.ranges.append((start, end))
+        return super().cat_file(path, start, end, **kwargs)
+
+
+@pytest.fixture
+def data() -> bytes:
+    return np.random.default_rng(0).bytes(10 * BLOCK_SIZE)
+
+
+@pytest.fixture
+def path(data: bytes) -> Iterator[str]:
+    path = f"/{uuid4()}/file.bin"
+    MemoryFileSystem().pipe(path, data)
+    yield path
+    MemoryFileSystem().rm(path)
+
+
+@pytest.fixture
+def fs() -> RecordingFileSystem:
+    return RecordingFileSystem(skip_instance_cache=True)
+
+
+@pytest.mark.unittest
+class TestBlockCache:
+    @pytest.mark.parametrize(
+        ["start", "end"], [(0, 1), (5, 40), (0, 10 * BLOCK_SIZE), (150, 200)]
+    )
+    def test_read(
+        self,
+        fs: RecordingFileSystem,
+        path: str,
+        data: bytes,
+        start: int,
+        end: int,
+    ):
+        # Arrange
+        cache = BlockCache(fs, BLOCK_SIZE, 16)
+
+        # Act
+        read = cache.read(path, start, end)
+
+        # Assert
+        assert read == data[start:end]
+        cache.close()
+
+    def test_missing_blocks_are_fetched_once_per_run(
+        self, fs: RecordingFileSystem, path: str, data: bytes
+    ):
+        # Arrange
+        cache = BlockCache(fs, BLOCK_SIZE, 16)
+
+        # Act
+        reads = cache.read_ranges(path, [(0, 20), (20, 40), (100, 110)])
+        cache.read(path, 10, 30)
+
+        # Assert
+        assert reads == [data[0:20], data[20:40], data[100:110]]
+        assert sorted(fs.ranges) == [(0, 3 * BLOCK_SIZE), (6 * BLOCK_SIZE, 112)]
+        cache.close()
+
+    def test_read_no_ranges(self, fs: RecordingFileSystem, path: str):
+        # Arrange
+        cache = BlockCache(fs, BLOCK_SIZE, 16, read_ahead=2)
+
+        # Act
+        reads = cache.read_ranges(path, [])
+        cache.close()
+
+        # Assert
+        assert reads == []
+        assert fs.ranges == []
+
+    def test_least_recently_used_block_is_evicted(
+        self, fs: RecordingFileSystem, path: str
+    ):
+        # Arrange
+        cache = BlockCache(fs, BLOCK_SIZE, 2)
+        for index in (0, 2, 4):
+            cache.read(path, index * BLOCK_SIZE, index * BLOCK_SIZE + 1)
+        fs.ranges.clear()
+
+        # Act
+        cache.read(path, 0, 1)
+
+        # Assert
+        assert fs.ranges == [(0, BLOCK_SIZE)]
+        cache.close()
+
+    def test_evicted_block_is_read_from_disk_if_spilled(
+        self, fs: RecordingFileSystem, path: str, data: bytes
+    ):
+        # Arrange
+        cache = BlockCache(fs, BLOCK_SIZE, 1, spill_size=4)
+        for index in (0, 2, 4):
+            cache.read(path, index * BLOCK_SIZE, index * BLOCK_SIZE + 1)
+        fs.ranges.clear()
+
+        # Act
+        read = cache.read(path, 0, BLOCK_SIZE)
+
+        # Assert
+        assert read == data[0:BLOCK_SIZE]
+        assert fs.ranges == []
+        cache.close()
+
+    def test_sequential_reads_fetch_ahead(self, fs: RecordingFileSystem, path: str):
+        # Arrange
+        cache = BlockCache(fs, BLOCK_SIZE, 16, read_ahead=2)
+
+        # Act
+        cache.read(path, 0, BLOCK_SIZE)
+        cache.read(path, BLOCK_SIZE, 2 * BLOCK_SIZE)
+        cache.close()
+
+        # Assert
+        assert (2 * BLOCK_SIZE, 4 * BLOCK_SIZE) in fs.ranges
+
+    def test_random_reads_do_not_fetch_ahead(self, fs: RecordingFileSystem, path: str):
+        # Arrange
+        cache = BlockCache(fs, BLOCK_SIZE, 16, read_ahead=2)
+
+        # Act
+        cache.read(path, 0, BLOCK_SIZE)
+        cache.read(path, 5 * BLOCK_SIZE, 6 * BLOCK_SIZE)
+        cache.close()
+
+        # Assert
+        assert sorted(fs.ranges) == [(0, BLOCK_SIZE), (5 * BLOCK_SIZE, 6 * BLOCK_SIZE)]
+
+
+@pytest.mark.unittest
+class TestBlockCacheFileSystem:
+    def test_open_remote_file_through_block_cache(self, path: str, data: bytes):
+        # Arrange
+        cached_path, cached_options = get_block_cached_path(
+            UPath(f"memory://{path}"), None
+        )
+        assert cached_options is not None
+
+        # Act
+        fs, fs_path = url_to_fs(str(cached_path), **cached_options)
+        with fs.open(fs_path) as file:
+            file.seek(30)
+            read = file.read(50)
+
+        # Assert
+        assert isinstance(fs, BlockCacheFileSystem)
+        assert read == data[30:80]
+        assert fs.cat_ranges([fs_path] * 2, [0, 100], [10, 120]) == [
+            data[0:10],
+            data[100:120],
+        ]
+        fs.close()
+
+    def test_local_file_is_not_cached(self, tmp_path: Path):
+        # Arrange
+        path = UPath(tmp_path / "file.bin")
+
+        # Act
+        cached_path, cached_options = get_block_cached_path(path, None)
+
+        # Assert
+        assert cached_path == path
+        assert cached_options is None
@@ -0,0 +1,311 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import numpy as np
+import pytest
+from czifile import CziCompressionType
+from decoy import Decoy
+from pydicom.uid import JPEGBaseline8Bit
+from wsidicom.codec import Encoder
+from wsidicom.geometry import Point, PointMm, Region, Size, SizeMm
+from wsidicom.metadata import Image as ImageMetadata
+from wsidicom.metadata import ImageCoordinateSystem
+
+from tests.conftest import CziBlocks
+from wsidicomizer.config import Settings, use_settings
+from wsidicomizer.sources.czi.czi_image_data import CziImageData
+from wsidicomizer.sources.czi.czi_metadata import CziMetadata
+
+PIXEL_SPACING = SizeMm(0.0005, 0.0005)
+
+
+@pytest.fixture
+def czi_blocks(decoy: Decoy) -> CziBlocks:
+    return CziBlocks(decoy)
+
+
+@pytest.fixture
+def czi_metadata(decoy: Decoy) -> CziMetadata:
+    czi_metadata = decoy.mock(cls=CziMetadata)
+    decoy.when(czi_metadata.focal_plane_mapping).then_return([0.0])
+    decoy.when(czi_metadata.channel_mapping).then_return(["1"])
+    return czi_metadata
+
+
+@pytest.fixture
+def encoder(decoy: Decoy) -> Encoder:
+    encoder = decoy.mock(cls=Encoder)
+    decoy.when(encoder.transfer_syntax).then_return(JPEGBaseline8Bit)
+    decoy.when(encoder.photometric_interpretation).then_return("YBR_FULL_422")
+    return encoder
+
+
+@pytest.fixture
+def pixels() -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 255, (64, 64, 3), dtype=np.uint8)
+
+
+def create_image_data(
+    czi_blocks: CziBlocks,
+    czi_metadata: CziMetadata,
+    encoder: Encoder,
+    tile_size: int | None = None,
+    force_transcoding: bool = False,
+    scene: int | None = None,
+    image_coordinate_system: ImageCoordinateSystem | None = None,
+) -> CziImageData:
+    return CziImageData(
+        czi_blocks.czi,
+        tile_size,
+        encoder,
+        czi_metadata,
+        ImageMetadata(
+            pixel_spacing=PIXEL_SPACING,
+            image_coordinate_system=image_coordinate_system,
+        ),
+        force_transcoding,
+        scene,
+    )
+
+
+@pytest.mark.unittest
+class TestCziImageData:
+    def test_jpeg_subblocks_aligned_with_tiles_are_passed_through(
+        self,
+        czi_blocks: CziBlocks,
+        czi_metadata: CziMetadata,
+        encoder: Encoder,
+        pixels: np.ndarray,
+    ):
+        # Arrange
+        stored = {
+            start: czi_blocks.add(
+                start,
+                pixels[start.y : start.y + 32, start.x : start.x + 32],
+                CziCompressionType.JPEG,
+            )
+            for start in (Point(0, 0), Point(32, 0), Point(0, 32), Point(32, 32))
+        }
+        image_data = create_image_data(czi_blocks, czi_metadata, encoder)
+
+        # Act
+        encoded_tile = image_data.get_encoded_tile(Point(1, 0), 0.0, "1")
+
+        # Assert
+        assert image_data.tile_size == Size(32, 32)
+        assert image_data.passthrough
+        assert image_data.transcoder is None
+        assert encoded_tile == stored[Point(32, 0)]
+
+    @pytest.mark.parametrize(
+        ["compression", "photometric_interpretation", "force_transcoding"],
+        [
+            (CziCompressionType.UNCOMPRESSED, "YBR_FULL_422", False),
+            (CziCompressionType.JPEG, "RGB", False),
+            (CziCompressionType.JPEG, "YBR_FULL_422", True),
+        ],
+    )
+    def test_subblocks_not_matching_encoder_are_not_passed_through(
+        self,
+        decoy: Decoy,
+        czi_blocks: CziBlocks,
+        czi_metadata: CziMetadata,
+        encoder: Encoder,
+        pixels: np.ndarray,
+        compression: CziCompressionType,
+        photometric_interpretation: str,
+        force_transcoding: bool,
+    ):
+        # Arrange
+        czi_blocks.add(Point(0, 0), pixels[:32, :32], compression)
+        czi_blocks.add(Point(32, 0), pixels[:32, 32:], compression)
+        decoy.when(encoder.photometric_interpretation).then_return(
+            photometric_interpretation
+        )
+
+        # Act
+        image_data = create_image_data(
+            czi_blocks, czi_metadata, encoder, force_transcoding=force_transcoding
+        )
+
+        # Assert
+        assert not image_data.passthrough
+        assert image_data.transcoder is encoder
+
+    def test_subblocks_not_aligned_with_tiles_are_not_passed_through(
+        self,
+        czi_blocks: CziBlocks,
+        czi_metadata: CziMetadata,
+        encoder: Encoder,
+        pixels: np.ndarray,
+    ):
+        # Arrange
+        czi_blocks.add(Point(0, 0), pixels[:32, :32], CziCompressionType.JPEG)
+        czi_blocks.add(Point(32, 0), pixels[:32, 32:], CziCompressionType.JPEG)
+
+        # Act
+        image_data = create_image_data(czi_blocks, czi_metadata, encoder, 16)
+
+        # Assert
+        assert not image_data.passthrough
+
+    def test_tile_size_of_large_subblock_is_default_tile_size(
+        self,
+        czi_blocks: CziBlocks,
+        czi_metadata: CziMetadata,
+        encoder: Encoder,
+        pixels: np.ndarray,
+    ):
+        # Arrange
+        czi_blocks.add(Point(0, 0), pixels)
+
+        # Act
+        with use_settings(Settings(default_tile_size=16, czi_max_block_tile_size=32)):
+            image_data = create_image_data(czi_blocks, czi_metadata, encoder)
+
+        # Assert
+        assert image_data.tile_size == Size(16, 16)
+
+    @pytest.mark.parametrize(
+        "region",
+        [
+            Region(Point(20, 10), Size(30, 40)),
+            Region(Point(0, 0), Size(64, 64)),
+            Region(Point(31, 31), Size(2, 2)),
+        ],
+    )
+    def test_read_region_across_subblocks(
+        self,
+        czi_blocks: CziBlocks,
+        czi_metadata: CziMetadata,
+        encoder: Encoder,
+        pixels: np.ndarray,
+        region: Region,
+    ):
+        # Arrange
+        for start in (Point(0, 0), Point(32, 0), Point(0, 32), Point(32, 32)):
+            block_pixels = pixels[start.y : start.y + 32, start.x : start.x + 32]
+            czi_blocks.add(start, block_pixels)
+        image_data = create_image_data(czi_blocks, czi_metadata, encoder, 16)
+
+        # Act
+        read = image_data.read_region(region, 0.0, "1")
+
+        # Assert
+        assert np.array_equal(
+            read,
+            pixels[region.start.y : region.end.y, region.start.x : region.end.x],
+        )
+
+    def test_read_region_from_irregular_subblocks(
+        self,
+        czi_blocks: CziBlocks,
+        czi_metadata: CziMetadata,
+        encoder: Encoder,
+        pixels: np.ndarray,
+    ):
+        # Arrange
+        czi_blocks.add(Point(0, 0), pixels[:30, :40])
+        czi_blocks.add(Point(40, 0), pixels[:30, 40:])
+        czi_blocks.add(Point(0, 30), pixels[30:, :50])
+        expected = pixels.copy()
+        expected[30:, 50:] = 255
+        image_data = create_image_data(czi_blocks, czi_metadata, encoder)
+        region = Region(Point(30, 20), Size(30, 40))
+
+        # Act
+        read = image_data.read_region(region, 0.0, "1")
+
+        # Assert
+        assert image_data.tile_size == Size(512, 512)
+        assert np.array_equal(
+            read,
+            expected[region.start.y : region.end.y, region.start.x : region.end.x],
+        )
+
+    def test_detect_scenes(self, czi_blocks: CziBlocks, pixels: np.ndarray):
+        # Arrange
+        czi_blocks.add(Point(0, 0), pixels, scene=1)
+        czi_blocks.add(Point(64, 0), pixels, scene=0)
+        czi_blocks.add(Point(0, 64), pixels, scene=1)
+        czi_blocks.add(Point(64, 64), pixels)
+
+        # Act
+        scenes = CziImageData.detect_scenes(czi_blocks.czi)
+
+        # Assert
+        assert scenes == [0, 1]
+
+    @pytest.mark.parametrize(
+        ["scene", "expected_size", "expected_offset"],
+        [
+            (None, Size(128, 160), Point(0, 0)),
+            (0, Size(64, 64), Point(0, 0)),
+            (1, Size(64, 96), Point(64, 64)),
+        ],
+    )
+    def test_scene_is_placed_at_its_position(
+        self,
+        czi_blocks: CziBlocks,
+        czi_metadata: CziMetadata,
+        encoder: Encoder,
+        pixels: np.ndarray,
+        scene: int | None,
+        expected_size: Size,
+        expected_offset: Point,
+    ):
+        # Arrange
+        czi_blocks.add(Point(100, 200), pixels, scene=0)
+        czi_blocks.add(Point(164, 264), pixels, scene=1)
+        czi_blocks.add(Point(164, 296), pixels, scene=1)
+        image_coordinate_system = ImageCoordinateSystem(PointMm(10, 20), 90)
+
+        # Act
+        image_data = create_image_data(
+            czi_blocks,
+            czi_metadata,
+            encoder,
+            scene=scene,
+            image_coordinate_system=image_coordinate_system,
+        )
+
+        # Assert
+        assert image_data.image_size == expected_size
+        assert image_data.image_coordinate_system == ImageCoordinateSystem(
+            image_coordinate_system.image_to_slide(
+                PointMm(
+                    expected_offset.x * PIXEL_SPACING.width,
+                    expected_offset.y * PIXEL_SPACING.height,
+                )
+            ),
+            90,
+        )
+
+    def test_scene_reads_only_its_subblocks(
+        self,
+        czi_blocks: CziBlocks,
+        czi_metadata: CziMetadata,
+        encoder: Encoder,
+        pixels: np.ndarray,
+    ):
+        # Arrange
+        czi_blocks.add(Point(0, 0), np.zeros_like(pixels), scene=0)
+        czi_blocks.add(Point(32, 32), pixels, scene=1)
+        image_data = create_image_data(czi_blocks, czi_metadata, encoder, scene=1)
+
+        # Act
+        read = image_data.read_region(Region(Point(0, 0), Size(64, 64)), 0.0, "1")
+
+        # Assert
+        assert np.array_equal(read, pixels)
@@ -14,9 +14,53 @@
 
 from pathlib import Path
 
+import numpy as np
 import pytest
+from decoy import Decoy
+from upath import UPath
+from wsidicom.codec import Encoder, JpegSettings
+from wsidicom.geometry import Point, PointMm, Size
 
+from tests.conftest import CziBlocks
 from wsidicomizer.sources import CziSource
+from wsidicomizer.sources.czi import czi_source
+
+CZI_METADATA_XML = """<ImageDocument>
+  <Metadata>
+    <Information>
+      <Image>
+        <AcquisitionDateAndTime>2026-06-22T12:00:00</AcquisitionDateAndTime>
+        <MicroscopeRef Id="Microscope:1"/>
+        <ObjectiveSettings>
+          <ObjectiveRef Id="Objective:1"/>
+        </ObjectiveSettings>
+        <Dimensions>
+          <Channels>
+            <Channel><Fluor>1</Fluor></Channel>
+          </Channels>
+        </Dimensions>
+      </Image>
+      <Instrument>
+        <Microscopes>
+          <Microscope Id="Microscope:1" Name="Scanner"/>
+        </Microscopes>
+        <Objectives>
+          <Objective Id="Objective:1"/>
+        </Objectives>
+      </Instrument>
+      <Application>
+        <Name>ZEN</Name>
+        <Version>3.1</Version>
+      </Application>
+    </Information>
+    <Scaling>
+      <Items>
+        <Distance Id="X"><Value>5e-7</Value></Distance>
+        <Distance Id="Y"><Value>5e-7</Value></Distance>
+      </Items>
+    </Scaling>
+  </Metadata>
+</ImageDocument>"""
 
 
 @pytest.fixture
@@ -51,3 +95,37 @@ class TestCziSource:
 
         # Assert
         assert supported is False
+
+    @pytest.mark.unittest
+    def test_scenes_are_opened_as_separate_pyramids(
+        self, decoy: Decoy, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        # Arrange
+        czi_blocks = CziBlocks(decoy)
+        pixels = np.zeros((32, 32, 3), np.uint8)
+        czi_blocks.add(Point(0, 0), pixels, scene=0)
+        czi_blocks.add(Point(100, 50), pixels, scene=1)
+        czi_blocks.add(Point(132, 50), pixels, scene=1)
+        decoy.when(czi_blocks.czi.metadata()).then_return(CZI_METADATA_XML)
+        monkeypatch.setattr(czi_source, "CziFile", lambda filepath: czi_blocks.czi)
+        source = CziSource(
+            UPath(tmp_path.joinpath("slide.czi")),
+            Encoder.create_for_settings(JpegSettings()),
+        )
+
+        # Act
+        instances = source.level_instances
+
+        # Assert
+        assert source.scenes == [0, 1]
+        assert [instance.size for instance in instances] == [
+            Size(32, 32),
+            Size(64, 32),
+        ]
+        first_system = instances[0].image_data.image_coordinate_system
+        second_system = instances[1].image_data.image_coordinate_system
+        assert first_system is not None
+        assert second_system is not None
+        assert second_system.origin == first_system.image_to_slide(
+            PointMm(100 * 0.0005, 50 * 0.0005)
+        )
@@ -15,12 +15,22 @@
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pytest
+from decoy import Decoy
 from isyntax import ISyntax
+from isyntax.wrapper import ISyntaxImage, ISyntaxLevel
+from upath import UPath
+from wsidicom.codec import Encoder
+from wsidicom.geometry import Point, Size, SizeMm
+from wsidicom.metadata import Image as ImageMetadata
 
 from tests.conftest import test_parameters
+from wsidicomizer.config import Settings, use_settings
 from wsidicomizer.extras.isyntax import ISyntaxSource
+from wsidicomizer.extras.isyntax.isyntax_image_data import ISyntaxLevelImageData
 from wsidicomizer.extras.isyntax.isyntax_metadata import ISyntaxMetadata
+from wsidicomizer.extras.isyntax.isyntax_pool import ISyntaxPool
 
 
 @pytest.fixture
@@ -72,3 +82,156 @@ class TestIsyntaxSource:
 
         # Assert
         assert supported is False
+
+    def test_pyramid_levels_are_native_levels(self, slide: Path):
+        # Arrange
+        source = ISyntaxSource(UPath(slide), None)
+        isyntax = ISyntax.open(slide)
+
+        # Act
+        pyramid_levels = source.pyramid_levels
+
+        # Assert
+        assert len(pyramid_levels) == isyntax.level_count
+        base_size = source.level_instances[0].size
+        for instance, (pyramid_index, _, _) in zip(
+            source.level_instances, pyramid_levels, strict=True
+        ):
+            assert instance.size == base_size.ceil_div(1 << pyramid_index)
+        isyntax.close()
+        source.close()
+
+
+@pytest.fixture
+def isyntax(decoy: Decoy) -> ISyntax:
+    isyntax = decoy.mock(cls=ISyntax)
+    image = decoy.mock(cls=ISyntaxImage)
+    level = decoy.mock(cls=ISyntaxLevel)
+    decoy.when(isyntax.wsi).then_return(image)
+    decoy.when(image.get_level(2)).then_return(level)
+    decoy.when(level.scale).then_return(2)
+    decoy.when(level.mpp_x).then_return(1.0)
+    decoy.when(level.mpp_y).then_return(1.0)
+    decoy.when(level.width).then_return(256)
+    decoy.when(level.height).then_return(128)
+    decoy.when(isyntax.tile_width).then_return(64)
+    decoy.when(isyntax.tile_height).then_return(64)
+    return isyntax
+
+
+class HandlesPool(ISyntaxPool):
+    """Pool opening the given handles instead of files."""
+
+    def __init__(self, handles: list[ISyntax]):
+        super().__init__(Path("slide.isyntax"), 0)
+        self._handles = handles
+
+    def _open(self) -> ISyntax:
+        return self._handles.pop()
+
+
+@pytest.mark.unittest
+class TestISyntaxLevelImageData:
+    @pytest.mark.parametrize(
+        ["metadata_pixel_spacing", "expected_pixel_spacing"],
+        [
+            (None, SizeMm(0.001, 0.001)),
+            (SizeMm(0.0003, 0.0003), SizeMm(0.0012, 0.0012)),
+        ],
+    )
+    def test_pixel_spacing_of_downsampled_level(
+        self,
+        decoy: Decoy,
+        isyntax: ISyntax,
+        metadata_pixel_spacing: SizeMm | None,
+        expected_pixel_spacing: SizeMm,
+    ):
+        # Act
+        image_data = ISyntaxLevelImageData(
+            isyntax,
+            ImageMetadata(pixel_spacing=metadata_pixel_spacing),
+            None,
+            decoy.mock(cls=Encoder),
+            2,
+        )
+
+        # Assert
+        assert image_data.pixel_spacing == expected_pixel_spacing
+        assert image_data.image_size == Size(256, 128)
+        assert image_data.downsample == 4
+        assert not image_data.thread_safe
+
+    def test_tiles_are_read_with_handles_from_pool(
+        self, decoy: Decoy, isyntax: ISyntax
+    ):
+        # Arrange
+        handle = decoy.mock(cls=ISyntax)
+        tile = np.random.default_rng(0).integers(0, 255, (64, 64, 4), np.uint8)
+        decoy.when(handle.read_tile(1, 0, 2)).then_return(tile)
+        pool = HandlesPool([handle])
+        image_data = ISyntaxLevelImageData(
+            isyntax,
+            ImageMetadata(),
+            None,
+            decoy.mock(cls=Encoder),
+            2,
+            pool,
+        )
+
+        # Act
+        decoded = image_data.get_decoded_tile(Point(1, 0), 0.0, "1")
+
+        # Assert
+        assert image_data.thread_safe
+        assert np.array_equal(decoded, tile[:, :, :3])
+        assert pool.size == 1
+        pool.close()
+        decoy.verify(handle.close())
+
+    def test_tiles_are_read_in_blocks_aligned_to_native_tiles(
+        self, decoy: Decoy, isyntax: ISyntax
+    ):
+        # Arrange
+        handle = decoy.mock(cls=ISyntax)
+        region = np.random.default_rng(0).integers(0, 255, (128, 192, 4), np.uint8)
+        decoy.when(handle.read_region(0, 0, 192, 128, 2)).then_return(region)
+        image_data = ISyntaxLevelImageData(
+            isyntax,
+            ImageMetadata(),
+            96,
+            decoy.mock(cls=Encoder),
+            2,
+            HandlesPool([handle]),
+        )
+
+        # Act
+        decoded_tiles = list(
+            image_data.get_decoded_tiles([Point(1, 0), Point(0, 0)], 0.0, "1")
+        )
+
+        # Assert
+        assert np.array_equal(decoded_tiles[0], region[0:96, 96:192, :3])
+        assert np.array_equal(decoded_tiles[1], region[0:96, 0:96, :3])
+        assert image_data.suggested_minimum_chunk_size % 4 == 0
+
+
+@pytest.mark.unittest
+class TestISyntaxCacheSize:
+    @pytest.mark.parametrize(
+        ["cache_memory", "expected_cache"],
+        [(256 * 256 * 6 * 100, 100), (1, 1)],
+    )
+    def test_cache_is_sized_from_memory_budget(
+        self, decoy: Decoy, cache_memory: int, expected_cache: int
+    ):
+        # Arrange
+        isyntax = decoy.mock(cls=ISyntax)
+        decoy.when(isyntax.tile_width).then_return(256)
+        decoy.when(isyntax.tile_height).then_return(256)
+
+        # Act
+        with use_settings(Settings(isyntax_cache_memory=cache_memory)):
+            cache = ISyntaxSource._get_cache_size(isyntax)
+
+        # Assert
+        assert cache == expected_cache
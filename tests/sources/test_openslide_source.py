@@ -12,11 +12,28 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import ctypes
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pytest
+import tifffile
+from decoy import Decoy
+from upath import UPath
+from wsidicom.codec import Encoder
+from wsidicom.geometry import Point, Region, Size, SizeMm
+from wsidicom.metadata import Image as ImageMetadata
 
 from wsidicomizer.extras.openslide import OpenSlideSource
+from wsidicomizer.extras.openslide.openslide import OpenSlide, convert_argb_to_rgba
+from wsidicomizer.extras.openslide.openslide_image_data import (
+    OpenSlideLevelImageData,
+)
+from wsidicomizer.extras.openslide.openslide_pool import OpenSlidePool
 
 
 @pytest.fixture
@@ -27,6 +44,124 @@ def slide(testdata_dir: Path) -> Path:
     return path
 
 
+@pytest.fixture
+def tiled_tiff(tmp_path: Path) -> Path:
+    path = tmp_path.joinpath("slide.tiff")
+    tifffile.imwrite(
+        path,
+        np.zeros((512, 512, 3), np.uint8),
+        tile=(256, 256),
+        photometric="rgb",
+        compression="zlib",
+    )
+    return path
+
+
+@pytest.fixture
+def mirax_slide(testdata_dir: Path) -> Path:
+    path = testdata_dir.joinpath("slides", "mirax", "CMU-1", "CMU-1.mrxs")
+    if not path.exists():
+        pytest.skip("mirax test data not available")
+    return path
+
+
+@pytest.fixture
+def image_data(decoy: Decoy) -> OpenSlideLevelImageData:
+    open_slide = decoy.mock(cls=OpenSlide)
+    decoy.when(open_slide.level_dimensions).then_return(((64, 64),))
+    decoy.when(open_slide.level_downsamples).then_return((1.0,))
+    decoy.when(open_slide.properties).then_return({})
+    encoder = decoy.mock(cls=Encoder)
+    decoy.when(encoder.photometric_interpretation).then_return("YBR_FULL_422")
+    return OpenSlideLevelImageData(
+        open_slide,
+        (255, 255, 255),
+        None,
+        None,
+        ImageMetadata(pixel_spacing=SizeMm(0.0005, 0.0005)),
+        0,
+        32,
+        encoder,
+    )
+
+
+def create_argb(rgb: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    """Return premultiplied ARGB pixels in native byte order viewed as bytes, as
+    read by openslide."""
+    premultiplied = (rgb.astype(np.uint32) * alpha[..., np.newaxis]) // 255
+    pixels = (
+        alpha.astype(np.uint32) << 24
+        | premultiplied[..., 0] << 16
+        | premultiplied[..., 1] << 8
+        | premultiplied[..., 2]
+    )
+    return pixels.view(np.uint8).reshape(rgb.shape[0], rgb.shape[1], 4)
+
+
+@pytest.mark.unittest
+class TestOpenSlideLevelImageData:
+    def test_get_tile_pixels_of_opaque_region(
+        self, image_data: OpenSlideLevelImageData
+    ):
+        # Arrange
+        rgb = np.random.default_rng(0).integers(0, 255, (8, 8, 3), np.uint8)
+        region_data = create_argb(rgb, np.full((8, 8), 255, np.uint8))
+
+        # Act
+        pixels = image_data._get_tile_pixels(region_data)
+
+        # Assert
+        assert pixels is not None
+        assert pixels.flags.c_contiguous
+        assert np.array_equal(pixels, rgb)
+
+    def test_get_tile_pixels_of_transparent_region(
+        self, image_data: OpenSlideLevelImageData
+    ):
+        # Arrange
+        rgb = np.random.default_rng(0).integers(0, 255, (8, 8, 3), np.uint8)
+        alpha = np.full((8, 8), 255, np.uint8)
+        alpha[2:4, 2:6] = 128
+        alpha[5, :] = 0
+        region_data = create_argb(rgb, alpha)
+        expected = region_data.copy()
+        convert_argb_to_rgba(expected.view(ctypes.c_uint32))  # type: ignore
+        expected = image_data._composite_over_background(expected)
+
+        # Act
+        pixels = image_data._get_tile_pixels(region_data)
+
+        # Assert
+        assert pixels is not None
+        assert np.array_equal(pixels, expected)
+
+    @pytest.mark.parametrize(["rgb", "alpha"], [((0, 0, 0), 0), ((255, 255, 255), 255)])
+    def test_get_tile_pixels_of_blank_region(
+        self,
+        image_data: OpenSlideLevelImageData,
+        rgb: tuple[int, int, int],
+        alpha: int,
+    ):
+        # Arrange
+        region_data = create_argb(
+            np.full((8, 8, 3), rgb, np.uint8), np.full((8, 8), alpha, np.uint8)
+        )
+
+        # Act
+        pixels = image_data._get_tile_pixels(region_data)
+
+        # Assert
+        assert pixels is None
+
+    def test_read_buffer_is_reused(self, image_data: OpenSlideLevelImageData):
+        # Act
+        first = image_data._get_read_buffer(64)
+        second = image_data._get_read_buffer(32)
+
+        # Assert
+        assert np.shares_memory(first, second)
+
+
 class TestOpenSlideSource:
     def test_supports_local_path(self, slide: Path):
         # Act
@@ -51,3 +186,97 @@ class TestOpenSlideSource:
 
         # Assert
         assert supported is False
+
+
+@pytest.mark.unittest
+class TestOpenSlidePool:
+    def test_handle_is_reused_by_serial_reads(self, tiled_tiff: Path):
+        # Arrange
+        pool = OpenSlidePool(tiled_tiff)
+
+        # Act
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            pass
+
+        # Assert
+        assert first is second
+        assert pool.size == 1
+        pool.close()
+
+    def test_concurrent_reads_use_separate_handles(self, tiled_tiff: Path):
+        # Arrange
+        pool = OpenSlidePool(tiled_tiff, 1024 * 1024)
+        workers = 4
+        barrier = threading.Barrier(workers)
+
+        def acquire(_: int) -> int:
+            with pool.acquire() as slide:
+                barrier.wait(timeout=10)
+                return id(slide)
+
+        # Act
+        with ThreadPoolExecutor(workers) as executor:
+            handles = set(executor.map(acquire, range(workers)))
+
+        # Assert
+        assert len(handles) == workers
+        assert pool.size == workers
+        pool.close()
+
+    def test_acquire_from_closed_pool_raises(self, tiled_tiff: Path):
+        # Arrange
+        pool = OpenSlidePool(tiled_tiff)
+        pool.close()
+
+        # Act & Assert
+        with pytest.raises(ValueError), pool.acquire():
+            pass
+
+
+@pytest.mark.integrationtest
+class TestOpenSlidePoolScaling:
+    def test_read_tiles_scales_with_workers(self, mirax_slide: Path):
+        # Benchmark of reading all tiles of a level with an increasing number of
+        # workers. The throughput is logged, the tiles must be equal for every
+        # number of workers.
+
+        # Arrange
+        source = OpenSlideSource(UPath(mirax_slide), None, tile_size=512)
+        image_data = source._create_level_image_data(1)
+        z = image_data.focal_planes[0]
+        path = image_data.optical_paths[0]
+        tiled_size = image_data.tiled_size
+        rows = [
+            list(Region(Point(0, y), Size(tiled_size.width, 1)).iterate_all())
+            for y in range(tiled_size.height)
+        ]
+        results: dict[int, list[np.ndarray]] = {}
+
+        # Act
+        for workers in (1, 2, 4):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(workers) as executor:
+                results[workers] = [
+                    tile
+                    for tiles in executor.map(
+                        lambda row: list(image_data.get_decoded_tiles(row, z, path)),
+                        rows,
+                    )
+                    for tile in tiles
+                ]
+            elapsed = time.perf_counter() - start
+            logging.info(
+                f"Read {len(results[workers])} tiles with {workers} workers in "
+                f"{elapsed:.2f} s ({len(results[workers]) / elapsed:.1f} tiles/s)."
+            )
+
+        # Assert
+        for workers in (2, 4):
+            assert all(
+                np.array_equal(tile, expected)
+                for tile, expected in zip(results[workers], results[1], strict=True)
+            )
+        assert source._slide_pool.size <= 4
+        source.close()
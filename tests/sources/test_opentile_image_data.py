@@ -0,0 +1,183 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from pathlib import Path
+
+import pytest
+from decoy import Decoy, matchers
+from opentile.geometry import Size as OpenTileSize
+from opentile.geometry import SizeMm as OpenTileSizeMm
+from opentile.jpeg import Jpeg, JpegInfo, JpegProcess
+from opentile.tiff_image import LevelTiffImage
+from opentile.tile_overlap import TileOverlap
+from pydicom.uid import JPEGBaseline8Bit
+from tifffile import COMPRESSION, PHOTOMETRIC
+from upath import UPath
+from wsidicom.codec import Encoder
+from wsidicom.file.file_writer import GroupFileWriter
+from wsidicom.geometry import Point, SizeMm
+from wsidicom.group import Label
+from wsidicom.metadata import CallableUidGenerator
+from wsidicom.metadata import Image as ImageMetadata
+
+from wsidicomizer.config import Settings, use_settings
+from wsidicomizer.sources.opentile import opentile_image_data
+from wsidicomizer.sources.opentile.opentile_image_data import (
+    OpenTileComposedLevelImageData,
+)
+
+STORED_TILE_SIZE = 64
+OVERLAP = 16
+TILE_SIZE = 16
+
+
+@pytest.fixture
+def tiff_image(decoy: Decoy) -> LevelTiffImage:
+    """Level of 2x2 stored baseline JPEG tiles that overlap their neighbours."""
+    tiff_image = decoy.mock(cls=LevelTiffImage)
+    mosaic_size = OpenTileSize(2 * STORED_TILE_SIZE, 2 * STORED_TILE_SIZE)
+    stored_tile_size = OpenTileSize(STORED_TILE_SIZE, STORED_TILE_SIZE)
+    decoy.when(tiff_image.overlap).then_return(
+        TileOverlap.from_regular_grid(
+            mosaic_size, stored_tile_size, OpenTileSize(OVERLAP, OVERLAP)
+        )
+    )
+    decoy.when(tiff_image.encoded_info).then_return(
+        JpegInfo(JpegProcess.BASELINE, 8, 3, (2, 2), False, None)
+    )
+    decoy.when(tiff_image.compression).then_return(COMPRESSION.JPEG)
+    decoy.when(tiff_image.photometric_interpretation).then_return(PHOTOMETRIC.YCBCR)
+    decoy.when(tiff_image.subsampling).then_return((2, 2))
+    decoy.when(tiff_image.samples_per_pixel).then_return(3)
+    decoy.when(tiff_image.image_size).then_return(mosaic_size)
+    decoy.when(tiff_image.tile_size).then_return(stored_tile_size)
+    decoy.when(tiff_image.tiled_size).then_return(OpenTileSize(2, 2))
+    decoy.when(tiff_image.pixel_spacing).then_return(OpenTileSizeMm(0.001, 0.001))
+    decoy.when(tiff_image.focal_plane).then_return(0.0)
+    decoy.when(tiff_image.optical_path).then_return("0")
+    return tiff_image
+
+
+@pytest.fixture
+def encoder(decoy: Decoy) -> Encoder:
+    encoder = decoy.mock(cls=Encoder)
+    decoy.when(encoder.transfer_syntax).then_return(JPEGBaseline8Bit)
+    decoy.when(encoder.photometric_interpretation).then_return("YBR_FULL_422")
+    decoy.when(encoder.bits).then_return(8)
+    decoy.when(encoder.samples_per_pixel).then_return(3)
+    return encoder
+
+
+@pytest.fixture
+def jpeg(decoy: Decoy, monkeypatch: pytest.MonkeyPatch) -> Jpeg:
+    """Jpeg used for cropping, as libturbojpeg might not be available."""
+    jpeg = decoy.mock(cls=Jpeg)
+    monkeypatch.setattr(opentile_image_data, "Jpeg", lambda: jpeg)
+    return jpeg
+
+
+def create_image_data(
+    tiff_image: LevelTiffImage, encoder: Encoder
+) -> OpenTileComposedLevelImageData:
+    return OpenTileComposedLevelImageData(
+        tiff_image,
+        ImageMetadata(),
+        ImageMetadata(),
+        encoder,
+        SizeMm(0.112, 0.112),
+        TILE_SIZE,
+    )
+
+
+def resolve_transcoding(
+    decoy: Decoy, image_data: OpenTileComposedLevelImageData, tmp_path: Path
+) -> Encoder | None:
+    """Return the encoder the writer transcodes the image data with, or None if
+    the encoded tiles of the image data are written as is."""
+    writer = GroupFileWriter(
+        decoy.mock(cls=Label),
+        UPath(tmp_path),
+        CallableUidGenerator(),
+        None,
+        force_transcoding=False,
+    )
+    encoder, transcode = writer._resolve_transcoding(image_data)
+    return encoder if transcode else None
+
+
+@pytest.mark.unittest
+class TestOpenTileComposedLevelImageData:
+    def test_cropped_tiles_are_not_transcoded_by_writer(
+        self,
+        decoy: Decoy,
+        tiff_image: LevelTiffImage,
+        encoder: Encoder,
+        jpeg: Jpeg,
+        tmp_path: Path,
+    ):
+        # Arrange
+        decoy.when(tiff_image.get_tile((0, 0))).then_return(b"stored")
+        decoy.when(
+            jpeg.crop_multiple(b"stored", [(0, 0, TILE_SIZE, TILE_SIZE)])
+        ).then_return([b"cropped"])
+        image_data = create_image_data(tiff_image, encoder)
+
+        # Act
+        transcoder = resolve_transcoding(decoy, image_data, tmp_path)
+        encoded_tiles = list(image_data.get_encoded_tiles([Point(0, 0)], 0.0, "0"))
+
+        # Assert
+        assert transcoder is None
+        assert image_data.transfer_syntax == JPEGBaseline8Bit
+        assert encoded_tiles == [b"cropped"]
+        decoy.verify(encoder.encode(matchers.Anything()), times=0)
+
+    def test_tiles_are_transcoded_by_writer_if_cropping_disabled(
+        self,
+        decoy: Decoy,
+        tiff_image: LevelTiffImage,
+        encoder: Encoder,
+        jpeg: Jpeg,
+        tmp_path: Path,
+    ):
+        # Arrange
+        with use_settings(Settings(lossless_jpeg_cropping=False)):
+            image_data = create_image_data(tiff_image, encoder)
+
+        # Act
+        transcoder = resolve_transcoding(decoy, image_data, tmp_path)
+
+        # Assert
+        assert transcoder is encoder
+
+    def test_tiles_are_not_cropped_if_subsampling_differs_from_encoder(
+        self,
+        decoy: Decoy,
+        tiff_image: LevelTiffImage,
+        encoder: Encoder,
+        jpeg: Jpeg,
+        tmp_path: Path,
+    ):
+        # Arrange
+        decoy.when(tiff_image.encoded_info).then_return(
+            JpegInfo(JpegProcess.BASELINE, 8, 3, (1, 1), False, None)
+        )
+        decoy.when(tiff_image.subsampling).then_return((1, 1))
+
+        # Act
+        image_data = create_image_data(tiff_image, encoder)
+
+        # Assert
+        assert image_data._jpeg is None
+        assert resolve_transcoding(decoy, image_data, tmp_path) is encoder
@@ -15,6 +15,10 @@
 from pathlib import Path
 
 import pytest
+from opentile.geometry import PointMm, Size, SizeMm
+from opentile.tiler import Pyramid
+from wsidicom.geometry import PointMm as WsiPointMm
+from wsidicom.metadata import ImageCoordinateSystem
 
 from wsidicomizer.sources import OpenTileSource
 
@@ -27,6 +31,10 @@ def slide(testdata_dir: Path) -> Path:
     return path
 
 
+def create_pyramid(position: PointMm | None) -> Pyramid:
+    return Pyramid("", [], Size(100, 100), SizeMm(0.001, 0.001), position)
+
+
 class TestOpenTileSource:
     def test_supports_local_path(self, slide: Path):
         # Act
@@ -41,3 +49,44 @@ class TestOpenTileSource:
 
         # Assert
         assert supported is True
+
+    @pytest.mark.unittest
+    def test_pyramid_placed_at_position(self):
+        # Arrange
+        first_pyramid = create_pyramid(PointMm(10, 20))
+        pyramid = create_pyramid(PointMm(15, 22))
+
+        # Act
+        image_coordinate_system = OpenTileSource._get_pyramid_image_coordinate_system(
+            None, first_pyramid, pyramid
+        )
+
+        # Assert
+        assert image_coordinate_system == ImageCoordinateSystem(WsiPointMm(22, 15), 0)
+
+    @pytest.mark.unittest
+    def test_pyramid_placed_relative_to_first_pyramid(self):
+        # Arrange
+        first_pyramid = create_pyramid(PointMm(10, 20))
+        pyramid = create_pyramid(PointMm(15, 22))
+        first_image_coordinate_system = ImageCoordinateSystem(WsiPointMm(50, 40), 180)
+
+        # Act
+        image_coordinate_system = OpenTileSource._get_pyramid_image_coordinate_system(
+            first_image_coordinate_system, first_pyramid, pyramid
+        )
+
+        # Assert
+        assert image_coordinate_system == ImageCoordinateSystem(WsiPointMm(48, 35), 180)
+
+    @pytest.mark.unittest
+    def test_pyramid_without_position_raises(self):
+        # Arrange
+        first_pyramid = create_pyramid(PointMm(10, 20))
+        pyramid = create_pyramid(None)
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            OpenTileSource._get_pyramid_image_coordinate_system(
+                None, first_pyramid, pyramid
+            )
@@ -0,0 +1,44 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import pytest
+
+from wsidicomizer.sources.opentile.opentile_image_data import TranscodingStatistics
+
+
+@pytest.mark.unittest
+class TestTranscodingStatistics:
+    def test_no_tiles(self):
+        # Arrange
+        statistics = TranscodingStatistics()
+
+        # Act
+        tiles_per_second = statistics.tiles_per_second
+
+        # Assert
+        assert statistics.tiles == 0
+        assert tiles_per_second is None
+
+    def test_concurrent_batches_are_not_counted_twice(self):
+        # Arrange
+        statistics = TranscodingStatistics()
+
+        # Act
+        statistics.add(10, 0.0, 2.0)
+        statistics.add(10, 1.0, 4.0)
+
+        # Assert
+        assert statistics.tiles == 20
+        assert statistics.seconds == 4.0
+        assert statistics.tiles_per_second == 5.0
@@ -12,18 +12,27 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from io import BytesIO
 from pathlib import Path
 
 import numpy as np
 import pytest
 import tifffile
+from decoy import Decoy
+from PIL import Image
 from upath import UPath
-from wsidicom.geometry import SizeMm
+from wsidicom.geometry import Point, Region, Size, SizeMm
 from wsidicom.metadata import Image as ImageMetadata
 from wsidicom.metadata import Pyramid
 
+from tests.conftest import write_jpeg_tables_tiff
 from wsidicomizer.metadata import WsiDicomizerMetadata
-from wsidicomizer.sources.tiffslide import TiffSlideSource
+from wsidicomizer.sources.opentile.block_cache import BlockCachedFile
+from wsidicomizer.sources.opentile.tile_passthrough import ByteRangeReader
+from wsidicomizer.sources.tiffslide import TiffSlideSource, tiffslide_source
+from wsidicomizer.sources.tiffslide.tiffslide_image_data import (
+    TiffSlideLevelImageData,
+)
 
 
 @pytest.fixture
@@ -46,6 +55,18 @@ def _write_tiff(path: Path, array: np.ndarray) -> None:
     tifffile.imwrite(path, array, tile=(256, 256), photometric=photometric)
 
 
+def _write_compressed_tiff(path: Path, array: np.ndarray, compression: str) -> None:
+    tifffile.imwrite(
+        path, array, tile=(256, 256), photometric="ycbcr", compression=compression
+    )
+
+
+def create_level_image_data(source: TiffSlideSource) -> TiffSlideLevelImageData:
+    image_data = source._create_level_image_data(0)
+    assert isinstance(image_data, TiffSlideLevelImageData)
+    return image_data
+
+
 class TestTiffSlideSource:
     @pytest.mark.parametrize(
         ["array", "expected_samples", "expected_photometric"],
@@ -91,3 +112,203 @@ class TestTiffSlideSource:
 
         # Assert
         assert supported is True
+
+    def test_get_decoded_tiles_matches_single_tiles(
+        self, tmp_path: Path, metadata: WsiDicomizerMetadata
+    ):
+        # Arrange
+        path = tmp_path / "image.tiff"
+        array = np.random.default_rng(0).integers(0, 255, (600, 700, 3), np.uint8)
+        _write_tiff(path, array)
+        source = TiffSlideSource(UPath(path), None, tile_size=128, metadata=metadata)
+        image_data = source._create_level_image_data(0)
+        tiles = [
+            Point(x, y) for y in range(2) for x in range(image_data.tiled_size.width)
+        ]
+
+        # Act
+        decoded_tiles = list(image_data.get_decoded_tiles(tiles, 0.0, "1"))
+
+        # Assert
+        for tile, decoded_tile in zip(tiles, decoded_tiles, strict=True):
+            assert np.array_equal(
+                decoded_tile, image_data.get_decoded_tile(tile, 0.0, "1")
+            )
+        source.close()
+
+    def test_read_region_at_scale_reads_native_level(
+        self, tmp_path: Path, metadata: WsiDicomizerMetadata
+    ):
+        # Arrange
+        path = tmp_path / "image.tiff"
+        array = np.random.default_rng(0).integers(0, 255, (1024, 1024, 3), np.uint8)
+        with tifffile.TiffWriter(path) as writer:
+            writer.write(array, tile=(256, 256), photometric="rgb", subifds=1)
+            writer.write(
+                array[::2, ::2], tile=(256, 256), photometric="rgb", subfiletype=1
+            )
+        source = TiffSlideSource(UPath(path), None, tile_size=256, metadata=metadata)
+        image_data = create_level_image_data(source)
+
+        # Act
+        region = image_data.read_region_at_scale(
+            Region(Point(200, 100), Size(400, 300)), 0.0, "1", 3.0
+        )
+
+        # Assert
+        assert np.array_equal(region, array[100:400:2, 200:600:2])
+        source.close()
+
+    def test_remote_file_is_read_through_block_cache(
+        self, tmp_path: Path, metadata: WsiDicomizerMetadata
+    ):
+        # Arrange
+        path = tmp_path / "image.tiff"
+        array = np.random.default_rng(0).integers(0, 255, (600, 700, 3), np.uint8)
+        _write_tiff(path, array)
+        remote_path = UPath(f"memory:///{tmp_path.name}/image.tiff")
+        remote_path.write_bytes(path.read_bytes())
+        local_source = TiffSlideSource(
+            UPath(path), None, tile_size=128, metadata=metadata
+        )
+        tiles = [Point(0, 0), Point(4, 3)]
+
+        # Act
+        source = TiffSlideSource(remote_path, None, tile_size=128, metadata=metadata)
+        decoded_tiles = list(
+            source._create_level_image_data(0).get_decoded_tiles(tiles, 0.0, "1")
+        )
+
+        # Assert
+        assert isinstance(source._tiffslide.ts_tifffile.filehandle._fh, BlockCachedFile)
+        expected_tiles = local_source._create_level_image_data(0).get_decoded_tiles(
+            tiles, 0.0, "1"
+        )
+        for decoded_tile, expected_tile in zip(
+            decoded_tiles, expected_tiles, strict=True
+        ):
+            assert np.array_equal(decoded_tile, expected_tile)
+        source.close()
+        local_source.close()
+        remote_path.unlink()
+
+    def test_jpeg_tiles_are_passed_through(
+        self, tmp_path: Path, metadata: WsiDicomizerMetadata
+    ):
+        # Arrange
+        path = tmp_path / "image.tiff"
+        array = np.random.default_rng(0).integers(0, 255, (600, 700, 3), np.uint8)
+        _write_compressed_tiff(path, array, "jpeg")
+        source = TiffSlideSource(UPath(path), None, tile_size=None, metadata=metadata)
+        image_data = create_level_image_data(source)
+
+        # Act
+        encoded_tiles = list(
+            image_data.get_encoded_tiles([Point(1, 1), Point(1, 0)], 0.0, "1")
+        )
+
+        # Assert
+        assert image_data.passthrough
+        assert image_data.transcoder is None
+        assert image_data.tile_size.to_tuple() == (256, 256)
+        for tile, encoded_tile in zip(
+            [Point(1, 1), Point(1, 0)], encoded_tiles, strict=True
+        ):
+            with Image.open(BytesIO(encoded_tile)) as image:
+                assert np.array_equal(
+                    np.asarray(image), image_data.get_decoded_tile(tile, 0.0, "1")
+                )
+        source.close()
+
+    def test_jpeg_tiles_with_shared_tables_are_passed_through(
+        self, tmp_path: Path, metadata: WsiDicomizerMetadata
+    ):
+        # Arrange
+        path = tmp_path / "image.tiff"
+        array = np.random.default_rng(0).integers(0, 255, (600, 700, 3), np.uint8)
+        write_jpeg_tables_tiff(path, array, 256)
+        source = TiffSlideSource(UPath(path), None, tile_size=None, metadata=metadata)
+        image_data = create_level_image_data(source)
+
+        # Act
+        encoded_tile = image_data.get_encoded_tile(Point(1, 1), 0.0, "1")
+
+        # Assert
+        assert image_data.passthrough
+        assert image_data.transcoder is None
+        with Image.open(BytesIO(encoded_tile)) as image:
+            assert np.array_equal(
+                np.asarray(image), image_data.get_decoded_tile(Point(1, 1), 0.0, "1")
+            )
+        source.close()
+
+    @pytest.mark.parametrize(
+        ["compression", "tile_size"], [("jpeg", 512), ("zlib", None)]
+    )
+    def test_jpeg_tiles_are_not_passed_through(
+        self,
+        tmp_path: Path,
+        metadata: WsiDicomizerMetadata,
+        compression: str,
+        tile_size: int | None,
+    ):
+        # Arrange
+        path = tmp_path / "image.tiff"
+        array = np.random.default_rng(0).integers(0, 255, (600, 700, 3), np.uint8)
+        _write_compressed_tiff(path, array, compression)
+
+        # Act
+        source = TiffSlideSource(
+            UPath(path), None, tile_size=tile_size, metadata=metadata
+        )
+        image_data = create_level_image_data(source)
+
+        # Assert
+        assert not image_data.passthrough
+        assert image_data.transcoder is not None
+        source.close()
+
+    def test_byte_range_reader_is_not_created_for_unreadable_file(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        # Arrange
+        path = tmp_path / "image.tiff"
+        path.write_bytes(b"not a tiff")
+        created: list[Path] = []
+        monkeypatch.setattr(
+            tiffslide_source,
+            "create_byte_range_reader",
+            lambda filepath, file_options: created.append(filepath),
+        )
+
+        # Act
+        with pytest.raises(tifffile.TiffFileError):
+            TiffSlideSource(UPath(path), None)
+
+        # Assert
+        assert created == []
+
+    def test_byte_range_reader_is_closed_if_open_fails(
+        self, decoy: Decoy, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        # Arrange
+        path = tmp_path / "image.tiff"
+        _write_tiff(path, np.zeros((256, 256, 3), np.uint8))
+        byte_range_reader = decoy.mock(cls=ByteRangeReader)
+        monkeypatch.setattr(
+            tiffslide_source,
+            "create_byte_range_reader",
+            lambda filepath, file_options: byte_range_reader,
+        )
+
+        def raise_error(*args, **kwargs):
+            raise ValueError()
+
+        monkeypatch.setattr(tiffslide_source, "OpenSlideLikeProperties", raise_error)
+
+        # Act
+        with pytest.raises(ValueError):
+            TiffSlideSource(UPath(path), None)
+
+        # Assert
+        decoy.verify(byte_range_reader.close(), times=1)
@@ -0,0 +1,134 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import pytest
+from wsidicom.geometry import Point, Region, Size
+
+from wsidicomizer.sources.openslide_like.tile_blocks import (
+    get_block_width,
+    plan_tile_blocks,
+)
+
+
+@pytest.mark.unittest
+class TestGetBlockWidth:
+    @pytest.mark.parametrize(
+        ["tile_width", "native_tile_width", "max_width", "expected_width"],
+        [
+            (512, 240, 8192, 15),
+            (256, 256, 8192, 32),
+            (512, 250, 8192, 16),
+            (512, None, 8192, 16),
+            (512, 240, 256, 1),
+        ],
+    )
+    def test_get_block_width(
+        self,
+        tile_width: int,
+        native_tile_width: int | None,
+        max_width: int,
+        expected_width: int,
+    ):
+        # Act
+        width = get_block_width(tile_width, native_tile_width, max_width)
+
+        # Assert
+        assert width == expected_width
+
+
+@pytest.mark.unittest
+class TestPlanTileBlocks:
+    def test_row_is_split_at_block_width(self):
+        # Arrange
+        tiles = [Point(x, 0) for x in range(2, 9)]
+
+        # Act
+        blocks = plan_tile_blocks(tiles, 4)
+
+        # Assert
+        assert blocks == [
+            Region(Point(2, 0), Size(2, 1)),
+            Region(Point(4, 0), Size(4, 1)),
+            Region(Point(8, 0), Size(1, 1)),
+        ]
+
+    def test_runs_in_adjacent_rows_are_joined(self):
+        # Arrange
+        tiles = [Point(x, y) for x in range(0, 4) for y in range(0, 2)]
+
+        # Act
+        blocks = plan_tile_blocks(tiles, 4)
+
+        # Assert
+        assert blocks == [Region(Point(0, 0), Size(4, 2))]
+
+    @pytest.mark.parametrize(
+        ["block_height", "expected_blocks"],
+        [
+            (
+                None,
+                [
+                    Region(Point(0, 1), Size(2, 3)),
+                    Region(Point(0, 4), Size(2, 4)),
+                    Region(Point(0, 8), Size(2, 2)),
+                ],
+            ),
+            (
+                2,
+                [
+                    Region(Point(0, 1), Size(2, 1)),
+                    Region(Point(0, 2), Size(2, 2)),
+                    Region(Point(0, 4), Size(2, 2)),
+                    Region(Point(0, 6), Size(2, 2)),
+                    Region(Point(0, 8), Size(2, 2)),
+                ],
+            ),
+        ],
+    )
+    def test_tall_runs_are_split_at_block_height(
+        self, block_height: int | None, expected_blocks: list[Region]
+    ):
+        # Arrange
+        tiles = [Point(x, y) for x in range(0, 2) for y in range(1, 10)]
+
+        # Act
+        blocks = plan_tile_blocks(tiles, 4, block_height)
+
+        # Assert
+        assert blocks == expected_blocks
+
+    def test_runs_in_separated_rows_are_not_joined(self):
+        # Arrange
+        tiles = [Point(0, 0), Point(1, 0), Point(0, 2), Point(1, 2)]
+
+        # Act
+        blocks = plan_tile_blocks(tiles, 4)
+
+        # Assert
+        assert blocks == [
+            Region(Point(0, 0), Size(2, 1)),
+            Region(Point(0, 2), Size(2, 1)),
+        ]
+
+    def test_blocks_cover_tiles_exactly(self):
+        # Arrange
+        tiles = [Point(0, 0), Point(1, 0), Point(3, 0), Point(0, 1), Point(1, 1)]
+
+        # Act
+        blocks = plan_tile_blocks(tiles, 4)
+
+        # Assert
+        covered = [tile for block in blocks for tile in block.iterate_all()]
+        assert len(covered) == len(tiles)
+        assert set(covered) == set(tiles)
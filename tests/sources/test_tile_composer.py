@@ -0,0 +1,247 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from collections import Counter
+
+import numpy as np
+import pytest
+from opentile.geometry import Size as OpenTileSize
+from opentile.tile_overlap import TileOverlap
+from wsidicom.geometry import Point, Region, Size
+
+from wsidicomizer.sources.opentile.tile_composer import TileComposer
+
+STORED_TILE_SIZE = 4
+OVERLAP = 1
+
+
+class StoredTiles:
+    """Decodes stored tiles of a mosaic and counts the decodes of each tile."""
+
+    def __init__(self, mosaic: np.ndarray):
+        self.mosaic = mosaic
+        self.decodes: Counter[Point] = Counter()
+
+    def decode(self, tile: Point) -> np.ndarray:
+        self.decodes[tile] += 1
+        start = tile * STORED_TILE_SIZE
+        decoded = np.zeros((STORED_TILE_SIZE, STORED_TILE_SIZE, 1), dtype=np.uint8)
+        stored = self.mosaic[
+            start.y : start.y + STORED_TILE_SIZE, start.x : start.x + STORED_TILE_SIZE
+        ]
+        decoded[: stored.shape[0], : stored.shape[1]] = stored
+        return decoded
+
+
+def create_overlapping_mosaic(image: np.ndarray, overlap: int) -> np.ndarray:
+    """Return mosaic of tiles of the image where each tile overlaps its right and
+    bottom neighbour by overlap pixels."""
+    step = STORED_TILE_SIZE - overlap
+    tiles_across = -(-(image.shape[1] - overlap) // step)
+    tiles_down = -(-(image.shape[0] - overlap) // step)
+    mosaic = np.zeros(
+        (tiles_down * STORED_TILE_SIZE, tiles_across * STORED_TILE_SIZE, 1),
+        dtype=np.uint8,
+    )
+    for y in range(tiles_down):
+        for x in range(tiles_across):
+            tile = image[
+                y * step : y * step + STORED_TILE_SIZE,
+                x * step : x * step + STORED_TILE_SIZE,
+            ]
+            mosaic[
+                y * STORED_TILE_SIZE : y * STORED_TILE_SIZE + tile.shape[0],
+                x * STORED_TILE_SIZE : x * STORED_TILE_SIZE + tile.shape[1],
+            ] = tile
+    return mosaic
+
+
+@pytest.fixture
+def image() -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 255, (10, 13, 1), dtype=np.uint8)
+
+
+@pytest.mark.unittest
+class TestTileComposer:
+    @pytest.mark.parametrize("tile_size", [3, 4, 5])
+    def test_get_tile_returns_image_without_overlap(
+        self, image: np.ndarray, tile_size: int
+    ):
+        # Arrange
+        mosaic = create_overlapping_mosaic(image, OVERLAP)
+        stored_tiles = StoredTiles(mosaic)
+        overlap = TileOverlap.from_regular_grid(
+            OpenTileSize(mosaic.shape[1], mosaic.shape[0]),
+            OpenTileSize(STORED_TILE_SIZE, STORED_TILE_SIZE),
+            OpenTileSize(OVERLAP, OVERLAP),
+        )
+        composer = TileComposer(
+            overlap, Size(tile_size, tile_size), 1, stored_tiles.decode
+        )
+
+        # Act
+        composed = np.concatenate(
+            [
+                np.concatenate(
+                    [
+                        composer.get_tile(Point(x, y))
+                        for x in range(composer.tiled_size.width)
+                    ],
+                    axis=1,
+                )
+                for y in range(composer.tiled_size.height)
+            ],
+            axis=0,
+        )
+
+        # Assert
+        assert composer.image_size == Size(image.shape[1], image.shape[0])
+        assert np.array_equal(
+            composed[: image.shape[0], : image.shape[1]], image[:, :, 0]
+        )
+
+    def test_stored_tiles_are_decoded_once(self, image: np.ndarray):
+        # Arrange
+        mosaic = create_overlapping_mosaic(image, OVERLAP)
+        stored_tiles = StoredTiles(mosaic)
+        overlap = TileOverlap.from_regular_grid(
+            OpenTileSize(mosaic.shape[1], mosaic.shape[0]),
+            OpenTileSize(STORED_TILE_SIZE, STORED_TILE_SIZE),
+            OpenTileSize(OVERLAP, OVERLAP),
+        )
+        composer = TileComposer(overlap, Size(3, 3), 1, stored_tiles.decode)
+
+        # Act
+        for tile in Region(Point(0, 0), composer.tiled_size).iterate_all():
+            composer.get_tile(tile)
+
+        # Assert
+        assert set(stored_tiles.decodes.values()) == {1}
+
+    def test_uncovered_pixels_are_white(self):
+        # Arrange
+        overlap = TileOverlap(OpenTileSize(8, 4), {})
+        composer = TileComposer(
+            overlap, Size(4, 4), 3, StoredTiles(np.zeros((0, 0, 1))).decode
+        )
+
+        # Act
+        tile = composer.get_tile(Point(1, 0))
+
+        # Assert
+        assert tile.shape == (4, 4, 3)
+        assert np.all(tile == 255)
+
+    def test_is_stored_grid_without_overlap(self, image: np.ndarray):
+        # Arrange
+        mosaic = create_overlapping_mosaic(image, 0)
+        overlap = TileOverlap.from_regular_grid(
+            OpenTileSize(mosaic.shape[1], mosaic.shape[0]),
+            OpenTileSize(STORED_TILE_SIZE, STORED_TILE_SIZE),
+            OpenTileSize(0, 0),
+        )
+        composer = TileComposer(
+            overlap,
+            Size(STORED_TILE_SIZE, STORED_TILE_SIZE),
+            1,
+            StoredTiles(mosaic).decode,
+        )
+
+        # Act
+        is_stored_grid = composer.is_stored_grid(
+            Size(STORED_TILE_SIZE, STORED_TILE_SIZE)
+        )
+
+        # Assert
+        assert is_stored_grid
+
+    def test_is_not_stored_grid_with_overlap(self, image: np.ndarray):
+        # Arrange
+        mosaic = create_overlapping_mosaic(image, OVERLAP)
+        overlap = TileOverlap.from_regular_grid(
+            OpenTileSize(mosaic.shape[1], mosaic.shape[0]),
+            OpenTileSize(STORED_TILE_SIZE, STORED_TILE_SIZE),
+            OpenTileSize(OVERLAP, OVERLAP),
+        )
+        composer = TileComposer(
+            overlap,
+            Size(STORED_TILE_SIZE, STORED_TILE_SIZE),
+            1,
+            StoredTiles(mosaic).decode,
+        )
+
+        # Act
+        is_stored_grid = composer.is_stored_grid(
+            Size(STORED_TILE_SIZE, STORED_TILE_SIZE)
+        )
+
+        # Assert
+        assert not is_stored_grid
+
+    def test_get_aligned_piece_within_stored_tile(self, image: np.ndarray):
+        # Arrange
+        mosaic = create_overlapping_mosaic(image, 0)
+        overlap = TileOverlap.from_regular_grid(
+            OpenTileSize(mosaic.shape[1], mosaic.shape[0]),
+            OpenTileSize(STORED_TILE_SIZE, STORED_TILE_SIZE),
+            OpenTileSize(0, 0),
+        )
+        composer = TileComposer(overlap, Size(2, 2), 1, StoredTiles(mosaic).decode)
+
+        # Act
+        piece = composer.get_aligned_piece(
+            Point(3, 1), Size(2, 2), Size(STORED_TILE_SIZE, STORED_TILE_SIZE)
+        )
+
+        # Assert
+        assert piece is not None
+        assert piece.tile == Point(1, 0)
+        assert piece.source == Region(Point(2, 2), Size(2, 2))
+        assert piece.target == Point(0, 0)
+
+    def test_get_aligned_piece_not_on_alignment_grid(self, image: np.ndarray):
+        # Arrange
+        mosaic = create_overlapping_mosaic(image, 0)
+        overlap = TileOverlap.from_regular_grid(
+            OpenTileSize(mosaic.shape[1], mosaic.shape[0]),
+            OpenTileSize(STORED_TILE_SIZE, STORED_TILE_SIZE),
+            OpenTileSize(0, 0),
+        )
+        composer = TileComposer(overlap, Size(2, 2), 1, StoredTiles(mosaic).decode)
+
+        # Act
+        piece = composer.get_aligned_piece(
+            Point(3, 1), Size(4, 4), Size(STORED_TILE_SIZE, STORED_TILE_SIZE)
+        )
+
+        # Assert
+        assert piece is None
+
+    def test_get_aligned_piece_spanning_stored_tiles(self, image: np.ndarray):
+        # Arrange
+        mosaic = create_overlapping_mosaic(image, OVERLAP)
+        overlap = TileOverlap.from_regular_grid(
+            OpenTileSize(mosaic.shape[1], mosaic.shape[0]),
+            OpenTileSize(STORED_TILE_SIZE, STORED_TILE_SIZE),
+            OpenTileSize(OVERLAP, OVERLAP),
+        )
+        composer = TileComposer(overlap, Size(4, 4), 1, StoredTiles(mosaic).decode)
+
+        # Act
+        piece = composer.get_aligned_piece(
+            Point(1, 0), Size(1, 1), Size(STORED_TILE_SIZE, STORED_TILE_SIZE)
+        )
+
+        # Assert
+        assert piece is None
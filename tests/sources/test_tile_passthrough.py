@@ -0,0 +1,278 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from collections.abc import Iterator
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pytest
+from decoy import Decoy
+from fsspec import AbstractFileSystem
+from fsspec.implementations.memory import MemoryFileSystem
+from opentile.tiff_image import TiffImage
+from PIL import Image
+from tifffile import TiffFile, TiffPage, TiffWriter
+from wsidicom.geometry import Point, Size
+
+from tests.conftest import write_jpeg_tables_tiff
+from wsidicomizer.sources.opentile.tile_passthrough import (
+    ByteRun,
+    FsspecByteRangeReader,
+    LocalByteRangeReader,
+    TilePassthrough,
+    plan_byte_runs,
+)
+
+
+@pytest.fixture
+def tiled_tiff(tmp_path: Path) -> Path:
+    path = tmp_path.joinpath("tiled.tif")
+    data = np.random.default_rng(0).integers(0, 255, (64, 96), dtype=np.uint8)
+    with TiffWriter(path) as writer:
+        writer.write(data, tile=(32, 32), compression="zlib")
+    return path
+
+
+@pytest.fixture
+def reader(tiled_tiff: Path) -> Iterator[LocalByteRangeReader]:
+    reader = LocalByteRangeReader(tiled_tiff)
+    yield reader
+    reader.close()
+
+
+@pytest.fixture
+def page(tiled_tiff: Path) -> Iterator[TiffPage]:
+    with TiffFile(tiled_tiff) as tiff:
+        page = tiff.pages.first
+        assert isinstance(page, TiffPage)
+        yield page
+
+
+def read_stored_tile(path: Path, page: TiffPage, index: int) -> bytes:
+    with open(path, "rb") as file:
+        file.seek(page.dataoffsets[index])
+        return file.read(page.databytecounts[index])
+
+
+@pytest.mark.unittest
+class TestPlanByteRuns:
+    def test_contiguous_ranges_are_merged(self):
+        # Arrange
+        ranges = [(10, 5), (15, 5), (20, 5)]
+
+        # Act
+        runs = plan_byte_runs(ranges)
+
+        # Assert
+        assert runs == [ByteRun(10, 25, [0, 1, 2])]
+
+    def test_separated_ranges_are_not_merged(self):
+        # Arrange
+        ranges = [(10, 5), (16, 5)]
+
+        # Act
+        runs = plan_byte_runs(ranges)
+
+        # Assert
+        assert runs == [ByteRun(10, 15, [0]), ByteRun(16, 21, [1])]
+
+    def test_ranges_within_max_gap_are_merged(self):
+        # Arrange
+        ranges = [(10, 5), (18, 5), (30, 5)]
+
+        # Act
+        runs = plan_byte_runs(ranges, max_gap=3)
+
+        # Assert
+        assert runs == [ByteRun(10, 23, [0, 1]), ByteRun(30, 35, [2])]
+
+    def test_ranges_are_planned_in_offset_order(self):
+        # Arrange
+        ranges = [(20, 5), (10, 5), (15, 5)]
+
+        # Act
+        runs = plan_byte_runs(ranges)
+
+        # Assert
+        assert runs == [ByteRun(10, 25, [1, 2, 0])]
+
+
+@pytest.mark.unittest
+class TestLocalByteRangeReader:
+    def test_read_runs(self, tmp_path: Path):
+        # Arrange
+        path = tmp_path.joinpath("file")
+        path.write_bytes(bytes(range(100)))
+        reader = LocalByteRangeReader(path)
+
+        # Act
+        data = reader.read_runs([ByteRun(10, 20, [0]), ByteRun(50, 52, [1])])
+        reader.close()
+
+        # Assert
+        assert [bytes(run) for run in data] == [bytes(range(10, 20)), bytes([50, 51])]
+
+    def test_read_past_end_raises(self, tmp_path: Path):
+        # Arrange
+        path = tmp_path.joinpath("file")
+        path.write_bytes(bytes(10))
+        reader = LocalByteRangeReader(path)
+
+        # Act & Assert
+        with pytest.raises(EOFError):
+            reader.read_runs([ByteRun(5, 15, [0])])
+        reader.close()
+
+
+@pytest.mark.unittest
+class TestFsspecByteRangeReader:
+    def test_read_runs(self):
+        # Arrange
+        fs = MemoryFileSystem()
+        fs.pipe_file("/file", bytes(range(100)))
+        reader = FsspecByteRangeReader(fs, "/file", max_gap=0, max_connections=2)
+
+        # Act
+        data = reader.read_runs(
+            [ByteRun(10, 20, [0]), ByteRun(50, 52, [1]), ByteRun(90, 100, [2])]
+        )
+        reader.close()
+
+        # Assert
+        assert [bytes(run) for run in data] == [
+            bytes(range(10, 20)),
+            bytes([50, 51]),
+            bytes(range(90, 100)),
+        ]
+
+    def test_read_past_end_raises(self):
+        # Arrange
+        fs = MemoryFileSystem()
+        fs.pipe_file("/file", bytes(10))
+        reader = FsspecByteRangeReader(fs, "/file", max_gap=0, max_connections=2)
+
+        # Act & Assert
+        with pytest.raises(EOFError):
+            reader.read_runs([ByteRun(5, 15, [0])])
+        reader.close()
+
+    def test_read_text_raises(self, decoy: Decoy):
+        # Arrange
+        fs = decoy.mock(cls=AbstractFileSystem)
+        decoy.when(fs.cat_file("/file", 0, 4)).then_return("text")
+        reader = FsspecByteRangeReader(fs, "/file", max_gap=0, max_connections=2)
+
+        # Act & Assert
+        with pytest.raises(TypeError):
+            reader.read_runs([ByteRun(0, 4, [0])])
+        reader.close()
+
+
+@pytest.mark.unittest
+class TestTilePassthrough:
+    def test_get_tiles_returns_stored_tiles(
+        self, tiled_tiff: Path, page: TiffPage, reader: LocalByteRangeReader
+    ):
+        # Arrange
+        passthrough = TilePassthrough(page, 3, reader, None, 0)
+        tiles = [Point(2, 1), Point(0, 0), Point(1, 0)]
+
+        # Act
+        read_tiles = passthrough.get_tiles(tiles)
+
+        # Assert
+        assert read_tiles == [
+            read_stored_tile(tiled_tiff, page, tile.y * 3 + tile.x) for tile in tiles
+        ]
+
+    def test_get_tiles_with_gap_returns_stored_tiles(
+        self, tiled_tiff: Path, page: TiffPage
+    ):
+        # Arrange
+        fs = MemoryFileSystem()
+        fs.pipe_file("/tiled.tif", tiled_tiff.read_bytes())
+        reader = FsspecByteRangeReader(
+            fs, "/tiled.tif", max_gap=1024 * 1024, max_connections=2
+        )
+        passthrough = TilePassthrough(page, 3, reader, None, 0)
+        tiles = [Point(0, 0), Point(2, 1)]
+
+        # Act
+        read_tiles = passthrough.get_tiles(tiles)
+        reader.close()
+
+        # Assert
+        assert read_tiles == [
+            read_stored_tile(tiled_tiff, page, tile.y * 3 + tile.x) for tile in tiles
+        ]
+
+    def test_get_tiles_replaces_header_with_prefix(
+        self, tiled_tiff: Path, page: TiffPage, reader: LocalByteRangeReader
+    ):
+        # Arrange
+        passthrough = TilePassthrough(page, 3, reader, b"prefix", 2)
+
+        # Act
+        read_tiles = passthrough.get_tiles([Point(1, 1)])
+
+        # Assert
+        assert read_tiles == [b"prefix" + read_stored_tile(tiled_tiff, page, 4)[2:]]
+
+    def test_create_returns_none_for_not_natively_tiled_image(
+        self, decoy: Decoy, reader: LocalByteRangeReader
+    ):
+        # Arrange
+        tiff_image = decoy.mock(cls=TiffImage)
+
+        # Act
+        passthrough = TilePassthrough.create(tiff_image, reader)
+
+        # Assert
+        assert passthrough is None
+
+    def test_from_page_returns_none_for_not_jpeg_page(
+        self, page: TiffPage, reader: LocalByteRangeReader
+    ):
+        # Act
+        passthrough = TilePassthrough.from_page(page, reader)
+
+        # Assert
+        assert passthrough is None
+
+    def test_from_page_adds_jpeg_tables_to_tiles(self, tmp_path: Path):
+        # Arrange
+        path = tmp_path.joinpath("tables.tif")
+        array = np.random.default_rng(0).integers(0, 255, (100, 120, 3), np.uint8)
+        write_jpeg_tables_tiff(path, array, 64)
+        reader = LocalByteRangeReader(path)
+        with TiffFile(path) as tiff:
+            page = tiff.pages.first
+            assert isinstance(page, TiffPage)
+            assert page.jpegtables
+            expected = page.asarray()
+
+            # Act
+            passthrough = TilePassthrough.from_page(page, reader)
+            assert passthrough is not None
+            read_tiles = passthrough.get_tiles([Point(1, 1), Point(0, 0)])
+        reader.close()
+
+        # Assert
+        for tile, read_tile in zip([Point(1, 1), Point(0, 0)], read_tiles, strict=True):
+            with Image.open(BytesIO(read_tile)) as image:
+                decoded = np.asarray(image)
+            start = tile * Size(64, 64)
+            stored = expected[start.y : start.y + 64, start.x : start.x + 64]
+            assert np.array_equal(decoded[: stored.shape[0], : stored.shape[1]], stored)
@@ -114,7 +114,9 @@ class TestPixelWsiInstance:
         region = Region(position=Point(0, 0), size=Size(400, 300))
         output_size = Size(200, 150)
         array = np.zeros((300, 400, 3), np.uint8)
-        decoy.when(image_data.read_region(region, 0.0, "0")).then_return(array)
+        decoy.when(image_data.read_region_at_scale(region, 0.0, "0", 2.0)).then_return(
+            array
+        )
 
         # Act
         result = pixel_wsi_instance.get_region(
@@ -125,6 +127,43 @@ class TestPixelWsiInstance:
         assert isinstance(result, np.ndarray)
         assert result.shape == (output_size.height, output_size.width, 3)
 
+    def test_get_region_returns_array_read_at_output_size(
+        self,
+        decoy: Decoy,
+        instance: tuple[PixelWsiInstance, PixelImageData],
+        read_executor: ReadExecutor,
+    ):
+        # Arrange
+        pixel_wsi_instance, image_data = instance
+        region = Region(position=Point(0, 0), size=Size(800, 600))
+        output_size = Size(200, 150)
+        array = np.zeros((150, 200, 3), np.uint8)
+        decoy.when(image_data.read_region_at_scale(region, 0.0, "0", 4.0)).then_return(
+            array
+        )
+
+        # Act
+        result = pixel_wsi_instance.get_region(
+            region, z=0.0, path="0", output_size=output_size, executor=read_executor
+        )
+
+        # Assert — the natively downscaled array is returned unmodified
+        assert result is array
+
+    @pytest.mark.parametrize(
+        ["scale", "expected_level"],
+        [(1.0, 0), (1.9, 0), (2.0, 1), (3.0, 1), (3.99, 2), (32.0, 3)],
+    )
+    def test_select_level_for_scale(self, scale: float, expected_level: int):
+        # Arrange
+        level_downsamples = [1.0, 2.0, 4.0001, 16.0]
+
+        # Act
+        level = PixelImageData._select_level_for_scale(level_downsamples, 0, scale)
+
+        # Assert
+        assert level == expected_level
+
     def test_get_region_skips_downsample_when_output_matches_region(
         self,
         decoy: Decoy,
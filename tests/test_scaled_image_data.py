@@ -0,0 +1,139 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from io import BytesIO
+
+import numpy as np
+import pytest
+from decoy import Decoy
+from PIL import Image
+from pydicom.uid import JPEGBaseline8Bit
+from wsidicom import ImageData
+from wsidicom.codec import Encoder
+from wsidicom.geometry import Point, Size, SizeMm
+
+from wsidicomizer.scaled_image_data import ScaledJpegImageData
+
+TILE_SIZE = Size(64, 64)
+
+
+def encode_jpeg(color: tuple[int, int, int]) -> bytes:
+    with BytesIO() as buffer:
+        Image.new("RGB", TILE_SIZE.to_tuple(), color).save(
+            buffer, format="jpeg", quality=95
+        )
+        return buffer.getvalue()
+
+
+@pytest.fixture
+def source(decoy: Decoy) -> ImageData:
+    encoder = decoy.mock(cls=Encoder)
+    decoy.when(encoder.photometric_interpretation).then_return("YBR_FULL_422")
+    decoy.when(encoder.bits).then_return(8)
+    source = decoy.mock(cls=ImageData)
+    decoy.when(source.encoder).then_return(encoder)
+    decoy.when(source.transcoder).then_return(None)
+    decoy.when(source.transfer_syntax).then_return(JPEGBaseline8Bit)
+    decoy.when(source.photometric_interpretation).then_return("YBR_FULL_422")
+    decoy.when(source.samples_per_pixel).then_return(3)
+    decoy.when(source.image_size).then_return(Size(100, 100))
+    decoy.when(source.tile_size).then_return(TILE_SIZE)
+    decoy.when(source.tiled_size).then_return(Size(2, 2))
+    decoy.when(source.pixel_spacing).then_return(SizeMm(0.001, 0.001))
+    return source
+
+
+@pytest.mark.unittest
+class TestScaledJpegImageData:
+    def test_geometry_is_scaled(self, source: ImageData):
+        # Act
+        image_data = ScaledJpegImageData(source, 2)
+
+        # Assert
+        assert image_data.image_size == Size(50, 50)
+        assert image_data.tile_size == TILE_SIZE
+        assert image_data.pixel_spacing == SizeMm(0.002, 0.002)
+
+    def test_get_decoded_tile_stitches_downscaled_tiles(
+        self, decoy: Decoy, source: ImageData
+    ):
+        # Arrange
+        decoy.when(
+            source.get_encoded_tiles(
+                [Point(0, 0), Point(1, 0), Point(0, 1), Point(1, 1)], 0.0, "0"
+            )
+        ).then_return(
+            iter(
+                [
+                    encode_jpeg((255, 0, 0)),
+                    encode_jpeg((0, 255, 0)),
+                    encode_jpeg((0, 0, 255)),
+                    encode_jpeg((0, 0, 0)),
+                ]
+            )
+        )
+        image_data = ScaledJpegImageData(source, 2)
+
+        # Act
+        tile = image_data.get_decoded_tile(Point(0, 0), 0.0, "0")
+
+        # Assert
+        assert tile.shape == (64, 64, 3)
+        expected = {
+            (0, 0): (255, 0, 0),
+            (0, 32): (0, 255, 0),
+            (32, 0): (0, 0, 255),
+            (32, 32): (0, 0, 0),
+        }
+        for (y, x), color in expected.items():
+            assert np.allclose(tile[y + 16, x + 16], color, atol=8)
+
+    def test_get_decoded_tile_skips_tiles_outside_source(
+        self, decoy: Decoy, source: ImageData
+    ):
+        # Arrange
+        decoy.when(
+            source.get_encoded_tiles([Point(0, 0), Point(1, 0)], 0.0, "0")
+        ).then_return(iter([encode_jpeg((255, 0, 0)), encode_jpeg((0, 255, 0))]))
+        decoy.when(source.tiled_size).then_return(Size(2, 1))
+        image_data = ScaledJpegImageData(source, 4)
+
+        # Act
+        tile = image_data.get_decoded_tile(Point(0, 0), 0.0, "0")
+
+        # Assert
+        assert np.allclose(tile[8, 8], (255, 0, 0), atol=8)
+        assert np.allclose(tile[8, 24], (0, 255, 0), atol=8)
+        assert np.all(tile[:, 32:] == 255)
+        assert np.all(tile[16:] == 255)
+
+    @pytest.mark.parametrize(
+        ["scale", "expected_result"], [(2, True), (8, True), (3, False), (16, False)]
+    )
+    def test_is_supported(self, source: ImageData, scale: int, expected_result: bool):
+        # Act
+        result = ScaledJpegImageData.is_supported(source, scale)
+
+        # Assert
+        assert result == expected_result
+
+    def test_is_not_supported_if_transcoded(self, decoy: Decoy, source: ImageData):
+        # Arrange
+        decoy.when(source.transcoder).then_return(source.encoder)
+
+        # Act
+        result = ScaledJpegImageData.is_supported(source, 2)
+
+        # Assert
+        assert not result
@@ -45,9 +45,68 @@ class Settings(DicomSettings):
     """Default tile size to use."""
     czi_block_cache_size: int = 8
     """Size of block cache to use for czi files."""
+    czi_max_block_tile_size: int = 2048
+    """Largest subblock width and height in pixels to use as tile size for czi
+    files with subblocks forming a regular grid. Files with larger subblocks,
+    e.g. a single subblock holding the whole image, use the default tile size."""
     insert_icc_profile_if_missing: bool = True
     """Whether to insert a default ICC profile in the DICOM file if no profile
     is present in the source file or provided metadata."""
+    remote_read_max_gap: int = 64 * 1024
+    """Largest gap in bytes between two passed through tiles for them to be
+    fetched in the same range request, for files on remote filesystems."""
+    remote_read_max_connections: int = 8
+    """Largest number of concurrent range requests per file, for files on remote
+    filesystems."""
+    remote_block_size: int = 1024 * 1024
+    """Size in bytes of the blocks that files on remote filesystems read by the
+    opentile and tiffslide sources are fetched and cached in."""
+    remote_block_cache_size: int = 128
+    """Number of blocks of a file on a remote filesystem to keep in memory. If 0,
+    files are read without the block cache."""
+    remote_block_spill_size: int = 0
+    """Number of blocks evicted from memory to keep in a temporary directory on
+    disk. If 0, evicted blocks are discarded."""
+    remote_read_ahead_blocks: int = 4
+    """Number of blocks to fetch in the background ahead of reads that continue
+    where the previous read of the file ended."""
+    overlap_tile_cache_size: int = 128
+    """Number of decoded stored tiles to cache when composing levels of formats
+    with overlapping tiles (e.g. Ventana, Trestle)."""
+    lossless_jpeg_cropping: bool = True
+    """Whether to losslessly crop composed tiles that lie within a single stored
+    baseline JPEG tile on its MCU grid, instead of decoding and encoding them.
+    Requires libturbojpeg."""
+    region_read_max_width: int = 8192
+    """Largest width in pixels of the blocks of adjacent tiles that openslide,
+    tiffslide, isyntax and bioformats levels read with one region read."""
+    openslide_cache_size: int | None = None
+    """Size in bytes of the tile cache of each openslide handle reading a slide.
+    If None, the default cache size of openslide is used."""
+    isyntax_cache_memory: int = 512 * 1024 * 1024
+    """Memory budget in bytes of the tile cache of each handle reading an isyntax
+    file, used to size the cache when the `cache` source argument is None."""
+    bioformats_cache_path: str | None = None
+    """Directory to keep the caches of Bio-Formats readers in between opens of a
+    file, so that files opened again are not parsed again. If None, caches are
+    kept in a temporary directory removed when the file is closed. The
+    `cache_path` source argument takes precedence."""
+    bioformats_cache_max_size: int | None = 1024 * 1024 * 1024
+    """Largest total size in bytes of the caches in a persistent Bio-Formats cache
+    directory. The least recently used caches are removed when a file is opened.
+    If None, caches are not removed by size."""
+    bioformats_cache_max_age: float | None = 30 * 24 * 60 * 60
+    """Largest time in seconds since a cache in a persistent Bio-Formats cache
+    directory was used for it to be kept. If None, caches are not removed by
+    age."""
+    bioformats_warm_readers: int | None = 1
+    """Number of Bio-Formats readers to open when a file is opened, concurrently
+    after the first reader has cached the parsed file. Further readers are opened
+    from the cache when needed by concurrent reads. If None, the largest number
+    of readers the source may use is opened."""
+    transcoding_workers: int | None = None
+    """Number of threads decoding and encoding the tiles of a batch for opentile
+    levels that are transcoded. If None, the number of cpus is used."""
     opentile: OpenTileSettings = field(default_factory=OpenTileSettings)
     """Settings for the opentile source (e.g. used when reading NDPI files)."""
 
@@ -15,6 +15,7 @@
 """Module containing a base Source implementation suitable for use with non-DICOM
 files."""
 
+import math
 from abc import ABCMeta, abstractmethod
 from collections.abc import Sequence
 from dataclasses import replace
@@ -31,6 +32,7 @@ from wsidicom import ImageData
 from wsidicom.codec import Encoder, Jpeg2kSettings, JpegSettings
 from wsidicom.codec.settings import Channels
 from wsidicom.conceptcode import ContributingEquipmentPurposeCode
+from wsidicom.geometry import Size
 from wsidicom.graphical_annotations import AnnotationInstance
 from wsidicom.instance import WsiDataset, WsiInstance
 from wsidicom.metadata import (
@@ -52,6 +54,7 @@ from wsidicomizer.metadata import (
     MetadataPreProcessor,
     WsiDicomizerMetadata,
 )
+from wsidicomizer.scaled_image_data import ScaledJpegImageData
 from wsidicomizer.uid_resolver import MetadataUidResolver
 
 config.enforce_valid_values = True
@@ -116,6 +119,7 @@ class DicomizerSource(Source, metaclass=ABCMeta):
         self._filepath = filepath
         self._provided_encoder = encoder
         self._tile_size = tile_size
+        self._scaled_levels_added = False
         self._user_metadata = metadata
         self._default_metadata = default_metadata
         self._include_confidential = include_confidential
@@ -352,6 +356,79 @@ class DicomizerSource(Source, metaclass=ABCMeta):
     def annotation_instances(self) -> list[AnnotationInstance]:
         return []
 
+    def add_scaled_levels(self) -> None:
+        """Add the dyadic levels missing above levels of stored baseline JPEG
+        tiles, up to a scale of 8 and the level that fits in a single tile. The
+        added levels are decoded downscaled from the JPEG level by libjpeg, which
+        is several times cheaper than decoding at full resolution and
+        downsampling, as is done when the levels are generated when saving."""
+        if self._scaled_levels_added:
+            return
+        self._scaled_levels_added = True
+        pyramids: list[list[WsiInstance]] = []
+        for instance in self.level_instances:
+            pyramid = next(
+                (
+                    pyramid
+                    for pyramid in pyramids
+                    if pyramid[0].image_data.image_coordinate_system
+                    == instance.image_data.image_coordinate_system
+                ),
+                None,
+            )
+            if pyramid is None:
+                pyramids.append([instance])
+            else:
+                pyramid.append(instance)
+        for pyramid in pyramids:
+            self.level_instances.extend(self._create_scaled_level_instances(pyramid))
+
+    def _create_scaled_level_instances(
+        self, pyramid: Sequence[WsiInstance]
+    ) -> list[WsiInstance]:
+        """Return instances for the levels missing above the levels in pyramid
+        that can be downscaled while decoding."""
+        image_datas = [
+            instance.image_data
+            for instance in pyramid
+            if instance.image_data.pixel_spacing is not None
+        ]
+        if len(image_datas) == 0:
+            return []
+        base_pixel_spacing = min(
+            image_data.pixel_spacing.width
+            for image_data in image_datas
+            if image_data.pixel_spacing is not None
+        )
+        levels = [
+            round(math.log2(image_data.pixel_spacing.width / base_pixel_spacing))
+            for image_data in image_datas
+            if image_data.pixel_spacing is not None
+        ]
+        scaled_instances: list[WsiInstance] = []
+        for image_data, level in zip(image_datas, levels, strict=True):
+            for scale in ScaledJpegImageData.SCALES:
+                scaled_level = level + int(math.log2(scale))
+                # Stop at the next level present, or if the level below already
+                # fits in a single tile.
+                previous_tiled_size = image_data.image_size.ceil_div(
+                    scale // 2
+                ).ceil_div(image_data.tile_size)
+                if (
+                    scaled_level in levels
+                    or previous_tiled_size == Size(1, 1)
+                    or not ScaledJpegImageData.is_supported(image_data, scale)
+                ):
+                    break
+                scaled_instances.append(
+                    self._create_instance(
+                        ScaledJpegImageData(image_data, scale),
+                        ImageType.VOLUME,
+                        scaled_level,
+                    )
+                )
+        return scaled_instances
+
     def _create_instance(
         self,
         image_data: ImageData,
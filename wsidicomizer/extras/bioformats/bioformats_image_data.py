@@ -14,17 +14,23 @@
 
 """Image data read by bioformats."""
 
-from contextlib import AbstractContextManager
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 import numpy as np
-from pydicom.uid import UID
+from opentile.jpeg import Jpeg, JpegProcess
+from pydicom.uid import UID, JPEGBaseline8Bit
 from wsidicom.codec import Encoder
 from wsidicom.geometry import Point, Region, Size, SizeMm
+from wsidicom.metadata import ImageCoordinateSystem
 
 from wsidicomizer.config import get_settings
 from wsidicomizer.extras.bioformats.bioformats_reader import BioformatsReader
 from wsidicomizer.image_data import BaseDicomizerImageData
+from wsidicomizer.sources.openslide_like.tile_blocks import (
+    get_block_width,
+    plan_tile_blocks,
+)
 
 
 class BioformatsImageData(BaseDicomizerImageData):
@@ -36,21 +42,38 @@ class BioformatsImageData(BaseDicomizerImageData):
         image_index: int,
         resolution_index: int,
         imaged_size: SizeMm | None = None,
+        force_transcoding: bool = False,
+        image_coordinate_system: ImageCoordinateSystem | None = None,
+        align_tile_size: bool = True,
     ) -> None:
         super().__init__(encoder)
-        if tile_size is None:
-            tile_size = get_settings().default_tile_size
-        self._tile_size = Size(tile_size, tile_size)
         self._image_reader = reader
         self._image_index = image_index
         self._resolution_index = resolution_index
+        native_tile_size = reader.optimal_tile_size(image_index, resolution_index)
+        if tile_size is None:
+            tile_size = get_settings().default_tile_size
+        if align_tile_size:
+            tile_size = self._get_aligned_tile_size(native_tile_size, tile_size)
+        self._tile_size = Size(tile_size, tile_size)
         self._image_region = Region(Point(0, 0), self.image_size)
         self._imaged_size = imaged_size
+        self._image_coordinate_system = image_coordinate_system
+        self._block_width = get_block_width(
+            tile_size, native_tile_size.width, get_settings().region_read_max_width
+        )
+        self._passthrough = not force_transcoding and self._can_pass_through(
+            native_tile_size
+        )
 
     @property
     def image_region(self) -> Region:
         return self._image_region
 
+    @property
+    def image_coordinate_system(self) -> ImageCoordinateSystem | None:
+        return self._image_coordinate_system
+
     @property
     def files(self) -> list[Path]:
         return [Path(self._image_reader.filepath)]
@@ -97,14 +120,17 @@ class BioformatsImageData(BaseDicomizerImageData):
     def thread_safe(self) -> bool:
         return True
 
-    def _get_tile(
-        self, tile_point: Point, z: float, path: str
-    ) -> AbstractContextManager[np.ndarray]:
-        region = Region(tile_point * self.tile_size, self.tile_size)
-        cropped_region = self.image_region.crop(region)
-        return self._image_reader.read_image(
-            self._image_index, self._resolution_index, cropped_region, self.tile_size
-        )
+    @property
+    def transcoder(self) -> Encoder | None:
+        """Only return encoder if compressed tiles are not passed through."""
+        if self._passthrough:
+            return None
+        return self.encoder
+
+    @property
+    def suggested_minimum_chunk_size(self) -> int:
+        """A chunk should span a block of tiles read in one region read."""
+        return self._block_width
 
     def get_decoded_tile(
         self,
@@ -113,19 +139,172 @@ class BioformatsImageData(BaseDicomizerImageData):
         path: str,
         cache: bool = True,
     ) -> np.ndarray:
-        """Return the pixels of a tile.
-
-        The source tile is a transient (context-managed) buffer, so it is
-        copied out directly.
-        """
-        with self._get_tile(tile_point, z, path) as data:
-            return np.array(data)
+        """Return the pixels of a tile."""
+        return self._get_tiles([tile_point])[0]
 
     def get_encoded_tile(self, tile: Point, z: float, path: str) -> bytes:
         """Return image bytes for tile defined by tile (x, y), z,
         and optical path."""
-        with self._get_tile(tile, z, path) as data:
-            return self.encoder.encode(data)
+        return self._get_encoded_tiles([tile])[0]
+
+    def get_decoded_tiles(
+        self,
+        tiles: Iterable[Point],
+        z: float,
+        path: str,
+        cache: bool = True,
+    ) -> Iterator[np.ndarray]:
+        """Return the pixels of multiple tiles, read in blocks of adjacent tiles.
+
+        Parameters
+        ----------
+        tiles: Iterable[Point]
+            Tiles to get.
+        z: float
+            Focal plane of tiles to get.
+        path: str
+            Optical path of tiles to get.
+
+        Returns
+        ----------
+        Iterator[np.ndarray]
+            Tile pixels.
+        """
+        return iter(self._get_tiles(tiles))
+
+    def get_encoded_tiles(
+        self, tiles: Iterable[Point], z: float, path: str
+    ) -> Iterator[bytes]:
+        """Return bytes of multiple tiles, read in blocks of adjacent tiles.
+
+        Parameters
+        ----------
+        tiles: Iterable[Point]
+            Tiles to get.
+        z: float
+            Focal plane of tiles to get.
+        path: str
+            Optical path of tiles to get.
+
+        Returns
+        ----------
+        Iterator[bytes]
+            Tile bytes.
+        """
+        return iter(self._get_encoded_tiles(tiles))
+
+    def _get_encoded_tiles(self, tiles: Iterable[Point]) -> list[bytes]:
+        """Return the bytes of tiles.
+
+        If passing through, the stored compressed bytes of tiles within the
+        image are read from file. Other tiles are read in blocks and encoded."""
+        tiles = list(tiles)
+        if not self._passthrough:
+            return [self.encoder.encode(tile) for tile in self._get_tiles(tiles)]
+        transcoded_tiles = [tile for tile in tiles if not self._is_inside(tile)]
+        encoded = {
+            tile: self.encoder.encode(pixels)
+            for tile, pixels in zip(
+                transcoded_tiles, self._get_tiles(transcoded_tiles), strict=True
+            )
+        }
+        return [
+            encoded[tile]
+            if tile in encoded
+            else self._image_reader.read_compressed_tile(
+                self._image_index, self._resolution_index, tile
+            )
+            for tile in tiles
+        ]
+
+    def _is_inside(self, tile: Point) -> bool:
+        """Return true if the tile is fully inside the image, and thus not
+        padded."""
+        region = Region(tile * self.tile_size, self.tile_size)
+        return self.image_region.crop(region) == region
+
+    def _can_pass_through(self, native_tile_size: Size) -> bool:
+        """Return true if the compressed tiles the reader can read are baseline
+        JPEG compatible with the encoder and have the same grid as the tiles, so
+        that they can be passed through without re-encoding."""
+        if (
+            native_tile_size != self.tile_size
+            or self.encoder.transfer_syntax != JPEGBaseline8Bit
+            or self._image_reader.dtype(self._image_index) != np.uint8
+            or self._image_reader.compressed_tile_codec(
+                self._image_index, self._resolution_index
+            )
+            != "JPEGCodec"
+            or self._image_reader.compressed_tiled_size(
+                self._image_index, self._resolution_index
+            )
+            != self.tiled_size
+        ):
+            return False
+        frame = self._image_reader.read_compressed_tile(
+            self._image_index, self._resolution_index, Point(0, 0)
+        )
+        # Tiles stored without quantization or huffman tables (e.g. using
+        # shared JPEG tables in tiff) are not complete frames.
+        if b"\xff\xdb" not in frame or b"\xff\xc4" not in frame:
+            return False
+        info = Jpeg.info(frame)
+        if (
+            info.process != JpegProcess.BASELINE
+            or info.bit_depth != 8
+            or info.components != self.samples_per_pixel
+        ):
+            return False
+        # Blank and edge tiles are encoded, and must match the passed through
+        # tiles.
+        return (
+            self._get_jpeg_photometric_interpretation(info)
+            == self.photometric_interpretation
+        )
+
+    def _get_tiles(self, tiles: Iterable[Point]) -> list[np.ndarray]:
+        """Return the pixels of tiles.
+
+        Adjacent tiles are read in blocks, each block with one read from file,
+        so that the overhead of calling Bio-Formats is paid once per block.
+        Blocks are aligned to the native tiles and read in row order. The
+        block is de-interleaved once, and the tiles copied out of the read
+        buffer. Tiles on the image edge are padded to the tile size."""
+        tiles = list(tiles)
+        read: dict[Point, np.ndarray] = {}
+        for block in plan_tile_blocks(tiles, self._block_width):
+            region = self.image_region.crop(
+                Region(block.start * self.tile_size, block.size * self.tile_size)
+            )
+            with self._image_reader.read_image(
+                self._image_index, self._resolution_index, region
+            ) as data:
+                for tile in block.iterate_all():
+                    offset = tile * self.tile_size - region.start
+                    pixels = data[
+                        offset.y : offset.y + self.tile_size.height,
+                        offset.x : offset.x + self.tile_size.width,
+                    ]
+                    read[tile] = self._pad_to_tile_size(pixels)
+        return [read[tile] for tile in tiles]
+
+    def _pad_to_tile_size(self, pixels: np.ndarray) -> np.ndarray:
+        """Return a copy of the pixels, padded with zeros to the tile size."""
+        padding_height = self.tile_size.height - pixels.shape[0]
+        padding_width = self.tile_size.width - pixels.shape[1]
+        if padding_height == 0 and padding_width == 0:
+            # Copy also if contiguous, as the pixels can be all the read data.
+            return pixels.copy(order="C")
+        return np.pad(pixels, ((0, padding_height), (0, padding_width), (0, 0)))
+
+    @staticmethod
+    def _get_aligned_tile_size(native_tile_size: Size, tile_size: int) -> int:
+        """Return the multiple of the native tile size closest to the tile size,
+        or the tile size if the native tiles are not square (e.g. strips)."""
+        if native_tile_size.width != native_tile_size.height:
+            return tile_size
+        multiple = max(round(tile_size / native_tile_size.width), 1)
+        return native_tile_size.width * multiple
 
     @staticmethod
     def detect_format(filepath: Path) -> bool:
@@ -18,19 +18,27 @@ import math
 import os
 from collections import deque
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from functools import cached_property
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from threading import Condition
+from threading import Condition, Lock
 
 import jpype.imports  # noqa: F401  # pyright: ignore[reportUnusedImport]
 import numpy as np
 import ome_types
 import scyjava
+from jpype import JObject
 from jpype.types import JArray
 from wsidicom.cache import lru_cached_method
-from wsidicom.geometry import Region, Size, SizeMm
+from wsidicom.geometry import Point, PointMm, Region, Size, SizeMm
+
+from wsidicomizer.config import get_settings
+from wsidicomizer.extras.bioformats.memo_cache import (
+    evict_memo_files,
+    touch_memo_file,
+)
 
 """
 Set version of bioformats jar to use with the environmental variable
@@ -40,15 +48,40 @@ license.
 bioformats_version = os.getenv("BIOFORMATS_VERSION", "bsd:8.3.0")
 scyjava.config.endpoints.append(f"ome:formats-{bioformats_version}")
 
-if not scyjava.jvm_started():
-    scyjava.start_jvm()
+_jvm_lock = Lock()
 
-"""
-Load bioformats modules using jpype and scyjava
-"""
-from loci.common.services import ServiceFactory  # type: ignore # noqa
-from loci.formats import ImageReader, Memoizer  # type: ignore # noqa
-from loci.formats.services import OMEXMLService  # type: ignore # noqa
+
+def _start_jvm() -> None:
+    """Start the JVM with the Bio-Formats jar, unless already started. The JVM is
+    started when the first reader is created, not when the module is imported."""
+    with _jvm_lock:
+        if not scyjava.jvm_started():
+            scyjava.start_jvm()
+
+
+def _create_image_reader() -> JObject:
+    """Return a new Bio-Formats image reader, starting the JVM if needed."""
+    _start_jvm()
+    from loci.formats import ImageReader  # type: ignore # noqa
+
+    return ImageReader()
+
+
+def _create_memoizer(cache_path: Path) -> JObject:
+    """Return a new Bio-Formats image reader wrapped in a Memoizer caching the
+    parsed file in cache path, starting the JVM if needed."""
+    _start_jvm()
+    from loci.formats import ImageReader, Memoizer  # type: ignore # noqa
+
+    return Memoizer(ImageReader(), 0, cache_path)
+
+
+def _get_micrometer_unit() -> JObject:
+    """Return the OME micrometer unit, starting the JVM if needed."""
+    _start_jvm()
+    from ome.units import UNITS  # type: ignore # noqa
+
+    return UNITS.MICROMETER
 
 
 class BioFormatsReaderPool:
@@ -75,17 +108,29 @@ class BioFormatsReaderPool:
             concurrent callers).
         cache_path: Path | str | None
             Path to store cache file quicker opening of new readers. If `None`
-            a temporary directory will be used.
+            the `bioformats_cache_path` setting is used, and if that is `None` a
+            temporary directory will be used. Caches in a persistent directory
+            are kept between pools, and evicted by the `bioformats_cache_max_size`
+            and `bioformats_cache_max_age` settings when the pool is created.
         """
         self._filepath = path
+        settings = get_settings()
+        if cache_path is None:
+            cache_path = settings.bioformats_cache_path
         if cache_path is None:
             self._tempdir = TemporaryDirectory()
             self._cache_path = Path(self._tempdir.name)
         else:
             self._tempdir = None
             self._cache_path = Path(cache_path)
+            self._cache_path.mkdir(parents=True, exist_ok=True)
+            evict_memo_files(
+                self._cache_path,
+                settings.bioformats_cache_max_size,
+                settings.bioformats_cache_max_age,
+            )
         self._max_readers = max_readers
-        self._idle: deque[Memoizer] = deque()
+        self._idle: deque[JObject] = deque()
         self._count = 0
         self._condition = Condition()
 
@@ -94,7 +139,7 @@ class BioFormatsReaderPool:
         return self._filepath
 
     @contextmanager
-    def get_reader(self) -> Generator[Memoizer, None, None]:
+    def get_reader(self) -> Generator[JObject, None, None]:
         """Lease a reader for the duration of the context, blocking if none is free."""
         reader = self._acquire()
         try:
@@ -102,16 +147,68 @@ class BioFormatsReaderPool:
         finally:
             self._release(reader)
 
-    def _create_new_reader(self) -> Memoizer:
+    def warm(self, count: int) -> None:
+        """Open readers until count readers exist, or the maximum number of
+        readers.
+
+        The first reader of the pool is opened before the others, so that the
+        others are opened concurrently from the cache it creates.
+
+        Parameters
+        ----------
+        count: int
+            Number of readers to have opened.
+        """
+        with self._condition:
+            if self._max_readers is not None:
+                count = min(count, self._max_readers)
+            first = self._count == 0
+            missing = count - self._count
+            if missing <= 0:
+                return
+            self._count += missing
+        readers: list[JObject] = []
+        try:
+            if first:
+                readers.append(self._create_new_reader())
+            if len(readers) < missing:
+                with ThreadPoolExecutor(missing - len(readers)) as executor:
+                    futures = [
+                        executor.submit(self._create_new_reader)
+                        for _ in range(missing - len(readers))
+                    ]
+                # Keep the readers that opened, to close them if any failed.
+                readers.extend(
+                    future.result() for future in futures if not future.exception()
+                )
+                for future in futures:
+                    future.result()
+        except BaseException:
+            for reader in readers:
+                reader.close()
+            with self._condition:
+                self._count -= missing
+                self._condition.notify_all()
+            raise
+        with self._condition:
+            self._idle.extend(readers)
+            self._condition.notify_all()
+
+    def _create_new_reader(self) -> JObject:
         """Return a new reader."""
         # Create a reader using Memoizer to load file faster
         # See https://docs.openmicroscopy.org/bio-formats/6.11.0/developers/matlab-dev.html#reader-performance
-        reader = Memoizer(ImageReader(), 0, self._cache_path)
+        reader = _create_memoizer(self._cache_path)
         reader.setFlattenedResolutions(False)
         reader.setId(str(self._filepath))
+        if self._tempdir is None:
+            # Mark the cache as used, for eviction by least recent use.
+            memo_file = reader.getMemoFile(str(self._filepath))
+            if memo_file is not None:
+                touch_memo_file(Path(str(memo_file.getAbsolutePath())))
         return reader
 
-    def _acquire(self) -> Memoizer:
+    def _acquire(self) -> JObject:
         """Return an idle reader, create a new one if under the bound, else block
         until a reader is released or discarded."""
         with self._condition:
@@ -127,7 +224,7 @@ class BioFormatsReaderPool:
                 self._condition.notify()
                 raise
 
-    def _release(self, reader: Memoizer) -> None:
+    def _release(self, reader: JObject) -> None:
         """Return a reader to the idle set."""
         with self._condition:
             self._idle.append(reader)
@@ -164,19 +261,25 @@ class BioformatsReader:
             of cpus will be used.
         cache_path: Optional[Union[Path, str]] = None
             Path to store cache file quicker opening of new readers. If None
-            a temporary directory will be used.
+            the `bioformats_cache_path` setting is used, and if that is None a
+            temporary directory will be used.
         """
         if max_readers is None:
             cpu_count = os.cpu_count()
             max_readers = cpu_count if cpu_count is not None else 1
+        self._max_readers = max_readers
         self._reader_pool = BioFormatsReaderPool(
             path=filepath, max_readers=max_readers, cache_path=cache_path
         )
+        warm_readers = get_settings().bioformats_warm_readers
+        if warm_readers is None:
+            warm_readers = max_readers
+        self._reader_pool.warm(warm_readers)
 
     @staticmethod
     def is_supported(filepath: Path) -> bool:
         try:
-            reader = ImageReader()
+            reader = _create_image_reader()
             reader.setId(str(filepath))
             reader.close()
         except Exception:
@@ -188,20 +291,32 @@ class BioformatsReader:
         """Return filepath of the opened file."""
         return self._reader_pool.filepath
 
+    @property
+    def max_readers(self) -> int:
+        """Return the maximum number of readers used concurrently."""
+        return self._max_readers
+
     @cached_property
     def metadata(self) -> ome_types.OME:
-        """Return parsed metadata."""
+        """Return parsed metadata.
+
+        The full OME model is only parsed when requested, as parsing can be
+        slow for files with many planes or ROIs. The properties of the reader
+        read the fields they need from the metadata store instead."""
         metadata = self._read_metadata()
         return ome_types.from_xml(str(metadata), parser="lxml")
 
     @property
     def images_count(self) -> int:
         """Return number of images in file."""
-        return len(self.metadata.images)
+        return int(self._metadata_store.getImageCount())
 
     def image_name(self, image_index: int) -> str | None:
         """Return name of image."""
-        return self.metadata.images[image_index].name
+        name = self._metadata_store.getImageName(image_index)
+        if name is None:
+            return None
+        return str(name)
 
     @lru_cached_method()
     def dtype(self, image_index: int) -> np.dtype:
@@ -219,8 +334,11 @@ class BioformatsReader:
             "uint32": np.uint32,
             "uint8": np.uint8,
         }
-        byte_order = ">" if self.metadata.images[image_index].pixels.big_endian else "<"
-        data_type = self.metadata.images[image_index].pixels.type.value
+        big_endian = self._metadata_store.getPixelsBigEndian(image_index)
+        byte_order = (
+            ">" if big_endian is not None and big_endian.booleanValue() else "<"
+        )
+        data_type = str(self._metadata_store.getPixelsType(image_index).getValue())
         try:
             numpy_data_type = np.dtype(NUMPY_DATA_TYPES[data_type])
         except KeyError as exception:
@@ -230,10 +348,11 @@ class BioformatsReader:
     @lru_cached_method()
     def samples_per_pixel(self, image_index: int) -> int:
         """Return the samples per pixel for image in file."""
-        pixels = self.metadata.images[image_index].pixels
-        samples_per_pixel = pixels.channels[0].samples_per_pixel
+        samples_per_pixel = self._metadata_store.getChannelSamplesPerPixel(
+            image_index, 0
+        )
         assert samples_per_pixel is not None
-        return int(samples_per_pixel)
+        return int(samples_per_pixel.getValue())
 
     @lru_cached_method()
     def size(self, image_index: int, resolution_index: int = 0) -> Size:
@@ -245,27 +364,111 @@ class BioformatsReader:
             height = reader.getSizeY()
             return Size(int(width), int(height))
 
+    @lru_cached_method()
+    def optimal_tile_size(self, image_index: int, resolution_index: int = 0) -> Size:
+        """Return the size of the tiles the reader reads most efficiently, e.g.
+        the stored tiles, for image in file."""
+        with self._reader_pool.get_reader() as reader:
+            reader.setSeries(image_index)
+            reader.setResolution(resolution_index)
+            width = reader.getOptimalTileWidth()
+            height = reader.getOptimalTileHeight()
+            return Size(int(width), int(height))
+
+    @lru_cached_method()
+    def compressed_tile_codec(
+        self, image_index: int, resolution_index: int = 0
+    ) -> str | None:
+        """Return the name of the codec (e.g. `JPEGCodec`) of the compressed tiles
+        the reader can read for image in file, or None if the reader can not read
+        compressed tiles."""
+        with self._reader_pool.get_reader() as reader:
+            reader.setSeries(image_index)
+            reader.setResolution(resolution_index)
+            try:
+                codec = reader.getTileCodec(0)
+            except Exception:
+                return None
+            if codec is None:
+                return None
+            return str(codec.getClass().getSimpleName())
+
+    @lru_cached_method()
+    def compressed_tiled_size(
+        self, image_index: int, resolution_index: int = 0
+    ) -> Size:
+        """Return the number of compressed tiles for image in file."""
+        with self._reader_pool.get_reader() as reader:
+            reader.setSeries(image_index)
+            reader.setResolution(resolution_index)
+            columns = reader.getTileColumns(0)
+            rows = reader.getTileRows(0)
+            return Size(int(columns), int(rows))
+
+    def read_compressed_tile(
+        self, image_index: int, resolution_index: int, tile: Point, index: int = 0
+    ) -> bytes:
+        """Read the stored compressed bytes of a tile from file.
+
+        Parameters
+        ----------
+        image_index: int
+            The image to read the tile from.
+        resolution_index: int
+            The resolution to read the tile from.
+        tile: Point
+            Position of the tile in the compressed tile grid.
+        index: int
+            The index in image to read the tile from.
+
+        Returns
+        ----------
+        bytes
+            The compressed tile.
+        """
+        with self._reader_pool.get_reader() as reader:
+            reader.setSeries(image_index)
+            reader.setResolution(resolution_index)
+            return bytes(reader.openCompressedBytes(index, tile.x, tile.y))
+
     @lru_cached_method()
     def pixel_spacing(
         self, image_index: int, resolution_index: int = 0
     ) -> SizeMm | None:
         """Return the size of the pixels in mm/pixel for image in file."""
-        pixels = self.metadata.images[image_index].pixels
-        if pixels.physical_size_x is None or pixels.physical_size_y is None:
+        physical_size_x = self._get_micrometers(
+            self._metadata_store.getPixelsPhysicalSizeX(image_index)
+        )
+        physical_size_y = self._get_micrometers(
+            self._metadata_store.getPixelsPhysicalSizeY(image_index)
+        )
+        if physical_size_x is None or physical_size_y is None:
             return None
         scale = self._resolution_scales(image_index)[resolution_index]
-        return (
-            SizeMm(float(pixels.physical_size_x), float(pixels.physical_size_y))
-            * scale
-            / 1000
+        return SizeMm(physical_size_x, physical_size_y) * scale / 1000
+
+    @lru_cached_method()
+    def position(self, image_index: int) -> PointMm | None:
+        """Return the stage position in mm of the first plane of image in file,
+        or None if not recorded."""
+        if int(self._metadata_store.getPlaneCount(image_index)) == 0:
+            return None
+        position_x = self._get_micrometers(
+            self._metadata_store.getPlanePositionX(image_index, 0)
+        )
+        position_y = self._get_micrometers(
+            self._metadata_store.getPlanePositionY(image_index, 0)
         )
+        if position_x is None or position_y is None:
+            return None
+        return PointMm(position_x / 1000, position_y / 1000)
 
     @lru_cached_method()
     def is_interleaved(self, image_index: int) -> bool:
         """Return true if image data is interleaved."""
-        interleaved = self.metadata.images[image_index].pixels.interleaved
+        interleaved = self._metadata_store.getPixelsInterleaved(image_index)
         assert interleaved is not None
-        return interleaved
+        return bool(interleaved.booleanValue())
 
     @lru_cached_method()
     def pyramid_levels(self, image_index: int) -> dict[tuple[int, float, str], int]:
@@ -301,7 +504,7 @@ class BioformatsReader:
 
     @staticmethod
     def _get_resolution_scale(
-        reader: Memoizer, resolution_index: int, base_width: int
+        reader: JObject, resolution_index: int, base_width: int
     ) -> float:
         """Return resolution scale for resolution as rounded int of resolution width
         divided by base width."""
@@ -318,8 +521,13 @@ class BioformatsReader:
         output_size: Size | None = None,
         index: int = 0,
     ) -> Generator[np.ndarray, None, None]:
-        """Read image data from file. Preferably used as a context manager.
-        Data is returned as a memoryview that should be released after use.
+        """Read image data from file with one read. Preferably used as a context
+        manager.
+
+        The data is a view of the buffer read from file, only valid within the
+        context, with samples last. Non-interleaved data is de-interleaved by
+        the view, without copying, so callers should copy out the (parts of
+        the) data to keep.
 
         Parameters
         ----------
@@ -370,16 +578,16 @@ class BioformatsReader:
                     region.size.height,
                     region.size.width,
                 )
-                data = np.moveaxis(data, 0, 2).copy()
-            if output_size is not None and data.shape[0:2] != output_size.to_tuple():
+                data = np.moveaxis(data, 0, 2)
+            if output_size is not None and output_size != region.size:
                 # Pad with zeros to get requested output size.
                 if not output_size.all_greater_than_or_equal(region.size):
                     raise ValueError(
                         "Output size should be equal to or larger than region size."
                     )
-                padding_width = output_size.width - data.shape[0]
-                padding_height = output_size.height - data.shape[1]
-                data = np.pad(data, ((0, padding_width), (0, padding_height), (0, 0)))
+                padding_width = output_size.width - region.size.width
+                padding_height = output_size.height - region.size.height
+                data = np.pad(data, ((0, padding_height), (0, padding_width), (0, 0)))
             yield data
         finally:
             raw_data.release()
@@ -404,8 +612,24 @@ class BioformatsReader:
             reader.setResolution(resolution_index)
             return reader.openBytes(index, start_x, start_y, end_x, end_y)
 
+    @cached_property
+    def _metadata_store(self) -> JObject:
+        """The metadata store populated when the file was opened, to read
+        metadata fields from without serializing and parsing OME-XML."""
+        with self._reader_pool.get_reader() as reader:
+            return reader.getMetadataStore()
+
+    @staticmethod
+    def _get_micrometers(length: JObject | None) -> float | None:
+        """Return an OME length in micrometers, or None if not set or not
+        convertible to micrometers."""
+        if length is None:
+            return None
+        value = length.value(_get_micrometer_unit())
+        if value is None:
+            return None
+        return float(value.doubleValue())
+
     def _read_metadata(self) -> str:
         """Read metadata from file."""
-        with self._reader_pool.get_reader() as reader:
-            metadata_store = reader.getMetadataStore()
-            return str(metadata_store.dumpXML())
+        return str(self._metadata_store.dumpXML())
@@ -14,6 +14,9 @@
 
 """Source using bioformats."""
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from functools import cached_property
 from pathlib import Path
 from typing import Any
@@ -22,7 +25,9 @@ from pydicom import Dataset
 from upath import UPath
 from wsidicom.codec import Encoder
 from wsidicom.codec.settings import Channels
-from wsidicom.metadata import UidGenerator
+from wsidicom.geometry import SizeMm
+from wsidicom.instance import WsiInstance
+from wsidicom.metadata import ImageCoordinateSystem, ImageType, UidGenerator
 from wsidicom.metadata.wsi import WsiMetadata
 from wsidicom.paths import as_local_path
 
@@ -52,6 +57,8 @@ class BioformatsSource(DicomizerSource):
         cache_path: str | None = None,
         uid_generator: UidGenerator | None = None,
         file_options: dict[str, Any] | None = None,
+        force_transcoding: bool = False,
+        align_tile_size: bool = True,
     ) -> None:
         """Create a new BioformatsSource.
 
@@ -63,7 +70,8 @@ class BioformatsSource(DicomizerSource):
             Encoder to use. Pyramid is always re-encoded using the encoder.
             If None, the source picks a default matching its pixel format.
         tile_size: Optional[int] = None,
-            Tile size to use. If None, the default tile size is used.
+            Tile size to use. If None, the default tile size is used. See
+            `align_tile_size`.
         metadata: Optional[WsiMetadata] = None
             User-specified metadata that will overload metadata from source image file.
         default_metadata: Optional[WsiMetadata] = None
@@ -86,17 +94,27 @@ class BioformatsSource(DicomizerSource):
         file_options: dict[str, Any] | None = None
             Options forwarded to the fsspec filesystem when reading a fsspec
             path. Ignored by sources that only read local files.
+        force_transcoding: bool = False
+            If to re-encode compressed JPEG tiles that could be passed through.
+        align_tile_size: bool = True
+            If to use the multiple of the tile size the Bio-Formats reader reads
+            most efficiently (e.g. the stored tile size) closest to the tile size
+            for each image, so that tiles are read aligned to the stored tiles.
         """
-        if tile_size is None:
-            raise ValueError("Tile size required for bioformats")
+        self._force_transcoding = force_transcoding
+        self._align_tile_size = align_tile_size
         self._reader = BioformatsReader(
             self._require_local_filepath(filepath), readers, cache_path
         )
         (
-            self._pyramid_image_index,
+            image_indices,
             self._label_image_index,
             self._overview_image_index,
         ) = self._get_image_indices(self._reader)
+        self._pyramid_image_indices = self._get_placed_image_indices(
+            self._reader, image_indices
+        )
+        self._pyramid_image_index = self._pyramid_image_indices[0]
         super().__init__(
             filepath=filepath,
             encoder=encoder,
@@ -121,8 +139,34 @@ class BioformatsSource(DicomizerSource):
 
     @property
     def pyramid_levels(self) -> dict[tuple[int, float, str], int]:
+        """Levels of the largest image. See `level_instances` for how multiple
+        images are handled."""
         return self._reader.pyramid_levels(self._pyramid_image_index)
 
+    @cached_property
+    def level_instances(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self,
+    ) -> list[WsiInstance]:
+        """Return the level instances of each pyramid image. Images besides the
+        largest are placed at their position on the slide and are thus opened as
+        separate pyramids."""
+        return [
+            self._create_instance(
+                self._image_datas[image_index, resolution_index],
+                ImageType.VOLUME,
+                level,
+            )
+            for image_index in self._pyramid_image_indices
+            for (level, _, _), resolution_index in self._reader.pyramid_levels(
+                image_index
+            ).items()
+        ]
+
+    @property
+    def pyramid_image_indices(self) -> list[int]:
+        """Images opened as pyramids, starting with the largest image."""
+        return self._pyramid_image_indices
+
     @property
     def base_metadata(self) -> WsiDicomizerMetadata:
         return WsiDicomizerMetadata()
@@ -138,7 +182,9 @@ class BioformatsSource(DicomizerSource):
     @staticmethod
     def _get_image_indices(
         reader: BioformatsReader,
-    ) -> tuple[int, int | None, int | None]:
+    ) -> tuple[list[int], int | None, int | None]:
+        """Return the images that are not label or overview, starting with the
+        largest image, and the label and overview image."""
         image_indices = list(range(reader.images_count))
         overview_image_index = None
         label_image_index = None
@@ -154,40 +200,82 @@ class BioformatsSource(DicomizerSource):
                 label_image_index = image_index
                 image_indices.remove(image_index)
 
-        pyramid_image_index = 0
-        largest_image_width = None
-        for image_index in image_indices:
-            image_width = reader.size(image_index).width
-            if largest_image_width is None or largest_image_width < image_width:
-                pyramid_image_index = image_index
-                largest_image_width = image_width
-        return pyramid_image_index, label_image_index, overview_image_index
+        if len(image_indices) == 0:
+            return [0], label_image_index, overview_image_index
+        image_indices.sort(
+            key=lambda image_index: reader.size(image_index).width, reverse=True
+        )
+        return image_indices, label_image_index, overview_image_index
 
-    def _create_level_image_data(self, level_index: int) -> BaseDicomizerImageData:
-        return BioformatsImageData(
-            self._reader,
-            self._tile_size,
-            self._encoder,
-            self._pyramid_image_index,
-            self._reader.pyramid_levels(self._pyramid_image_index)[
-                level_index, 0.0, "0"
-            ],
-            self._volume_imaged_size,
+    @staticmethod
+    def _get_placed_image_indices(
+        reader: BioformatsReader, image_indices: list[int]
+    ) -> list[int]:
+        """Return the images to open as pyramids. If there are several images,
+        they are only opened if all have recorded positions on the slide, else
+        only the largest image is opened."""
+        if len(image_indices) <= 1:
+            return image_indices
+        if any(reader.position(image_index) is None for image_index in image_indices):
+            logging.warning(
+                "File holds several images (e.g. several scanned areas) without "
+                "recorded positions on the slide, only the largest image is "
+                "opened."
+            )
+            return image_indices[:1]
+        return image_indices
+
+    @cached_property
+    def _image_datas(self) -> dict[tuple[int, int], BioformatsImageData]:
+        """Image data of the levels of the pyramid images, the label, and the
+        overview, by image and resolution index.
+
+        Creating image data reads from the image, e.g. the size of the stored
+        tiles and if they can be passed through. The image data are therefore
+        created concurrently, with as many threads as the reader uses readers."""
+        arguments = [
+            (
+                image_index,
+                resolution_index,
+                self._get_imaged_size(image_index),
+                self._force_transcoding,
+                self._get_image_coordinate_system(image_index),
+            )
+            for image_index in self._pyramid_image_indices
+            for resolution_index in self._reader.pyramid_levels(image_index).values()
+        ]
+        arguments.extend(
+            (image_index, 0, None, False, None)
+            for image_index in (self._label_image_index, self._overview_image_index)
+            if image_index is not None
         )
+        encoder = self._encoder
+        with ThreadPoolExecutor(self._reader.max_readers) as executor:
+            futures = {
+                (argument[0], argument[1]): executor.submit(
+                    BioformatsImageData,
+                    self._reader,
+                    self._tile_size,
+                    encoder,
+                    *argument,
+                    align_tile_size=self._align_tile_size,
+                )
+                for argument in arguments
+            }
+        return {key: future.result() for key, future in futures.items()}
+
+    def _create_level_image_data(self, level_index: int) -> BaseDicomizerImageData:
+        return self._image_datas[self._pyramid_image_index, level_index]
 
     def _create_label_image_data(self) -> BaseDicomizerImageData | None:
         if self._label_image_index is None:
             return None
-        return BioformatsImageData(
-            self._reader, self._tile_size, self._encoder, self._label_image_index, 0
-        )
+        return self._image_datas[self._label_image_index, 0]
 
     def _create_overview_image_data(self) -> BaseDicomizerImageData | None:
         if self._overview_image_index is None:
             return None
-        return BioformatsImageData(
-            self._reader, self._tile_size, self._encoder, self._overview_image_index, 0
-        )
+        return self._image_datas[self._overview_image_index, 0]
 
     def _create_thumbnail_image_data(self) -> BaseDicomizerImageData | None:
         # TODO support reading thumbnails from bioformats
@@ -196,13 +284,34 @@ class BioformatsSource(DicomizerSource):
     def close(self) -> None:
         return self._reader.close()
 
-    @cached_property
-    def _volume_imaged_size(self):
-        """Return the imaged size of the volume."""
-        base_level_pizel_spacing = self._reader.pixel_spacing(
-            self._pyramid_image_index, 0
-        )
-        if base_level_pizel_spacing is None:
+    def _get_imaged_size(self, image_index: int) -> SizeMm | None:
+        """Return the imaged size of image."""
+        base_level_pixel_spacing = self._reader.pixel_spacing(image_index, 0)
+        if base_level_pixel_spacing is None:
             return None
-        base_level_size = self._reader.size(self._pyramid_image_index, 0)
-        return base_level_pizel_spacing * base_level_size
+        base_level_size = self._reader.size(image_index, 0)
+        return base_level_pixel_spacing * base_level_size
+
+    def _get_image_coordinate_system(
+        self, image_index: int
+    ) -> ImageCoordinateSystem | None:
+        """Return image coordinate system with origin moved to the position of the
+        image, so that each pyramid image is placed where it is on the slide, or
+        None if only one image is opened. The positions of the images are offsets
+        along the image axes."""
+        if len(self._pyramid_image_indices) <= 1:
+            return None
+        first_position = self._reader.position(self._pyramid_image_index)
+        position = self._reader.position(image_index)
+        if first_position is None or position is None:
+            raise ValueError("Images without recorded positions can not be placed.")
+        image_coordinate_system = self.metadata.pyramid.image.image_coordinate_system
+        if image_coordinate_system is None:
+            # Place the image the positions are offsets in without rotation.
+            image_coordinate_system = ImageCoordinateSystem(
+                origin=first_position, rotation=0
+            )
+        return replace(
+            image_coordinate_system,
+            origin=image_coordinate_system.image_to_slide(position - first_position),
+        )
@@ -0,0 +1,80 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Eviction of Bio-Formats reader caches kept in a persistent directory."""
+
+import logging
+import os
+import time
+from contextlib import suppress
+from pathlib import Path
+
+MEMO_FILE_SUFFIX = ".bfmemo"
+
+
+def evict_memo_files(
+    cache_path: Path, max_size: int | None, max_age: float | None
+) -> None:
+    """Remove cached readers (memo files) from a cache directory.
+
+    Memo files not used within max age are removed, after which the least
+    recently used memo files are removed until the total size is within max
+    size. A memo file is marked as used by touching it, see `touch_memo_file`.
+    Memo files that can not be removed, e.g. as removed by another process, are
+    skipped.
+
+    Parameters
+    ----------
+    cache_path: Path
+        Cache directory to remove memo files from.
+    max_size: int | None
+        Largest total size in bytes of memo files to keep. If None, memo files
+        are not removed by size.
+    max_age: float | None
+        Largest time in seconds since the memo files to keep were used. If None,
+        memo files are not removed by age.
+    """
+    memo_files: list[tuple[float, int, Path]] = []
+    for memo_file in cache_path.rglob(f"*{MEMO_FILE_SUFFIX}"):
+        try:
+            stat = memo_file.stat()
+        except OSError:
+            continue
+        memo_files.append((stat.st_mtime, stat.st_size, memo_file))
+    memo_files.sort()
+    total_size = sum(size for _, size, _ in memo_files)
+    now = time.time()
+    for modified, size, memo_file in memo_files:
+        expired = max_age is not None and now - modified > max_age
+        oversized = max_size is not None and total_size > max_size
+        if not expired and not oversized:
+            break
+        try:
+            memo_file.unlink()
+        except OSError as exception:
+            logging.debug(f"Failed to remove memo file {memo_file}: {exception}")
+            continue
+        total_size -= size
+
+
+def touch_memo_file(memo_file: Path) -> None:
+    """Mark a memo file as used, if it exists.
+
+    Parameters
+    ----------
+    memo_file: Path
+        Memo file to mark.
+    """
+    with suppress(OSError):
+        os.utime(memo_file)
@@ -14,6 +14,8 @@
 
 """Image data for pyisintax compatible file."""
 
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from functools import cached_property
 
 import numpy as np
@@ -26,7 +28,13 @@ from wsidicom.metadata import Image as ImageMetadata
 from wsidicom.metadata import ImageCoordinateSystem, ImageType
 
 from isyntax import ISyntax
+from wsidicomizer.config import get_settings
+from wsidicomizer.extras.isyntax.isyntax_pool import ISyntaxPool
 from wsidicomizer.image_data import PixelImageData
+from wsidicomizer.sources.openslide_like.tile_blocks import (
+    get_block_width,
+    plan_tile_blocks,
+)
 
 
 class ISyntaxLevelImageData(PixelImageData):
@@ -37,19 +45,40 @@ class ISyntaxLevelImageData(PixelImageData):
         tile_size: int | None,
         encoder: Encoder,
         level: int,
+        pool: ISyntaxPool | None = None,
     ):
+        """Wraps a level of an ISyntax file to ImageData.
+
+        Parameters
+        ----------
+        isyntax: ISyntax
+            ISyntax object to read level properties from.
+        image_metadata: ImageMetadata
+            Metadata of the base level.
+        tile_size: int | None
+            Output tile size. If None, the tile size of the file is used.
+        encoder: Encoder
+            Encoder to use.
+        level: int
+            Index of the level in the file.
+        pool: ISyntaxPool | None = None
+            Pool of handles to read pixels with, so that tiles can be read from
+            several threads. If None, pixels are read with the ISyntax object
+            and the image data is not thread safe.
+        """
         super().__init__(encoder)
         self._slide = isyntax
+        self._pool = pool
         self._slide_level = isyntax.wsi.get_level(level)
-        pixel_spacing = SizeMm(self._slide_level.mpp_x, self._slide_level.mpp_y) / 1000
-        if (
-            image_metadata.pixel_spacing is not None
-            and image_metadata.pixel_spacing != pixel_spacing
-        ):
-            # Override pixel spacing
-            self._pixel_spacing = image_metadata.pixel_spacing
+        if image_metadata.pixel_spacing is not None:
+            # Override pixel spacing, given for the base level.
+            self._pixel_spacing = image_metadata.pixel_spacing * (
+                1 << self._slide_level.scale
+            )
         else:
-            self._pixel_spacing = pixel_spacing
+            self._pixel_spacing = (
+                SizeMm(self._slide_level.mpp_x, self._slide_level.mpp_y) / 1000
+            )
         self._file_tile_size = Size(self._slide.tile_width, self._slide.tile_height)
         if tile_size is None:
             self._tile_size = self._file_tile_size
@@ -57,6 +86,13 @@ class ISyntaxLevelImageData(PixelImageData):
             self._tile_size = Size(tile_size, tile_size)
         self._level = level
         self._image_coordinate_system = image_metadata.image_coordinate_system
+        # Blocks of output tiles span whole parent codeblocks, each covering two
+        # by two native tiles, so that tiles sharing parents are decoded together.
+        self._block_width = get_block_width(
+            self._tile_size.width,
+            self._file_tile_size.width * 2,
+            get_settings().region_read_max_width,
+        )
 
     @property
     def image_size(self) -> Size:
@@ -80,7 +116,7 @@ class ISyntaxLevelImageData(PixelImageData):
 
     @property
     def downsample(self) -> float:
-        return self._slide_level.scale
+        return float(1 << self._slide_level.scale)
 
     @property
     def transfer_syntax(self) -> UID:
@@ -115,7 +151,12 @@ class ISyntaxLevelImageData(PixelImageData):
 
     @property
     def thread_safe(self) -> bool:
-        return False
+        return self._pool is not None
+
+    @property
+    def suggested_minimum_chunk_size(self) -> int:
+        """A chunk should span a block of tiles read in one region read."""
+        return self._block_width
 
     def read_region(self, region: Region, z: float, path: str) -> np.ndarray:
         """Read the pixels of a region directly from the ISyntax object.
@@ -144,6 +185,46 @@ class ISyntaxLevelImageData(PixelImageData):
             return self._get_blank_decoded_frame(region.size)
         return image_data
 
+    def read_region_at_scale(
+        self, region: Region, z: float, path: str, scale: float
+    ) -> np.ndarray:
+        """Read the pixels of a region from the native level closest to, but not
+        coarser than, the scale.
+
+        Parameters
+        ----------
+        region: Region
+            Pixel region to read.
+        z: float
+            Z coordinate.
+        path: str
+            Optical path.
+        scale: float
+            Largest scale to downscale the region by.
+
+        Returns
+        -------
+        np.ndarray
+            The region, downscaled by the scale of the selected level.
+        """
+        level_downsamples = self._slide.level_downsamples
+        level = self._select_level_for_scale(level_downsamples, self._level, scale)
+        if level == self._level:
+            return self.read_region(region, z, path)
+        if z not in self.focal_planes:
+            raise WsiDicomNotFoundError(f"focal plane {z}", str(self))
+        if path not in self.optical_paths:
+            raise WsiDicomNotFoundError(f"optical path {path}", str(self))
+        # Downsamples of iSyntax levels are powers of two.
+        level_scale = level_downsamples[level] // level_downsamples[self._level]
+        start = region.start // level_scale
+        end = (region.end - 1) // level_scale + 1
+        level_region = Region(start, Size(end.x - start.x, end.y - start.y))
+        region_data = self._read_level_region(level_region, level)
+        if self._detect_blank_tile(region_data):
+            return self._get_blank_decoded_frame(level_region.size)
+        return region_data
+
     def _get_region(self, region: Region) -> np.ndarray | None:
         """Return Image read from region in ISyntax image. If image data for
         region is blank, None is returned.
@@ -161,38 +242,145 @@ class ISyntaxLevelImageData(PixelImageData):
         if region.size.width < 0 or region.size.height < 0:
             raise ValueError("Negative size not allowed")
 
-        region_data = self._slide.read_region(
-            region.start.x,
-            region.start.y,
-            region.size.width,
-            region.size.height,
-            self._level,
-        )[:, :, :3]
+        region_data = self._read_level_region(region, self._level)
         if self._detect_blank_tile(region_data):
             return None
         return region_data
 
+    def _read_level_region(self, region: Region, level: int) -> np.ndarray:
+        """Return the RGB pixels of a region of a native level."""
+        with self._acquire_slide() as slide:
+            return slide.read_region(
+                region.start.x,
+                region.start.y,
+                region.size.width,
+                region.size.height,
+                level,
+            )[:, :, :3]
+
+    @contextmanager
+    def _acquire_slide(self) -> Iterator[ISyntax]:
+        """Return the ISyntax object to read pixels with, from the pool if
+        set."""
+        if self._pool is None:
+            yield self._slide
+            return
+        with self._pool.acquire() as slide:
+            yield slide
+
     def _get_tile(self, tile_point: Point, z: float, path: str) -> np.ndarray | None:
         if z not in self.focal_planes:
             raise WsiDicomNotFoundError(f"focal plane {z}", str(self))
         if path not in self.optical_paths:
             raise WsiDicomNotFoundError(f"optical path {path}", str(self))
         if self._tile_size == self.file_tile_size:
-            tile = self._slide.read_tile(tile_point.x, tile_point.y, self._level)[
-                :, :, :3
-            ]
+            with self._acquire_slide() as slide:
+                tile = slide.read_tile(tile_point.x, tile_point.y, self._level)[
+                    :, :, :3
+                ]
         else:
-            tile = self._slide.read_region(
-                tile_point.x * self._tile_size.width,
-                tile_point.y * self._tile_size.height,
-                self._tile_size.width,
-                self._tile_size.height,
-                self._level,
-            )[:, :, :3]
+            tile = self._read_level_region(
+                Region(tile_point * self._tile_size, self._tile_size), self._level
+            )
         if self._detect_blank_tile(tile):
             return None
         return tile
 
+    def get_decoded_tiles(
+        self,
+        tiles: Iterable[Point],
+        z: float,
+        path: str,
+        cache: bool = True,
+    ) -> Iterator[np.ndarray]:
+        """Return the pixels of multiple tiles, read in blocks of adjacent tiles
+        aligned to the native tiles.
+
+        Parameters
+        ----------
+        tiles: Iterable[Point]
+            Tiles to get.
+        z: float
+            Focal plane of tiles to get.
+        path: str
+            Optical path of tiles to get.
+
+        Returns
+        ----------
+        Iterator[np.ndarray]
+            Tile pixels.
+        """
+        for tile in self._get_tiles(tiles, z, path):
+            if tile is None:
+                yield self._get_blank_decoded_frame(self.tile_size)
+            else:
+                yield tile
+
+    def get_encoded_tiles(
+        self, tiles: Iterable[Point], z: float, path: str
+    ) -> Iterator[bytes]:
+        """Return bytes of multiple tiles, read in blocks of adjacent tiles
+        aligned to the native tiles.
+
+        Parameters
+        ----------
+        tiles: Iterable[Point]
+            Tiles to get.
+        z: float
+            Focal plane of tiles to get.
+        path: str
+            Optical path of tiles to get.
+
+        Returns
+        ----------
+        Iterator[bytes]
+            Tile bytes.
+        """
+        for tile in self._get_tiles(tiles, z, path):
+            if tile is None:
+                yield self._get_blank_encoded_frame(self.tile_size)
+            else:
+                yield self.encoder.encode(tile)
+
+    def _get_tiles(
+        self, tiles: Iterable[Point], z: float, path: str
+    ) -> list[np.ndarray | None]:
+        """Return the pixels of tiles, or None for blank tiles.
+
+        Adjacent tiles are read in blocks spanning whole parent codeblocks, each
+        block with one region read extended to the native tile grid, so that no
+        native tile is decoded for more than one block and tiles sharing parent
+        codeblocks are decoded together."""
+        if z not in self.focal_planes:
+            raise WsiDicomNotFoundError(f"focal plane {z}", str(self))
+        if path not in self.optical_paths:
+            raise WsiDicomNotFoundError(f"optical path {path}", str(self))
+        tiles = list(tiles)
+        read: dict[Point, np.ndarray | None] = {}
+        for block in plan_tile_blocks(tiles, self._block_width):
+            start = block.start * self._tile_size
+            end = (block.end * self._tile_size - 1) // self._file_tile_size + 1
+            native_start = start // self._file_tile_size * self._file_tile_size
+            native_end = end * self._file_tile_size
+            region_data = self._read_level_region(
+                Region(
+                    native_start,
+                    Size(native_end.x - native_start.x, native_end.y - native_start.y),
+                ),
+                self._level,
+            )
+            for tile in block.iterate_all():
+                offset = tile * self._tile_size - native_start
+                pixels = region_data[
+                    offset.y : offset.y + self._tile_size.height,
+                    offset.x : offset.x + self._tile_size.width,
+                ]
+                if self._detect_blank_tile(pixels):
+                    read[tile] = None
+                else:
+                    read[tile] = np.ascontiguousarray(pixels)
+        return [read[tile] for tile in tiles]
+
     def get_encoded_tile(self, tile: Point, z: float, path: str) -> bytes:
         """Return image bytes for tile.
 
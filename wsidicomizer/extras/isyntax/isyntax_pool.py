@@ -0,0 +1,41 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Pool of ISyntax handles for reading a file from several threads."""
+
+from pathlib import Path
+
+from isyntax import ISyntax
+from wsidicomizer.handle_pool import HandlePool
+
+
+class ISyntaxPool(HandlePool[ISyntax]):
+    """Pool of independently opened ISyntax handles for a file, so that tiles
+    can be read from several threads. ISyntax handles are not thread safe. Each
+    handle has its own cache."""
+
+    def __init__(self, filepath: Path, cache: int):
+        """
+        Parameters
+        ----------
+        filepath: Path
+            Path to the file.
+        cache: int
+            Cache size of each handle.
+        """
+        super().__init__(filepath)
+        self._cache = cache
+
+    def _open(self) -> ISyntax:
+        return ISyntax.open(self._filepath, self._cache)
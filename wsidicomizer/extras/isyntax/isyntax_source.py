@@ -25,12 +25,14 @@ from wsidicom.metadata import ImageType, UidGenerator, WsiMetadata
 from wsidicom.paths import as_local_path
 
 from isyntax import ISyntax
+from wsidicomizer.config import get_settings
 from wsidicomizer.dicomizer_source import DicomizerSource
 from wsidicomizer.extras.isyntax.isyntax_image_data import (
     ISyntaxAssociatedImageImageData,
     ISyntaxLevelImageData,
 )
 from wsidicomizer.extras.isyntax.isyntax_metadata import ISyntaxMetadata
+from wsidicomizer.extras.isyntax.isyntax_pool import ISyntaxPool
 from wsidicomizer.image_data import BaseDicomizerImageData
 from wsidicomizer.metadata import (
     MetadataPostProcessor,
@@ -54,7 +56,7 @@ class ISyntaxSource(DicomizerSource):
         metadata_post_processor: Dataset | MetadataPostProcessor | None = None,
         metadata_pre_processor: MetadataPreProcessor | None = None,
         force_transcoding: bool = False,
-        cache: int = 2048,
+        cache: int | None = None,
         uid_generator: UidGenerator | None = None,
         file_options: dict[str, Any] | None = None,
     ) -> None:
@@ -83,8 +85,10 @@ class ISyntaxSource(DicomizerSource):
             into it.
         force_transcoding: bool = False
             If to force transcoding of label and overview images.
-        cache: int = 2048
-            Cache size to use for ISyntax.
+        cache: int | None = None
+            Cache size in tiles to use for ISyntax, for each handle tiles are read
+            with. A handle is opened for each thread reading tiles concurrently.
+            If None, the cache is sized from `Settings.isyntax_cache_memory`.
         uid_generator: UidGenerator | None = None
             Generator used by the source to fill metadata UIDs. `None` uses the
             default `CallableUidGenerator` backed by `pydicom.generate_uid`.
@@ -92,7 +96,11 @@ class ISyntaxSource(DicomizerSource):
             Options forwarded to the fsspec filesystem when reading a fsspec
             path. Ignored by sources that only read local files.
         """
-        self._slide = ISyntax.open(self._require_local_filepath(filepath), cache)
+        local_filepath = self._require_local_filepath(filepath)
+        self._slide = ISyntax.open(local_filepath)
+        if cache is None:
+            cache = self._get_cache_size(self._slide)
+        self._pool = ISyntaxPool(local_filepath, cache)
         self._force_transcoding = force_transcoding
         self._base_metadata = ISyntaxMetadata(self._slide)
         super().__init__(
@@ -126,7 +134,12 @@ class ISyntaxSource(DicomizerSource):
 
     @property
     def pyramid_levels(self) -> dict[tuple[int, float, str], int]:
-        return {(0, 0.0, "0"): 0}
+        """The native levels of the file, each downsampled by a power of two given
+        by the scale of the level."""
+        return {
+            (level.scale, 0.0, "0"): index
+            for index, level in enumerate(self._slide.wsi.levels)
+        }
 
     def _create_level_image_data(self, level_index: int) -> BaseDicomizerImageData:
         return ISyntaxLevelImageData(
@@ -135,6 +148,7 @@ class ISyntaxSource(DicomizerSource):
             self._tile_size,
             self._encoder,
             level_index,
+            self._pool,
         )
 
     def _create_label_image_data(self) -> BaseDicomizerImageData | None:
@@ -165,8 +179,20 @@ class ISyntaxSource(DicomizerSource):
         return None
 
     def close(self) -> None:
+        self._pool.close()
         return self._slide.close()
 
+    @staticmethod
+    def _get_cache_size(isyntax: ISyntax) -> int:
+        """Return the number of tiles to cache for each handle to stay within
+        `Settings.isyntax_cache_memory`.
+
+        A cached tile holds the wavelet coefficients of a codeblock for each of
+        the three color channels, estimated as four 16-bit subbands at half the
+        tile resolution, six bytes per tile pixel."""
+        tile_bytes = isyntax.tile_width * isyntax.tile_height * 6
+        return max(get_settings().isyntax_cache_memory // tile_bytes, 1)
+
     @property
     def _pixel_format(self) -> tuple[Channels, int]:
         # iSyntax is 8-bit RGB.
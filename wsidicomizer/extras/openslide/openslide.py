@@ -67,6 +67,8 @@ from openslide import (  # noqa: E402
     PROPERTY_NAME_OBJECTIVE_POWER,
     PROPERTY_NAME_VENDOR,
     OpenSlide,
+    OpenSlideCache,
+    OpenSlideVersionError,
 )
 from openslide._convert import argb2rgba as convert_argb_to_rgba  # noqa: E402
 from openslide.lowlevel import _read_region, get_associated_image_names  # noqa: E402
@@ -83,6 +85,8 @@ __all__ = [
     "PROPERTY_NAME_MPP_Y",
     "PROPERTY_NAME_OBJECTIVE_POWER",
     "PROPERTY_NAME_VENDOR",
+    "OpenSlideCache",
+    "OpenSlideVersionError",
     "_read_region",
     "convert_argb_to_rgba",
     "get_associated_image_names",
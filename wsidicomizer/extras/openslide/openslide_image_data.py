@@ -15,7 +15,12 @@
 """Image data for openslide compatible file."""
 
 import ctypes
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from enum import Enum
+from typing import Any
 
 import numpy as np
 from wsidicom.codec import Encoder
@@ -28,6 +33,7 @@ from wsidicomizer.extras.openslide.openslide import (
     _read_region,
     convert_argb_to_rgba,
 )
+from wsidicomizer.extras.openslide.openslide_pool import OpenSlidePool
 from wsidicomizer.sources.openslide_like import OpenSlideLikeLevelImageData
 
 """
@@ -39,6 +45,15 @@ to the Openslide C API and are thus not likely to change that often.
 """
 
 
+# Openslide reads pixels as 32-bit ARGB in native byte order.
+if sys.byteorder == "little":
+    _RGB_BYTES = [2, 1, 0]
+    _ALPHA_BYTE = 3
+else:
+    _RGB_BYTES = [1, 2, 3]
+    _ALPHA_BYTE = 0
+
+
 class OpenSlideAssociatedImageType(Enum):
     LABEL = "label"
     MACRO = "macro"
@@ -56,6 +71,7 @@ class OpenSlideLevelImageData(OpenSlideLikeLevelImageData):
         level_index: int,
         tile_size: int | None,
         encoder: Encoder,
+        slide_pool: OpenSlidePool | None = None,
     ):
         """Wraps a OpenSlide level to ImageData.
 
@@ -71,6 +87,10 @@ class OpenSlideLevelImageData(OpenSlideLikeLevelImageData):
             Output tile size.
         encoded: Encoder
             Encoder to use.
+        slide_pool: OpenSlidePool | None = None
+            Pool of handles to read regions with, so that threads read with
+            handles of their own. If None, regions are read with the handle of
+            the OpenSlide object.
         """
         super().__init__(
             blank_color,
@@ -82,8 +102,11 @@ class OpenSlideLevelImageData(OpenSlideLikeLevelImageData):
             level_index,
             tile_size,
             encoder,
+            self._get_native_tile_size(open_slide.properties, "openslide", level_index),
         )
         self._osr = open_slide._osr
+        self._slide_pool = slide_pool
+        self._read_buffers = threading.local()
 
     def read_region(self, region: Region, z: float, path: str) -> np.ndarray:
         """Read the pixels of a region directly from the openslide object.
@@ -115,47 +138,92 @@ class OpenSlideLevelImageData(OpenSlideLikeLevelImageData):
             return self._get_blank_decoded_frame(region.size)
         return region_data
 
-    def _get_region(self, region: Region) -> np.ndarray | None:
-        """Return the region as an RGB numpy array, with openslide's ARGB alpha
-        composited over the background colour. None if the region is blank.
+    def _read_level_region_data(
+        self, location: Point, level_index: int, size: Size
+    ) -> np.ndarray:
+        """Return a region of a native level as read by openslide, as
+        premultiplied ARGB pixels viewed as bytes in native byte order. The region
+        data is read into a buffer reused by the next read in the same thread.
 
         Parameters
         ----------
-        region: Region
-            Region to get image for.
+        location: Point
+            Position of the region in the base level.
+        level_index: int
+            Index of the native level to read from.
+        size: Size
+            Size of the region in the native level.
 
         Returns
         ----------
-        np.ndarray | None
-            Region as an RGB array, or None if blank.
+        np.ndarray
+            Region as ``(rows, columns, 4)`` bytes of native ARGB pixels.
         """
-        if region.size.width < 0 or region.size.height < 0:
-            raise ValueError("Negative size not allowed")
         CHANNELS = 4
 
-        location_in_base_level = region.start * self._downsample + self._offset
+        region_data = self._get_read_buffer(size.area * CHANNELS)
+        with self._acquire_osr() as osr:
+            _read_region(
+                osr,
+                region_data.ctypes.data_as(ctypes.POINTER(ctypes.c_uint32)),
+                location.x,
+                location.y,
+                level_index,
+                size.width,
+                size.height,
+            )
+        return np.reshape(region_data, (size.height, size.width, CHANNELS), copy=False)
 
-        region_data = np.empty(
-            region.size.to_tuple() + (CHANNELS,), dtype=ctypes.c_uint8
-        )
+    def _get_tile_pixels(self, region_data: np.ndarray) -> np.ndarray | None:
+        """Return the native ARGB region data as RGB, with the alpha composited
+        over the background colour. None if the region data is blank.
 
-        _read_region(
-            self._osr,
-            region_data.ctypes.data_as(ctypes.POINTER(ctypes.c_uint32)),
-            location_in_base_level.x,
-            location_in_base_level.y,
-            self._level_index,
-            region.size.width,
-            region.size.height,
-        )
-        region_data = np.reshape(
-            region_data, (region.size.height, region.size.width, CHANNELS), copy=False
-        )
-        if self._detect_blank_tile(region_data):
+        Opaque region data, the common case, is copied once to RGB without
+        conversion. Only region data with transparency is converted to RGBA and
+        composited.
+
+        Parameters
+        ----------
+        region_data: np.ndarray
+            Native ARGB region data, possibly a view of a reused buffer.
+
+        Returns
+        ----------
+        np.ndarray | None
+            Region as an RGB array, or None if blank.
+        """
+        alpha = region_data[..., _ALPHA_BYTE]
+        if alpha.min() == 255:
+            rgb = np.ascontiguousarray(region_data[..., _RGB_BYTES])
+            if super()._detect_blank_tile(rgb):
+                return None
+            return rgb
+        if alpha.max() == 0:
             return None
+        rgba = np.ascontiguousarray(region_data)
+        convert_argb_to_rgba(rgba.view(ctypes.c_uint32))  # type: ignore
+        if self._detect_blank_tile(rgba):
+            return None
+        return self._composite_over_background(rgba)
+
+    @contextmanager
+    def _acquire_osr(self) -> Iterator[Any]:
+        """Return the low level openslide handle to read with, from the pool if
+        set."""
+        if self._slide_pool is None:
+            yield self._osr
+            return
+        with self._slide_pool.acquire() as slide:
+            yield slide._osr
 
-        convert_argb_to_rgba(region_data.view(ctypes.c_uint32))  # type: ignore
-        return self._composite_over_background(region_data)
+    def _get_read_buffer(self, size: int) -> np.ndarray:
+        """Return a buffer of size bytes, reused between reads in the same
+        thread."""
+        buffer: np.ndarray | None = getattr(self._read_buffers, "buffer", None)
+        if buffer is None or buffer.size < size:
+            buffer = np.empty(size, dtype=ctypes.c_uint8)
+            self._read_buffers.buffer = buffer
+        return buffer[:size]
 
     def get_encoded_tile(self, tile: Point, z: float, path: str) -> bytes:
         """Return image bytes for tile. Transparency is removed and tile is
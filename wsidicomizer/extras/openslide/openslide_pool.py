@@ -0,0 +1,56 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Pool of openslide handles for reading a slide from several threads."""
+
+import logging
+from pathlib import Path
+
+from wsidicomizer.extras.openslide.openslide import (
+    OpenSlide,
+    OpenSlideCache,
+    OpenSlideVersionError,
+)
+from wsidicomizer.handle_pool import HandlePool
+
+
+class OpenSlidePool(HandlePool[OpenSlide]):
+    """Pool of openslide handles for a slide, so that worker threads read with
+    handles of their own instead of contending for the locks of a shared handle.
+    Each handle has its own tile cache, optionally of a set size."""
+
+    def __init__(self, filepath: Path, cache_size: int | None = None):
+        """
+        Parameters
+        ----------
+        filepath: Path
+            Path to the slide.
+        cache_size: int | None = None
+            Size in bytes of the tile cache of each handle. If None, the default
+            cache of openslide is used.
+        """
+        super().__init__(filepath)
+        self._cache_size = cache_size
+
+    def _open(self) -> OpenSlide:
+        slide = OpenSlide(self._filepath)
+        if self._cache_size is not None:
+            try:
+                slide.set_cache(OpenSlideCache(self._cache_size))
+            except OpenSlideVersionError:
+                logging.warning(
+                    "Openslide version does not support setting the cache size, "
+                    "using the default cache."
+                )
+        return slide
@@ -25,6 +25,7 @@ from wsidicom.metadata import UidGenerator
 from wsidicom.metadata.wsi import WsiMetadata
 from wsidicom.paths import as_local_path
 
+from wsidicomizer.config import get_settings
 from wsidicomizer.extras.openslide.openslide import (
     PROPERTY_NAME_BACKGROUND_COLOR,
     PROPERTY_NAME_BARCODE,
@@ -41,6 +42,7 @@ from wsidicomizer.extras.openslide.openslide import (
 from wsidicomizer.extras.openslide.openslide_image_data import (
     OpenSlideLevelImageData,
 )
+from wsidicomizer.extras.openslide.openslide_pool import OpenSlidePool
 from wsidicomizer.image_data import BaseDicomizerImageData
 from wsidicomizer.metadata import MetadataPostProcessor, MetadataPreProcessor
 from wsidicomizer.sources.openslide_like import (
@@ -97,7 +99,11 @@ class OpenSlideSource(OpenSlideLikeSource):
             Options forwarded to the fsspec filesystem when reading a fsspec
             path. Ignored by sources that only read local files.
         """
-        self._slide = OpenSlide(self._require_local_filepath(filepath))
+        local_filepath = self._require_local_filepath(filepath)
+        self._slide = OpenSlide(local_filepath)
+        self._slide_pool = OpenSlidePool(
+            local_filepath, get_settings().openslide_cache_size
+        )
         properties = OpenSlideLikeProperties(
             background_color=self._slide.properties.get(PROPERTY_NAME_BACKGROUND_COLOR),
             bounds_x=self._slide.properties.get(PROPERTY_NAME_BOUNDS_X),
@@ -129,6 +135,7 @@ class OpenSlideSource(OpenSlideLikeSource):
         )
 
     def close(self) -> None:
+        self._slide_pool.close()
         return self._slide.close()
 
     @property
@@ -155,4 +162,5 @@ class OpenSlideSource(OpenSlideLikeSource):
             level_index,
             self._tile_size,
             self._encoder,
+            self._slide_pool,
         )
@@ -0,0 +1,92 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Pool of file handles for reading a file from several threads."""
+
+import threading
+from abc import abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Protocol
+
+
+class Closeable(Protocol):
+    def close(self) -> None: ...
+
+
+class HandlePool[HandleType: Closeable]:
+    """Pool of handles for a file, so that worker threads read with handles of
+    their own instead of contending for a shared handle, for readers that are
+    not thread safe or serialize reads on a handle.
+
+    A handle is opened when a read finds no idle handle, so the pool grows to the
+    number of threads reading concurrently."""
+
+    def __init__(self, filepath: Path):
+        """
+        Parameters
+        ----------
+        filepath: Path
+            Path to the file.
+        """
+        self._filepath = filepath
+        self._lock = threading.Lock()
+        self._idle: list[HandleType] = []
+        self._size = 0
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        """Number of opened handles."""
+        return self._size
+
+    @contextmanager
+    def acquire(self) -> Iterator[HandleType]:
+        """Return a handle for exclusive use within the context, opening a new
+        handle if no handle is idle."""
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Pool for {self._filepath} is closed.")
+            handle = self._idle.pop() if self._idle else None
+            if handle is None:
+                self._size += 1
+        if handle is None:
+            try:
+                handle = self._open()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                raise
+        try:
+            yield handle
+        finally:
+            with self._lock:
+                if self._closed:
+                    handle.close()
+                else:
+                    self._idle.append(handle)
+
+    def close(self) -> None:
+        """Close the idle handles, and handles in use when they are released."""
+        with self._lock:
+            self._closed = True
+            for handle in self._idle:
+                handle.close()
+            self._idle.clear()
+
+    @abstractmethod
+    def _open(self) -> HandleType:
+        """Return a new handle for the file."""
+        raise NotImplementedError()
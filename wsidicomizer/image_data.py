@@ -15,8 +15,10 @@
 """Base ImageData classes for non-DICOM source adapters."""
 
 from abc import abstractmethod
+from collections.abc import Sequence
 
 import numpy as np
+from opentile.jpeg import JpegInfo
 from wsidicom import ImageData
 from wsidicom.codec import Encoder
 from wsidicom.geometry import Region, Size
@@ -71,6 +73,19 @@ class BaseDicomizerImageData(ImageData):
         """
         return self.encoder.encode(image_data)
 
+    @staticmethod
+    def _get_jpeg_photometric_interpretation(info: JpegInfo) -> str:
+        """Return the photometric interpretation of a JPEG frame, for comparing
+        with the photometric interpretation of the encoder before passing the
+        frame through."""
+        if info.components == 1:
+            return "MONOCHROME2"
+        if info.rgb_signalled:
+            return "RGB"
+        if info.subsampling == (1, 1):
+            return "YBR_FULL"
+        return "YBR_FULL_422"
+
     def _get_blank_encoded_frame(self, size: Size) -> bytes:
         """Return cached blank encoded frame for size, or create frame if
         cached frame not available or of wrong size.
@@ -140,11 +155,13 @@ class BaseDicomizerImageData(ImageData):
 
 
 class PixelImageData(BaseDicomizerImageData):
-    """ImageData whose source can only produce decoded pixel data.
+    """ImageData whose source is read as decoded pixel data.
 
-    The underlying source returns decoded pixels — there are no
-    source-encoded bytes to pass through, so producing an encoded tile
-    requires re-encoding.
+    Encoded tiles are produced by re-encoding the decoded pixels, except where a
+    subclass can pass source-encoded tiles matching the output tiles and the
+    encoder through unchanged (e.g. aligned baseline JPEG subblocks of czi
+    files, or JPEG tiles of generic tiff files). Such subclasses return None
+    from ``transcoder`` when tiles are passed through.
 
     Concrete subclasses implement ``read_region`` either as a native call
     (for pyramidal/tiled sources) or as an in-memory crop of a pre-decoded
@@ -175,3 +192,62 @@ class PixelImageData(BaseDicomizerImageData):
             The region as ``(rows, columns)`` or ``(rows, columns, samples)``.
         """
         raise NotImplementedError()
+
+    def read_region_at_scale(
+        self, region: Region, z: float, path: str, scale: float
+    ) -> np.ndarray:
+        """Read the pixels of a region from the source, downscaled by at most
+        scale.
+
+        Sources with natively downscaled levels read the region from the level
+        closest to, but not coarser than, the scale, so that the pixels only need
+        a small resample to the requested size. By default the region is read at
+        full resolution.
+
+        Parameters
+        ----------
+        region: Region
+            Pixel region to read.
+        z: float
+            Z coordinate.
+        path: str
+            Optical path.
+        scale: float
+            Largest scale to downscale the region by.
+
+        Returns
+        -------
+        np.ndarray
+            The region, downscaled by at most scale, as ``(rows, columns)`` or
+            ``(rows, columns, samples)``.
+        """
+        return self.read_region(region, z, path)
+
+    @staticmethod
+    def _select_level_for_scale(
+        level_downsamples: Sequence[float], level_index: int, scale: float
+    ) -> int:
+        """Return the index of the level with the largest downsample not coarser
+        than the downsample of the level at level index times scale.
+
+        Parameters
+        ----------
+        level_downsamples: Sequence[float]
+            Downsamples of the native levels, relative to the base level.
+        level_index: int
+            Index of the level the scale is relative to.
+        scale: float
+            Scale relative to the level.
+
+        Returns
+        ----------
+        int
+            Index of the level to read from.
+        """
+        # Downsamples of native levels are often not exact.
+        target = level_downsamples[level_index] * scale * 1.01
+        selected = level_index
+        for index, downsample in enumerate(level_downsamples):
+            if level_downsamples[selected] < downsample <= target:
+                selected = index
+        return selected
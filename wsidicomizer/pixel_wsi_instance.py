@@ -31,8 +31,10 @@ class PixelWsiInstance(WsiInstance):
     Overrides `get_region` so reads go through the image data's ``read_region``
     method directly, instead of wsidicom's per-tile decode-and-stitch path.
     For pyramid levels this dispatches to a native region call (openslide /
-    tiffslide / isyntax); for single-image associated images it crops the
-    already-decoded image in memory.
+    tiffslide / isyntax / czi); for single-image associated images it crops the
+    already-decoded image in memory. Downscaled reads go through the image
+    data's ``read_region_at_scale`` method, reading from the closest native
+    level where the source has one.
     """
 
     _image_data: PixelImageData
@@ -54,9 +56,15 @@ class PixelWsiInstance(WsiInstance):
         executor: ReadExecutor,
     ) -> np.ndarray:
         # Read the region straight from the image data, bypassing wsidicom's
-        # per-tile decode-and-stitch path, then downsample if a smaller output
-        # was requested.
-        array = self._image_data.read_region(region, z, path)
+        # per-tile decode-and-stitch path. If a smaller output was requested,
+        # read from the closest native level and downsample the rest.
         if output_size is None or output_size == region.size:
+            return self._image_data.read_region(region, z, path)
+        scale = min(
+            region.size.width / output_size.width,
+            region.size.height / output_size.height,
+        )
+        array = self._image_data.read_region_at_scale(region, z, path, scale)
+        if array.shape[:2] == (output_size.height, output_size.width):
             return array
         return self._downsampler.downsample(array, output_size)
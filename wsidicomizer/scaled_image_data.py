@@ -0,0 +1,183 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Image data for levels downscaled from JPEG levels while decoding."""
+
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+from PIL.Image import Resampling
+from pydicom.uid import UID, JPEGBaseline8Bit
+from wsidicom import ImageData
+from wsidicom.geometry import Point, Region, Size, SizeMm
+from wsidicom.metadata import ImageCoordinateSystem, LossyCompression
+
+from wsidicomizer.image_data import BaseDicomizerImageData
+
+
+class ScaledJpegImageData(BaseDicomizerImageData):
+    """Level downscaled by 2, 4 or 8 from a level of baseline JPEG tiles.
+
+    The source tiles are decoded with the scaled DCT of libjpeg, producing the
+    downscaled pixels directly at a fraction of the cost of decoding at full
+    resolution and downsampling. Each tile is stitched from the downscaled source
+    tiles it covers and encoded with the encoder of the source level.
+    """
+
+    SCALES = (2, 4, 8)
+    """Scales supported by the scaled DCT."""
+
+    def __init__(self, source: ImageData, scale: int):
+        """
+        Parameters
+        ----------
+        source: ImageData
+            Level of baseline JPEG tiles to downscale. Use `is_supported()` to
+            check if the level can be downscaled.
+        scale: int
+            Scale to downscale by, one of 2, 4 or 8.
+        """
+        if scale not in self.SCALES:
+            raise ValueError(f"Scale must be one of {self.SCALES}, got {scale}.")
+        super().__init__(source.encoder)
+        self._source = source
+        self._scale = scale
+        self._scaled_source_tile_size = source.tile_size // scale
+
+    @classmethod
+    def is_supported(cls, source: ImageData, scale: int) -> bool:
+        """Return True if the level can be downscaled by scale while decoding.
+
+        The tiles of the level must be stored baseline JPEG, in a color space
+        libjpeg converts to RGB or grayscale, with a size divisible by the
+        scale.
+        """
+        return (
+            scale in cls.SCALES
+            and source.transcoder is None
+            and source.transfer_syntax == JPEGBaseline8Bit
+            and source.photometric_interpretation
+            in ("YBR_FULL_422", "YBR_FULL", "MONOCHROME2")
+            and source.tile_size.width % scale == 0
+            and source.tile_size.height % scale == 0
+        )
+
+    def __str__(self) -> str:
+        return f"{type(self).__name__} of {self._source} scaled by {self._scale}"
+
+    @property
+    def scale(self) -> int:
+        """Scale the source level is downscaled by."""
+        return self._scale
+
+    @property
+    def transfer_syntax(self) -> UID:
+        return self.encoder.transfer_syntax
+
+    @property
+    def image_size(self) -> Size:
+        return self._source.image_size.ceil_div(self._scale)
+
+    @property
+    def tile_size(self) -> Size:
+        return self._source.tile_size
+
+    @property
+    def pixel_spacing(self) -> SizeMm | None:
+        if self._source.pixel_spacing is None:
+            return None
+        return self._source.pixel_spacing * self._scale
+
+    @property
+    def imaged_size(self) -> SizeMm | None:
+        return self._source.imaged_size
+
+    @property
+    def image_coordinate_system(self) -> ImageCoordinateSystem | None:
+        return self._source.image_coordinate_system
+
+    @property
+    def photometric_interpretation(self) -> str:
+        return self.encoder.photometric_interpretation
+
+    @property
+    def samples_per_pixel(self) -> int:
+        return self._source.samples_per_pixel
+
+    @property
+    def focal_planes(self) -> list[float]:
+        return self._source.focal_planes
+
+    @property
+    def optical_paths(self) -> list[str]:
+        return self._source.optical_paths
+
+    @property
+    def lossy_compression(self) -> list[LossyCompression] | None:
+        return self._source.lossy_compression
+
+    @property
+    def thread_safe(self) -> bool:
+        return self._source.thread_safe
+
+    @property
+    def suggested_minimum_chunk_size(self) -> int:
+        return self._source.suggested_minimum_chunk_size
+
+    def get_encoded_tile(self, tile: Point, z: float, path: str) -> bytes:
+        return self.encoder.encode(self.get_decoded_tile(tile, z, path))
+
+    def get_decoded_tile(
+        self,
+        tile_point: Point,
+        z: float,
+        path: str,
+        cache: bool = True,
+    ) -> np.ndarray:
+        """Return tile stitched from the source tiles it covers, decoded
+        downscaled."""
+        tile = self.blank_tile.copy()
+        source_tiled_size = self._source.tiled_size
+        source_start = tile_point * self._scale
+        source_tiles = [
+            source_tile
+            for source_tile in Region(
+                source_start, Size(self._scale, self._scale)
+            ).iterate_all()
+            if source_tile.x < source_tiled_size.width
+            and source_tile.y < source_tiled_size.height
+        ]
+        for source_tile, frame in zip(
+            source_tiles,
+            self._source.get_encoded_tiles(source_tiles, z, path),
+            strict=True,
+        ):
+            decoded = self._decode_scaled(frame)
+            position = (source_tile - source_start) * self._scaled_source_tile_size
+            tile[
+                position.y : position.y + decoded.shape[0],
+                position.x : position.x + decoded.shape[1],
+            ] = decoded
+        return tile
+
+    def _decode_scaled(self, frame: bytes) -> np.ndarray:
+        """Decode frame to the downscaled source tile size, letting libjpeg
+        downscale in the DCT."""
+        size = self._scaled_source_tile_size.to_tuple()
+        with Image.open(BytesIO(frame)) as image:
+            image.draft("RGB" if self.samples_per_pixel > 1 else "L", size)
+            if image.size != size:
+                image = image.resize(size, Resampling.BOX)
+            return np.asarray(image)
@@ -15,23 +15,29 @@
 """Image data for czi file."""
 
 from collections import defaultdict
-from collections.abc import Sequence
-from dataclasses import dataclass
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, replace
 from functools import cached_property
 from pathlib import Path
 from threading import RLock
 
 import numpy as np
-from czifile import CziDirectoryEntryDV, CziFile, CziSubBlockSegmentData
-from pydicom.uid import UID
+from czifile import (
+    CziCompressionType,
+    CziDirectoryEntryDV,
+    CziFile,
+    CziSubBlockSegmentData,
+)
+from opentile.jpeg import Jpeg, JpegProcess
+from pydicom.uid import UID, JPEGBaseline8Bit
 from wsidicom.cache import lru_cached_method
 from wsidicom.codec import Encoder
-from wsidicom.geometry import Point, Region, Size, SizeMm
+from wsidicom.geometry import Point, PointMm, Region, Size, SizeMm
 from wsidicom.metadata import Image as ImageMetadata
 from wsidicom.metadata import ImageCoordinateSystem
 
 from wsidicomizer.config import get_settings
-from wsidicomizer.image_data import BaseDicomizerImageData
+from wsidicomizer.image_data import PixelImageData
 from wsidicomizer.sources.czi.czi_metadata import CziMetadata
 
 
@@ -42,7 +48,7 @@ class CziBlock:
     size: Size
 
 
-class CziImageData(BaseDicomizerImageData):
+class CziImageData(PixelImageData):
     def __init__(
         self,
         czi: CziFile,
@@ -50,6 +56,8 @@ class CziImageData(BaseDicomizerImageData):
         encoder: Encoder,
         czi_metadata: CziMetadata,
         merged_metadata: ImageMetadata,
+        force_transcoding: bool = False,
+        scene: int | None = None,
     ) -> None:
         """Wraps a czi file to ImageData. Multiple pyramid levels are currently
         not supported.
@@ -59,13 +67,20 @@ class CziImageData(BaseDicomizerImageData):
         filepath: str
             Path to czi file to wrap.
         tile_size: int
-            Output tile size.
+            Output tile size. If None and the subblocks form a regular grid,
+            the subblock size is used if not larger than
+            `Settings.czi_max_block_tile_size`, otherwise the default tile size.
         encoded: Encoder
             Encoded to use.
         czi_metadata: CziMetadata
             Czi metadata to use.
         merged_metadata: ImageMetadata
             Merged image metadata to use.
+        force_transcoding: bool = False
+            If to re-encode JPEG subblocks that could be passed through.
+        scene: int | None = None
+            Scene to wrap. The image is sized to the bounding box of the
+            subblocks of the scene. If None, all subblocks are wrapped.
         """
         self._czi = czi
         self._czi_metadata = czi_metadata
@@ -74,21 +89,39 @@ class CziImageData(BaseDicomizerImageData):
         assert self._merged_metadata.pixel_spacing is not None
         self._czi.set_lock(True)
         super().__init__(encoder)
-        if tile_size is None:
-            tile_size = get_settings().default_tile_size
-        self._tile_size = Size(tile_size, tile_size)
-        self._block_directory = self._czi.filtered_subblock_directory
+        self._scene = scene
+        self._block_directory = [
+            block
+            for block in self._czi.filtered_subblock_directory
+            if scene is None or block.scene_index == scene
+        ]
         self._dtype = np.dtype(self._block_directory[0].dtype)
         self._block_locks: dict[int, RLock] = defaultdict(RLock)
 
         if self._merged_metadata.pixel_spacing is None:
             raise ValueError("Could not determine pixel spacing for czi level image.")
         self._pixel_spacing = self._merged_metadata.pixel_spacing
-        self._image_coordinate_system = merged_metadata.image_coordinate_system
+        self._image_coordinate_system = self._get_image_coordinate_system(
+            merged_metadata.image_coordinate_system
+        )
         self._image_size = Size(self._get_size(axis="X"), self._get_size(axis="Y"))
+        self._samples_per_pixel = self._get_size(axis="S")
+        self._block_grid_size = self._get_block_grid_size()
+        max_block_tile_size = get_settings().czi_max_block_tile_size
+        if tile_size is not None:
+            self._tile_size = Size(tile_size, tile_size)
+        elif (
+            self._block_grid_size is not None
+            and self._block_grid_size.width <= max_block_tile_size
+            and self._block_grid_size.height <= max_block_tile_size
+        ):
+            self._tile_size = self._block_grid_size
+        else:
+            default_tile_size = get_settings().default_tile_size
+            self._tile_size = Size(default_tile_size, default_tile_size)
         self._tiled_size = self.image_size.ceil_div(self.tile_size)
         self._focal_planes = sorted(self._czi_metadata.focal_plane_mapping)
-        self._samples_per_pixel = self._get_size(axis="S")
+        self._passthrough = not force_transcoding and self._can_pass_through()
 
     @property
     def image_coordinate_system(self) -> ImageCoordinateSystem | None:
@@ -114,6 +147,19 @@ class CziImageData(BaseDicomizerImageData):
     def thread_safe(self) -> bool:
         return True
 
+    @property
+    def transcoder(self) -> Encoder | None:
+        """Only return encoder if subblocks are not passed through."""
+        if self._passthrough:
+            return None
+        return self.encoder
+
+    @property
+    def passthrough(self) -> bool:
+        """Return true if JPEG subblocks aligned with tiles are passed through
+        without re-encoding."""
+        return self._passthrough
+
     @property
     def image_size(self) -> Size:  # pyright: ignore[reportIncompatibleMethodOverride]
         """The pixel size of the image."""
@@ -182,10 +228,38 @@ class CziImageData(BaseDicomizerImageData):
     def samples_per_pixel(self) -> int:
         return self._samples_per_pixel
 
+    @property
+    def scene(self) -> int | None:
+        """The scene wrapped, or None if all subblocks are wrapped."""
+        return self._scene
+
     @property
     def block_directory(self) -> Sequence[CziDirectoryEntryDV]:
         return self._block_directory
 
+    @staticmethod
+    def detect_scenes(czi: CziFile) -> list[int]:
+        """Return the scenes defined by the subblocks in the czi. Subblocks not
+        belonging to a scene are ignored.
+
+        Parameters
+        ----------
+        czi: CziFile
+            Czi file to detect scenes in.
+
+        Returns
+        ----------
+        list[int]
+            Sorted scene indices, empty if the subblocks define no scenes.
+        """
+        return sorted(
+            {
+                block.scene_index
+                for block in czi.filtered_subblock_directory
+                if block.scene_index != -1
+            }
+        )
+
     @staticmethod
     def detect_format(filepath: Path) -> str | None:
         try:
@@ -213,23 +287,75 @@ class CziImageData(BaseDicomizerImageData):
             # Should not happen (get_decoded_tile() and get_enoded_tile()
             # should already have checked).
             return image_data
+        tile_region = Region(tile_point * self.tile_size, self.tile_size)
+        self._paste_blocks(
+            image_data, tile_region, self.tile_directory[tile_point, z, path]
+        )
+        return image_data
 
-        # For each block covering the tile
-        for block in self.tile_directory[tile_point, z, path]:
-            # Start and end coordinates for block and tile
-            block_end = block.start + block.size
-            tile_start = tile_point * self.tile_size
-            tile_end = (tile_point + 1) * self.tile_size
+    def read_region(self, region: Region, z: float, path: str) -> np.ndarray:
+        """Read region by pasting the overlapping blocks directly into the
+        region, without stitching tiles.
 
-            # The block and tile both cover the region between these points
-            tile_block_start_intersection = Point.max(tile_start, block.start)
-            tile_block_end_intersection = Point.min(tile_end, block_end)
+        Parameters
+        ----------
+        region: Region
+            Pixel region to read.
+        z: float
+            Focal plane of region to read.
+        path: str
+            Optical path of region to read.
 
-            # The intersects in relation to block and tile origin
-            block_start_in_tile = tile_block_start_intersection - tile_start
-            block_end_in_tile = tile_block_end_intersection - tile_start
-            tile_start_in_block = tile_block_start_intersection - block.start
-            tile_end_in_block = tile_block_end_intersection - block.start
+        Returns
+        ----------
+        np.ndarray
+            Region as numpy array.
+        """
+        image_data = self._create_blank_region(region.size)
+        tile_region = Region.from_points(
+            region.start // self.tile_size, region.end.ceil_div(self.tile_size)
+        )
+        blocks = {
+            block.index: block
+            for tile in tile_region.iterate_all()
+            for block in self.tile_directory.get((tile, z, path), [])
+        }
+        self._paste_blocks(image_data, region, blocks.values())
+        return image_data
+
+    def _paste_blocks(
+        self, image_data: np.ndarray, region: Region, blocks: Iterable[CziBlock]
+    ):
+        """Paste the parts of the blocks overlapping the region into the image
+        data of the region.
+
+        Parameters
+        ----------
+        image_data: np.ndarray
+            Image data of the region to paste into.
+        region: Region
+            Pixel region of the image data.
+        blocks: Iterable[CziBlock]
+            Blocks to paste.
+        """
+        for block in blocks:
+            # Start and end coordinates for block
+            block_end = block.start + block.size
+
+            # The block and region both cover the region between these points
+            start_intersection = Point.max(region.start, block.start)
+            end_intersection = Point.min(region.end, block_end)
+            if (
+                start_intersection.x >= end_intersection.x
+                or start_intersection.y >= end_intersection.y
+            ):
+                continue
+
+            # The intersects in relation to block and region origin
+            block_start_in_region = start_intersection - region.start
+            block_end_in_region = end_intersection - region.start
+            region_start_in_block = start_intersection - block.start
+            region_end_in_block = end_intersection - block.start
 
             # Get decompressed data
             block_data = self._get_tile_data(block.index)
@@ -237,15 +363,14 @@ class CziImageData(BaseDicomizerImageData):
             block_data = np.reshape(
                 block_data, self._size_to_numpy_shape(block.size), copy=False
             )
-            # Paste in block data into tile.
+            # Paste in block data into region.
             image_data[
-                block_start_in_tile.y : block_end_in_tile.y,
-                block_start_in_tile.x : block_end_in_tile.x,
+                block_start_in_region.y : block_end_in_region.y,
+                block_start_in_region.x : block_end_in_region.x,
             ] = block_data[
-                tile_start_in_block.y : tile_end_in_block.y,
-                tile_start_in_block.x : tile_end_in_block.x,
+                region_start_in_block.y : region_end_in_block.y,
+                region_start_in_block.x : region_end_in_block.x,
             ]
-        return image_data
 
     def get_decoded_tile(
         self,
@@ -278,9 +403,77 @@ class CziImageData(BaseDicomizerImageData):
         """
         if (tile, z, path) not in self.tile_directory:
             return self.blank_encoded_tile
+        if self._passthrough:
+            block = self._get_aligned_block(tile, z, path)
+            if block is not None:
+                return self._get_encoded_tile_data(block.index)
         frame = self._get_tile(tile, z, path)
         return self.encoder.encode(frame)
 
+    def _get_aligned_block(self, tile: Point, z: float, path: str) -> CziBlock | None:
+        """Return the block covering exactly the tile, or None if the tile is
+        not covered by a single block of the same size and position."""
+        blocks = self.tile_directory[tile, z, path]
+        if len(blocks) != 1:
+            return None
+        block = blocks[0]
+        if block.start != tile * self.tile_size or block.size != self.tile_size:
+            return None
+        return block
+
+    def _get_block_grid_size(self) -> Size | None:
+        """Return the size of the subblocks if they form a regular grid, i.e.
+        all subblocks have the same size (except at the right and bottom edges
+        of the image) and start on a multiple of that size. Otherwise return
+        None."""
+        grid_size: Size | None = None
+        for block in self._block_directory:
+            start, size, _, _ = self._get_block_dimensions(block)
+            if grid_size is None:
+                grid_size = size
+            if (
+                start.x % grid_size.width != 0
+                or start.y % grid_size.height != 0
+                or (
+                    size.width != grid_size.width
+                    and start.x + size.width != self.image_size.width
+                )
+                or (
+                    size.height != grid_size.height
+                    and start.y + size.height != self.image_size.height
+                )
+            ):
+                return None
+        return grid_size
+
+    def _can_pass_through(self) -> bool:
+        """Return true if the subblocks are baseline JPEG compatible with the
+        encoder and aligned with the tiles, so that they can be passed through
+        without re-encoding."""
+        if (
+            self._block_grid_size != self.tile_size
+            or self._dtype != np.uint8
+            or self.encoder.transfer_syntax != JPEGBaseline8Bit
+            or any(
+                block.compression != CziCompressionType.JPEG
+                for block in self._block_directory
+            )
+        ):
+            return False
+        info = Jpeg.info(self._get_encoded_tile_data(0))
+        if (
+            info.process != JpegProcess.BASELINE
+            or info.bit_depth != 8
+            or info.components != self.samples_per_pixel
+        ):
+            return False
+        # Blank and edge tiles are encoded, and must match the passed through
+        # tiles.
+        return (
+            self._get_jpeg_photometric_interpretation(info)
+            == self.photometric_interpretation
+        )
+
     @staticmethod
     def _block_axis(block: CziDirectoryEntryDV, axis: str) -> tuple[int, int] | None:
         """Return (start, size) of block along axis, or None if axis is absent."""
@@ -321,15 +514,40 @@ class CziImageData(BaseDicomizerImageData):
             start for start, _ in spans
         )
 
-    def _get_start(self, axis: str) -> int:
+    def _get_start(
+        self, axis: str, blocks: Iterable[CziDirectoryEntryDV] | None = None
+    ) -> int:
         """Origin of the image along axis (lowest block start)."""
+        if blocks is None:
+            blocks = self._block_directory
         starts = [
             span[0]
-            for block in self._block_directory
+            for block in blocks
             if (span := self._block_axis(block, axis)) is not None
         ]
         return min(starts) if starts else 0
 
+    def _get_image_coordinate_system(
+        self, image_coordinate_system: ImageCoordinateSystem | None
+    ) -> ImageCoordinateSystem | None:
+        """Return image coordinate system with origin moved to the origin of
+        the scene, so that each scene is placed where it is on the slide."""
+        if self._scene is None or image_coordinate_system is None:
+            return image_coordinate_system
+        blocks = self._czi.filtered_subblock_directory
+        file_origin = Point(
+            self._get_start(axis="X", blocks=blocks),
+            self._get_start(axis="Y", blocks=blocks),
+        )
+        offset = self.pixel_origin - file_origin
+        origin = image_coordinate_system.image_to_slide(
+            PointMm(
+                offset.x * self._pixel_spacing.width,
+                offset.y * self._pixel_spacing.height,
+            )
+        )
+        return replace(image_coordinate_system, origin=origin)
+
     def _create_blank_tile(self) -> np.ndarray:
         """Return blank tile in numpy array.
 
@@ -338,9 +556,24 @@ class CziImageData(BaseDicomizerImageData):
         np.ndarray
             A blank tile as numpy array.
         """
+        return self._create_blank_region(self.tile_size)
+
+    def _create_blank_region(self, size: Size) -> np.ndarray:
+        """Return blank region of size in numpy array.
+
+        Parameters
+        ----------
+        size: Size
+            Size of region.
+
+        Returns
+        ----------
+        np.ndarray
+            A blank region as numpy array.
+        """
         fill_value = 0 if self.photometric_interpretation == "MONOCHROME2" else 1
         return np.full(
-            self._size_to_numpy_shape(self.tile_size),
+            self._size_to_numpy_shape(size),
             fill_value * np.iinfo(self._dtype).max,
             dtype=self._dtype,
         )
@@ -370,6 +603,13 @@ class CziImageData(BaseDicomizerImageData):
             if acquired:
                 block_lock.release()
 
+    def _get_encoded_tile_data(self, block_index: int) -> bytes:
+        """Get undecoded tile data from czi file."""
+        block = self.block_directory[block_index]
+        segment = block.read_segment_data(self._czi)
+        assert isinstance(segment, CziSubBlockSegmentData)
+        return bytes(segment.data(raw=True))
+
     def _get_block_dimensions(
         self, block: CziDirectoryEntryDV
     ) -> tuple[Point, Size, float, str]:
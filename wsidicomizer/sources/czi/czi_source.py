@@ -14,6 +14,7 @@
 
 """Source for reading czi file."""
 
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
@@ -22,17 +23,21 @@ from pydicom import Dataset
 from upath import UPath
 from wsidicom.codec import Encoder
 from wsidicom.codec.settings import Channels
-from wsidicom.metadata import UidGenerator, WsiMetadata
+from wsidicom.instance import WsiInstance
+from wsidicom.metadata import ImageType, UidGenerator, WsiMetadata
 from wsidicom.paths import as_local_path
 
 from wsidicomizer.dicomizer_source import DicomizerSource
 from wsidicomizer.image_data import BaseDicomizerImageData
 from wsidicomizer.metadata import MetadataPostProcessor, MetadataPreProcessor
+from wsidicomizer.pixel_wsi_instance import PixelWsiInstance
 from wsidicomizer.sources.czi.czi_image_data import CziImageData
 from wsidicomizer.sources.czi.czi_metadata import CziMetadata
 
 
 class CziSource(DicomizerSource):
+    _instance_cls = PixelWsiInstance
+
     def __init__(
         self,
         filepath: UPath,
@@ -43,6 +48,7 @@ class CziSource(DicomizerSource):
         include_confidential: bool = True,
         metadata_post_processor: Dataset | MetadataPostProcessor | None = None,
         metadata_pre_processor: MetadataPreProcessor | None = None,
+        force_transcoding: bool = False,
         uid_generator: UidGenerator | None = None,
         file_options: dict[str, Any] | None = None,
     ) -> None:
@@ -53,10 +59,14 @@ class CziSource(DicomizerSource):
         filepath: UPath
             Path to the file.
         encoder: Encoder | None
-            Encoder to use. Pyramid is always re-encoded using the encoder.
-            If None, the source picks a default matching its pixel format.
+            Encoder to use. Pyramid is re-encoded using the encoder, except
+            for baseline JPEG subblocks that align with the tiles and match the
+            encoder, which are passed through. If None, the source picks a
+            default matching its pixel format.
         tile_size: Optional[int] = None,
-            Tile size to use. If None, the default tile size is used.
+            Tile size to use. If None, the subblock size is used if the
+            subblocks form a regular grid and are not larger than
+            `Settings.czi_max_block_tile_size`, otherwise the default tile size.
         metadata: Optional[WsiMetadata] = None
             User-specified metadata that will overload metadata from source image file.
         default_metadata: Optional[WsiMetadata] = None
@@ -69,6 +79,8 @@ class CziSource(DicomizerSource):
             Optional metadata pre processing by callback, of the metadata read
             from the file before `metadata` and `default_metadata` are merged
             into it.
+        force_transcoding: bool = False
+            If to re-encode JPEG subblocks that could be passed through.
         uid_generator: UidGenerator | None = None
             Generator used by the source to fill metadata UIDs. `None` uses the
             default `CallableUidGenerator` backed by `pydicom.generate_uid`.
@@ -88,6 +100,11 @@ class CziSource(DicomizerSource):
             uid_generator=uid_generator,
         )
         self._czi = CziFile(self._require_local_filepath(filepath))
+        self._force_transcoding = force_transcoding
+        self._scenes: list[int | None] = list(CziImageData.detect_scenes(self._czi))
+        if len(self._scenes) <= 1:
+            # No or a single scene, read all subblocks.
+            self._scenes = [None]
         self._base_metadata = CziMetadata(self._czi)
 
     def close(self) -> None:
@@ -100,8 +117,30 @@ class CziSource(DicomizerSource):
 
     @property
     def pyramid_levels(self) -> dict[tuple[int, float, str], int]:
+        """Only the base level is read for each scene. See `level_instances`
+        for how multiple scenes are handled."""
         return {(0, 0.0, "0"): 0}
 
+    @cached_property
+    def level_instances(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self,
+    ) -> list[WsiInstance]:
+        """Return the base level instance of each scene. Each scene is placed at
+        its own position on the slide and is thus opened as a separate
+        pyramid."""
+        return [
+            self._create_instance(
+                self._create_scene_image_data(scene), ImageType.VOLUME, 0
+            )
+            for scene in self._scenes
+        ]
+
+    @property
+    def scenes(self) -> list[int | None]:
+        """Scenes read as separate pyramids. A single None if the file has no
+        or only one scene."""
+        return self._scenes
+
     @property
     def base_metadata(self) -> CziMetadata:
         return self._base_metadata
@@ -118,12 +157,17 @@ class CziSource(DicomizerSource):
     def _create_level_image_data(self, level_index: int) -> BaseDicomizerImageData:
         if level_index != 0:
             raise NotImplementedError("Only base level is supported.")
+        return self._create_scene_image_data(self._scenes[0])
+
+    def _create_scene_image_data(self, scene: int | None) -> CziImageData:
         return CziImageData(
             self._czi,
             self._tile_size,
             self._encoder,
             self.base_metadata,
             self.metadata.pyramid.image,
+            self._force_transcoding,
+            scene,
         )
 
     def _create_label_image_data(self) -> BaseDicomizerImageData | None:
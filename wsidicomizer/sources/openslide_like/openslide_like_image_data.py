@@ -12,18 +12,25 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
-from collections.abc import Sequence
+import math
+from abc import abstractmethod
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 
 import numpy as np
 from PIL.Image import Image
 from pydicom.uid import UID
 from wsidicom.codec import Encoder
+from wsidicom.errors import WsiDicomNotFoundError
 from wsidicom.geometry import Point, Region, Size, SizeMm
 from wsidicom.metadata import Image as ImageMetadata
 from wsidicom.metadata import ImageCoordinateSystem
 
 from wsidicomizer.config import get_settings
 from wsidicomizer.image_data import PixelImageData
+from wsidicomizer.sources.openslide_like.tile_blocks import (
+    get_block_width,
+    plan_tile_blocks,
+)
 
 
 class OpenSlideLikeImageData(PixelImageData):
@@ -245,6 +252,7 @@ class OpenSlideLikeLevelImageData(OpenSlideLikeImageData):
         level_index: int,
         tile_size: int | None,
         encoder: Encoder,
+        native_tile_size: Size | None = None,
     ):
         super().__init__(
             blank_color,
@@ -253,7 +261,13 @@ class OpenSlideLikeLevelImageData(OpenSlideLikeImageData):
         if tile_size is None:
             tile_size = get_settings().default_tile_size
         self._tile_size = Size(tile_size, tile_size)
+        self._block_width = get_block_width(
+            tile_size,
+            native_tile_size.width if native_tile_size is not None else None,
+            get_settings().region_read_max_width,
+        )
         self._level_index = level_index
+        self._level_downsamples = list(level_downsamples)
         self._downsample = level_downsamples[self._level_index]
         if image_metadata.pixel_spacing is None:
             raise ValueError(
@@ -299,3 +313,239 @@ class OpenSlideLikeLevelImageData(OpenSlideLikeImageData):
     @property
     def image_coordinate_system(self) -> ImageCoordinateSystem | None:
         return self._image_coordinate_system
+
+    @property
+    def suggested_minimum_chunk_size(self) -> int:
+        """A chunk should span a block of tiles read in one region read."""
+        return self._block_width
+
+    def get_decoded_tiles(
+        self,
+        tiles: Iterable[Point],
+        z: float,
+        path: str,
+        cache: bool = True,
+    ) -> Iterator[np.ndarray]:
+        """Return the pixels of multiple tiles, read in blocks of adjacent tiles.
+
+        Parameters
+        ----------
+        tiles: Iterable[Point]
+            Tiles to get.
+        z: float
+            Focal plane of tiles to get.
+        path: str
+            Optical path of tiles to get.
+
+        Returns
+        ----------
+        Iterator[np.ndarray]
+            Tile pixels.
+        """
+        for tile in self._get_tiles(tiles, z, path):
+            if tile is None:
+                yield self._get_blank_decoded_frame(self.tile_size)
+            else:
+                yield tile
+
+    def get_encoded_tiles(
+        self, tiles: Iterable[Point], z: float, path: str
+    ) -> Iterator[bytes]:
+        """Return bytes of multiple tiles, read in blocks of adjacent tiles.
+
+        Parameters
+        ----------
+        tiles: Iterable[Point]
+            Tiles to get.
+        z: float
+            Focal plane of tiles to get.
+        path: str
+            Optical path of tiles to get.
+
+        Returns
+        ----------
+        Iterator[bytes]
+            Tile bytes.
+        """
+        for tile in self._get_tiles(tiles, z, path):
+            if tile is None:
+                yield self._get_blank_encoded_frame(self.tile_size)
+            else:
+                yield self.encoder.encode(tile)
+
+    def read_region_at_scale(
+        self, region: Region, z: float, path: str, scale: float
+    ) -> np.ndarray:
+        """Read the pixels of a region from the native level closest to, but not
+        coarser than, the scale.
+
+        Parameters
+        ----------
+        region: Region
+            Pixel region to read.
+        z: float
+            Z coordinate.
+        path: str
+            Optical path.
+        scale: float
+            Largest scale to downscale the region by.
+
+        Returns
+        -------
+        np.ndarray
+            The region, downscaled by the scale of the selected level.
+        """
+        level_index = self._select_level_for_scale(
+            self._level_downsamples, self._level_index, scale
+        )
+        if level_index == self._level_index:
+            return self.read_region(region, z, path)
+        if z not in self.focal_planes:
+            raise WsiDicomNotFoundError(f"focal plane {z}", str(self))
+        if path not in self.optical_paths:
+            raise WsiDicomNotFoundError(f"optical path {path}", str(self))
+        level_scale = self._level_downsamples[level_index] / self._downsample
+        size = Size(
+            max(math.ceil(region.size.width / level_scale), 1),
+            max(math.ceil(region.size.height / level_scale), 1),
+        )
+        region_data = self._get_tile_pixels(
+            self._read_level_region_data(
+                region.start * self._downsample + self._offset, level_index, size
+            )
+        )
+        if region_data is None:
+            return self._get_blank_decoded_frame(size)
+        return region_data
+
+    def _get_tiles(
+        self, tiles: Iterable[Point], z: float, path: str
+    ) -> list[np.ndarray | None]:
+        """Return the pixels of tiles, or None for blank tiles. Adjacent tiles are
+        read in blocks aligned to the native tile grid, each block with one
+        region read, and sliced into tiles."""
+        if z not in self.focal_planes:
+            raise WsiDicomNotFoundError(f"focal plane {z}", str(self))
+        if path not in self.optical_paths:
+            raise WsiDicomNotFoundError(f"optical path {path}", str(self))
+        tiles = list(tiles)
+        read: dict[Point, np.ndarray | None] = {}
+        for block in plan_tile_blocks(tiles, self._block_width):
+            region_data = self._read_region_data(
+                Region(block.start * self.tile_size, block.size * self.tile_size)
+            )
+            for tile in block.iterate_all():
+                start = (tile - block.start) * self.tile_size
+                read[tile] = self._get_tile_pixels(
+                    region_data[
+                        start.y : start.y + self.tile_size.height,
+                        start.x : start.x + self.tile_size.width,
+                    ]
+                )
+        return [read[tile] for tile in tiles]
+
+    def _get_region(self, region: Region) -> np.ndarray | None:
+        """Return the pixels of region, or None if the region is blank.
+
+        Parameters
+        ----------
+        region: Region
+            Region to get pixels for.
+
+        Returns
+        ----------
+        np.ndarray | None
+            Pixels of region, or None if region is blank.
+        """
+        if region.size.width < 0 or region.size.height < 0:
+            raise ValueError("Negative size not allowed")
+        return self._get_tile_pixels(self._read_region_data(region))
+
+    def _read_region_data(self, region: Region) -> np.ndarray:
+        """Return the region as read from the source, before removing
+        transparency.
+
+        Parameters
+        ----------
+        region: Region
+            Region to read.
+
+        Returns
+        ----------
+        np.ndarray
+            Region data.
+        """
+        return self._read_level_region_data(
+            region.start * self._downsample + self._offset,
+            self._level_index,
+            region.size,
+        )
+
+    @abstractmethod
+    def _read_level_region_data(
+        self, location: Point, level_index: int, size: Size
+    ) -> np.ndarray:
+        """Return a region of a native level as read from the source, before
+        removing transparency.
+
+        Parameters
+        ----------
+        location: Point
+            Position of the region in the base level of the source.
+        level_index: int
+            Index of the native level to read from.
+        size: Size
+            Size of the region in the native level.
+
+        Returns
+        ----------
+        np.ndarray
+            Region data.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _get_tile_pixels(self, region_data: np.ndarray) -> np.ndarray | None:
+        """Return pixels from part of region data read with `_read_region_data()`,
+        or None if the part is blank.
+
+        Parameters
+        ----------
+        region_data: np.ndarray
+            Part of region data, possibly a non-contiguous view.
+
+        Returns
+        ----------
+        np.ndarray | None
+            Pixels, or None if blank.
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def _get_native_tile_size(
+        properties: Mapping[str, str], prefix: str, level_index: int
+    ) -> Size | None:
+        """Return the tile size of the source level from the `level[N].tile-width`
+        and `level[N].tile-height` properties, or None if not available.
+
+        Parameters
+        ----------
+        properties: Mapping[str, str]
+            Properties of the slide.
+        prefix: str
+            Prefix of the properties, e.g. `openslide`.
+        level_index: int
+            Index of the level.
+
+        Returns
+        ----------
+        Size | None
+            Tile size of the level, or None if not available.
+        """
+        try:
+            return Size(
+                int(properties[f"{prefix}.level[{level_index}].tile-width"]),
+                int(properties[f"{prefix}.level[{level_index}].tile-height"]),
+            )
+        except (KeyError, ValueError):
+            return None
@@ -0,0 +1,121 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Planning of block reads covering batches of output tiles."""
+
+import math
+from collections import defaultdict
+from collections.abc import Iterable
+
+from wsidicom.geometry import Point, Region, Size
+
+
+def get_block_width(
+    tile_width: int, native_tile_width: int | None, max_width: int
+) -> int:
+    """Return the width in output tiles of the blocks to read.
+
+    The width is the largest that fits within max width pixels. If the native
+    tile width is known, the width is preferably a multiple of the number of
+    output tiles spanning a whole number of native tiles, so that blocks start
+    and end on the native tile grid and native tiles are not decoded by two
+    blocks.
+
+    Parameters
+    ----------
+    tile_width: int
+        Width of output tiles in pixels.
+    native_tile_width: int | None
+        Width of the tiles of the source level in pixels, if known.
+    max_width: int
+        Largest width of a block in pixels.
+
+    Returns
+    ----------
+    int
+        Width of blocks in output tiles.
+    """
+    max_tiles = max(max_width // tile_width, 1)
+    if native_tile_width is None:
+        return max_tiles
+    aligned_tiles = native_tile_width // math.gcd(tile_width, native_tile_width)
+    if aligned_tiles > max_tiles:
+        return max_tiles
+    return aligned_tiles * (max_tiles // aligned_tiles)
+
+
+def plan_tile_blocks(
+    tiles: Iterable[Point], block_width: int, block_height: int | None = None
+) -> list[Region]:
+    """Return blocks of tiles, in tile coordinates, covering exactly the tiles.
+
+    Each row of tiles is split into runs of adjacent tiles, broken at multiples
+    of block width so that the runs are aligned to the same grid in every row.
+    Runs spanning the same columns in adjacent rows are joined into one block,
+    broken at rows that are multiples of block height so that the size of a
+    region read for a block is bounded.
+
+    Parameters
+    ----------
+    tiles: Iterable[Point]
+        Tiles to cover.
+    block_width: int
+        Largest width of a block in tiles.
+    block_height: int | None = None
+        Largest height of a block in tiles. If None, the block width is used.
+
+    Returns
+    ----------
+    list[Region]
+        Blocks of tiles, ordered by their first row and column.
+    """
+    if block_height is None:
+        block_height = block_width
+    rows: dict[int, list[int]] = defaultdict(list)
+    for tile in set(tiles):
+        rows[tile.y].append(tile.x)
+    # Index of the blocks ending on the previous row, by start and end column.
+    open_blocks: dict[tuple[int, int], int] = {}
+    blocks: list[Region] = []
+    previous_y: int | None = None
+    for y in sorted(rows):
+        if previous_y != y - 1 or y % block_height == 0:
+            open_blocks = {}
+        row_blocks: dict[tuple[int, int], int] = {}
+        for start, end in _get_runs(sorted(rows[y]), block_width):
+            index = open_blocks.get((start, end))
+            if index is not None:
+                block = blocks[index]
+                blocks[index] = Region(
+                    block.start, Size(block.size.width, block.size.height + 1)
+                )
+            else:
+                index = len(blocks)
+                blocks.append(Region(Point(start, y), Size(end - start, 1)))
+            row_blocks[(start, end)] = index
+        open_blocks = row_blocks
+        previous_y = y
+    return sorted(blocks, key=lambda block: (block.start.y, block.start.x))
+
+
+def _get_runs(columns: list[int], block_width: int) -> list[tuple[int, int]]:
+    """Return start and end (exclusive) of runs of adjacent sorted columns, broken
+    at multiples of block width."""
+    runs: list[tuple[int, int]] = []
+    for column in columns:
+        if runs and runs[-1][1] == column and column % block_width != 0:
+            runs[-1] = (runs[-1][0], column + 1)
+        else:
+            runs.append((column, column + 1))
+    return runs
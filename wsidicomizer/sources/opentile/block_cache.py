@@ -0,0 +1,484 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Block cache with read-ahead for reading files on remote filesystems."""
+
+import itertools
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from fsspec import AbstractFileSystem, filesystem, register_implementation
+from fsspec.spec import AbstractBufferedFile
+from upath import UPath
+from wsidicom.paths import as_local_path, as_upath
+
+from wsidicomizer.config import get_settings
+
+
+class BlockCache:
+    """Caches fixed size blocks of files on a fsspec filesystem.
+
+    Reads are served from blocks in a bounded LRU in memory. Blocks evicted from
+    memory are optionally spilled to a bounded LRU in a temporary directory on
+    disk. Missing blocks are fetched with one range request per run of adjacent
+    blocks. When a read continues where the previous read of the file ended, as
+    when tiles are read in the order they are stored, the following blocks are
+    fetched in the background."""
+
+    def __init__(
+        self,
+        fs: AbstractFileSystem,
+        block_size: int,
+        cache_size: int,
+        spill_size: int = 0,
+        read_ahead: int = 0,
+        max_connections: int = 8,
+    ):
+        """
+        Parameters
+        ----------
+        fs: AbstractFileSystem
+            Filesystem to read blocks from.
+        block_size: int
+            Size of blocks in bytes.
+        cache_size: int
+            Number of blocks to keep in memory.
+        spill_size: int = 0
+            Number of blocks evicted from memory to keep on disk. If 0, evicted
+            blocks are discarded.
+        read_ahead: int = 0
+            Number of blocks to fetch ahead of sequential reads.
+        max_connections: int = 8
+            Largest number of range requests in flight.
+        """
+        if block_size <= 0:
+            raise ValueError(f"Block size must be positive, got {block_size}.")
+        self._fs = fs
+        self._block_size = block_size
+        self._cache_size = max(cache_size, 1)
+        self._spill_size = spill_size
+        self._read_ahead = read_ahead
+        self._lock = threading.Lock()
+        self._blocks: OrderedDict[tuple[str, int], bytes] = OrderedDict()
+        self._spilled: OrderedDict[tuple[str, int], Path] = OrderedDict()
+        self._pending: dict[tuple[str, int], Future[bytes]] = {}
+        self._sizes: dict[str, int] = {}
+        self._last_blocks: dict[str, int] = {}
+        self._spill_directory: tempfile.TemporaryDirectory[str] | None = None
+        self._spill_names = itertools.count()
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+        weakref.finalize(self, self._executor.shutdown, wait=False)
+
+    @property
+    def block_size(self) -> int:
+        """Size of blocks in bytes."""
+        return self._block_size
+
+    def size(self, path: str) -> int:
+        """Return size of file in path."""
+        size = self._sizes.get(path)
+        if size is None:
+            file_size = self._fs.size(path)
+            if file_size is None:
+                raise ValueError(f"Size of file {path} is not known.")
+            size = int(file_size)
+            self._sizes[path] = size
+        return size
+
+    def read(self, path: str, start: int, end: int) -> bytes:
+        """Return bytes from start to end (exclusive) of file in path.
+
+        Parameters
+        ----------
+        path: str
+            Path to the file on the filesystem.
+        start: int
+            Offset of the first byte to read.
+        end: int
+            Offset after the last byte to read, clipped to the size of the file.
+
+        Returns
+        ----------
+        bytes
+            The read bytes.
+        """
+        return self.read_ranges(path, [(start, end)])[0]
+
+    def read_ranges(self, path: str, ranges: Sequence[tuple[int, int]]) -> list[bytes]:
+        """Return bytes of ranges, given as start and end (exclusive), of file in
+        path. Blocks missing for all the ranges are fetched concurrently."""
+        if len(ranges) == 0:
+            return []
+        size = self.size(path)
+        ranges = [(max(start, 0), min(end, size)) for start, end in ranges]
+        indices = sorted(
+            {
+                index
+                for start, end in ranges
+                if end > start
+                for index in range(
+                    start // self._block_size, (end - 1) // self._block_size + 1
+                )
+            }
+        )
+        futures = self._request_blocks(path, indices)
+        self._read_ahead_of(path, ranges)
+        blocks = {index: future.result() for index, future in futures.items()}
+        return [self._join(blocks, start, end) for start, end in ranges]
+
+    def close(self) -> None:
+        """Stop fetching blocks and remove blocks spilled to disk."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._blocks.clear()
+            self._spilled.clear()
+            if self._spill_directory is not None:
+                self._spill_directory.cleanup()
+                self._spill_directory = None
+
+    def _join(self, blocks: dict[int, bytes], start: int, end: int) -> bytes:
+        """Return bytes from start to end joined from blocks."""
+        if end <= start:
+            return b""
+        first = start // self._block_size
+        last = (end - 1) // self._block_size
+        offset = start - first * self._block_size
+        if first == last:
+            return blocks[first][offset : offset + end - start]
+        data = b"".join(blocks[index] for index in range(first, last + 1))
+        return data[offset : offset + end - start]
+
+    def _read_ahead_of(self, path: str, ranges: Sequence[tuple[int, int]]) -> None:
+        """Fetch the blocks following the last range in the background if the
+        ranges continue the previous read of the file."""
+        first = min(start for start, _ in ranges) // self._block_size
+        last = max(max(end - 1, 0) for _, end in ranges) // self._block_size
+        with self._lock:
+            previous = self._last_blocks.get(path)
+            self._last_blocks[path] = last
+        if (
+            self._read_ahead <= 0
+            or previous is None
+            or first
+            not in (
+                previous,
+                previous + 1,
+            )
+        ):
+            return
+        block_count = -(-self.size(path) // self._block_size)
+        self._request_blocks(
+            path, range(last + 1, min(last + 1 + self._read_ahead, block_count))
+        )
+
+    def _request_blocks(
+        self, path: str, indices: Sequence[int]
+    ) -> dict[int, Future[bytes]]:
+        """Return futures of blocks, fetching missing blocks in runs of adjacent
+        blocks."""
+        futures: dict[int, Future[bytes]] = {}
+        missing: list[int] = []
+        with self._lock:
+            for index in indices:
+                key = (path, index)
+                future = self._pending.get(key)
+                if future is None:
+                    future = Future()
+                    block = self._get_cached(key)
+                    if block is not None:
+                        future.set_result(block)
+                    else:
+                        self._pending[key] = future
+                        missing.append(index)
+                futures[index] = future
+        runs: list[list[int]] = []
+        for index in missing:
+            if runs and runs[-1][-1] == index - 1:
+                runs[-1].append(index)
+            else:
+                runs.append([index])
+        for run in runs:
+            self._executor.submit(
+                self._fetch, path, run, [futures[index] for index in run]
+            )
+        return futures
+
+    def _fetch(self, path: str, run: list[int], futures: list[Future[bytes]]) -> None:
+        """Fetch a run of adjacent blocks with one range request."""
+        start = run[0] * self._block_size
+        end = min((run[-1] + 1) * self._block_size, self.size(path))
+        try:
+            data = self._fs.cat_file(path, start, end)
+            if not isinstance(data, bytes | bytearray):
+                raise TypeError(
+                    f"Expected bytes at offset {start}, got {type(data).__name__}."
+                )
+        except Exception as exception:
+            with self._lock:
+                for index in run:
+                    self._pending.pop((path, index), None)
+            for future in futures:
+                future.set_exception(exception)
+            return
+        blocks = [
+            bytes(data[offset : offset + self._block_size])
+            for offset in range(0, end - start, self._block_size)
+        ]
+        with self._lock:
+            for index, block in zip(run, blocks, strict=True):
+                self._pending.pop((path, index), None)
+                self._put(path, index, block)
+        for future, block in zip(futures, blocks, strict=True):
+            future.set_result(block)
+
+    def _get_cached(self, key: tuple[str, int]) -> bytes | None:
+        """Return block from memory or disk, or None if not cached. Must be called
+        with the lock held."""
+        block = self._blocks.get(key)
+        if block is not None:
+            self._blocks.move_to_end(key)
+            return block
+        spilled = self._spilled.pop(key, None)
+        if spilled is None:
+            return None
+        block = spilled.read_bytes()
+        spilled.unlink()
+        self._put(*key, block)
+        return block
+
+    def _put(self, path: str, index: int, block: bytes) -> None:
+        """Put block in memory, evicting the least recently used blocks. Must be
+        called with the lock held."""
+        self._blocks[(path, index)] = block
+        self._blocks.move_to_end((path, index))
+        while len(self._blocks) > self._cache_size:
+            key, evicted = self._blocks.popitem(last=False)
+            self._spill(key, evicted)
+
+    def _spill(self, key: tuple[str, int], block: bytes) -> None:
+        """Write block evicted from memory to disk, if spilling is enabled. Must
+        be called with the lock held."""
+        if self._spill_size <= 0:
+            return
+        if self._spill_directory is None:
+            self._spill_directory = tempfile.TemporaryDirectory(
+                prefix="wsidicomizer-blocks-"
+            )
+        spilled = Path(self._spill_directory.name).joinpath(
+            str(next(self._spill_names))
+        )
+        spilled.write_bytes(block)
+        self._spilled[key] = spilled
+        while len(self._spilled) > self._spill_size:
+            _, removed = self._spilled.popitem(last=False)
+            removed.unlink(missing_ok=True)
+
+
+class BlockCachedFile(AbstractBufferedFile):
+    """File reading through the block cache of a `BlockCacheFileSystem`, with
+    the block size of the cache."""
+
+    def __init__(self, fs: "BlockCacheFileSystem", path: str, cache: BlockCache):
+        self._block_cache = cache
+        super().__init__(
+            fs,
+            path,
+            mode="rb",
+            cache_type="none",
+            size=cache.size(path),
+        )
+
+    def _fetch_range(self, start: int, end: int) -> bytes:
+        return self._block_cache.read(self.path, start, end)
+
+
+class BlockCacheFileSystem(AbstractFileSystem):
+    """Read-only filesystem reading files of a target filesystem through a
+    `BlockCache`.
+
+    Open a file through the cache with the url and options given by
+    `get_block_cached_path()`, or with a url of the `blockreadahead` protocol and
+    the `target_protocol` and `target_options` of the target filesystem. Each
+    instance has its own cache, shared by the files opened and the ranges read
+    through it."""
+
+    protocol = "blockreadahead"
+    cachable = False
+
+    def __init__(
+        self,
+        target_protocol: str,
+        target_options: dict[str, Any] | None = None,
+        block_size: int | None = None,
+        cache_size: int | None = None,
+        spill_size: int | None = None,
+        read_ahead: int | None = None,
+        **kwargs: Any,
+    ):
+        """
+        Parameters
+        ----------
+        target_protocol: str
+            Protocol of the filesystem to read files from.
+        target_options: dict[str, Any] | None = None
+            Options for the filesystem to read files from.
+        block_size: int | None = None
+            Size of blocks in bytes. If None, `Settings.remote_block_size` is used.
+        cache_size: int | None = None
+            Number of blocks to keep in memory. If None,
+            `Settings.remote_block_cache_size` is used.
+        spill_size: int | None = None
+            Number of blocks to keep on disk. If None,
+            `Settings.remote_block_spill_size` is used.
+        read_ahead: int | None = None
+            Number of blocks to fetch ahead of sequential reads. If None,
+            `Settings.remote_read_ahead_blocks` is used.
+        """
+        super().__init__(**kwargs)
+        settings = get_settings()
+        self._target = filesystem(target_protocol, **(target_options or {}))
+        self._block_cache = BlockCache(
+            self._target,
+            block_size if block_size is not None else settings.remote_block_size,
+            cache_size if cache_size is not None else settings.remote_block_cache_size,
+            spill_size if spill_size is not None else settings.remote_block_spill_size,
+            read_ahead if read_ahead is not None else settings.remote_read_ahead_blocks,
+            settings.remote_read_max_connections,
+        )
+        self.blocksize = self._block_cache.block_size
+
+    @property
+    def block_cache(self) -> BlockCache:
+        """Cache files are read through."""
+        return self._block_cache
+
+    def info(self, path: str, **kwargs: Any) -> dict[str, Any]:
+        return self._target.info(path, **kwargs)
+
+    def ls(self, path: str, detail: bool = True, **kwargs: Any) -> Any:
+        return self._target.ls(path, detail=detail, **kwargs)
+
+    def size(self, path: str) -> int:
+        return self._block_cache.size(path)
+
+    def cat_file(
+        self,
+        path: str,
+        start: int | None = None,
+        end: int | None = None,
+        **kwargs: Any,
+    ) -> bytes:
+        start, end = self._get_range(path, start, end)
+        return self._block_cache.read(path, start, end)
+
+    def cat_ranges(
+        self,
+        paths: list[str],
+        starts: int | list[int] | None,
+        ends: int | list[int] | None,
+        max_gap: int | None = None,
+        on_error: str = "return",
+        **kwargs: Any,
+    ) -> list[bytes]:
+        range_starts: Sequence[int | None] = (
+            starts if isinstance(starts, list) else [starts] * len(paths)
+        )
+        range_ends: Sequence[int | None] = (
+            ends if isinstance(ends, list) else [ends] * len(paths)
+        )
+        if len(set(paths)) != 1:
+            return [
+                self.cat_file(path, start, end)
+                for path, start, end in zip(
+                    paths, range_starts, range_ends, strict=True
+                )
+            ]
+        path = paths[0]
+        ranges = [
+            self._get_range(path, start, end)
+            for start, end in zip(range_starts, range_ends, strict=True)
+        ]
+        return self._block_cache.read_ranges(path, ranges)
+
+    def close(self) -> None:
+        """Stop fetching blocks and remove blocks spilled to disk."""
+        self._block_cache.close()
+
+    def _open(
+        self,
+        path: str,
+        mode: str = "rb",
+        block_size: int | None = None,
+        autocommit: bool = True,
+        cache_options: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> BlockCachedFile:
+        if mode != "rb":
+            raise NotImplementedError(f"{type(self).__name__} is read-only.")
+        return BlockCachedFile(self, path, self._block_cache)
+
+    def _get_range(
+        self, path: str, start: int | None, end: int | None
+    ) -> tuple[int, int]:
+        """Return start and end of range, resolving None and negative offsets."""
+        size = self._block_cache.size(path)
+        start = 0 if start is None else start
+        end = size if end is None else end
+        if start < 0:
+            start += size
+        if end < 0:
+            end += size
+        return start, end
+
+
+register_implementation(BlockCacheFileSystem.protocol, BlockCacheFileSystem)
+
+
+def get_block_cached_path(
+    filepath: UPath, file_options: dict[str, Any] | None
+) -> tuple[str | UPath, dict[str, Any] | None]:
+    """Return path and options to open a file with through a block cache, for
+    readers taking a fsspec url and filesystem options.
+
+    Local files, and all files if `Settings.remote_block_cache_size` is 0, are
+    returned unchanged.
+
+    Parameters
+    ----------
+    filepath: UPath
+        Path to the file, on any filesystem.
+    file_options: dict[str, Any] | None
+        Options for the fsspec filesystem of the file.
+
+    Returns
+    ----------
+    tuple[str | UPath, dict[str, Any] | None]
+        Path and filesystem options to open the file with.
+    """
+    if (
+        as_local_path(filepath) is not None
+        or get_settings().remote_block_cache_size <= 0
+    ):
+        return filepath, file_options
+    filepath = as_upath(filepath, file_options)
+    return f"{BlockCacheFileSystem.protocol}://{filepath.path}", {
+        "target_protocol": filepath.protocol,
+        "target_options": dict(filepath.storage_options),
+    }
@@ -15,10 +15,15 @@
 """Image data for opentile compatible file."""
 
 import dataclasses
-from collections.abc import Iterable, Iterator
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Executor
+from threading import Lock
+from typing import TypeVar
 
 import numpy as np
-from opentile.jpeg import JpegInfo, JpegProcess
+from opentile.jpeg import Jpeg, JpegCropError, JpegInfo, JpegProcess
 from opentile.jpeg2000 import Jpeg2000Info
 from opentile.tiff_image import (
     AssociatedTiffImage,
@@ -33,7 +38,64 @@ from wsidicom.geometry import Point, Size, SizeMm
 from wsidicom.metadata import Image as ImageMetadata
 from wsidicom.metadata import ImageCoordinateSystem, LossyCompression
 
+from wsidicomizer.config import get_settings
 from wsidicomizer.image_data import BaseDicomizerImageData
+from wsidicomizer.sources.opentile.tile_composer import TileComposer
+from wsidicomizer.sources.opentile.tile_passthrough import (
+    ByteRangeReader,
+    TilePassthrough,
+)
+
+TranscodedType = TypeVar("TranscodedType")
+
+
+class TranscodingStatistics:
+    """Thread-safe count of transcoded tiles and the time spent transcoding them,
+    measured from the start of the first batch to the end of the last, so that
+    batches transcoded concurrently are not counted twice."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._tiles = 0
+        self._start: float | None = None
+        self._end: float | None = None
+
+    @property
+    def tiles(self) -> int:
+        """Number of transcoded tiles."""
+        return self._tiles
+
+    @property
+    def seconds(self) -> float:
+        """Seconds from the start of the first batch to the end of the last."""
+        if self._start is None or self._end is None:
+            return 0.0
+        return self._end - self._start
+
+    @property
+    def tiles_per_second(self) -> float | None:
+        """Transcoded tiles per second, or None if no tiles have been
+        transcoded."""
+        if self.seconds == 0:
+            return None
+        return self.tiles / self.seconds
+
+    def add(self, tiles: int, start: float, end: float) -> None:
+        """Add a batch of transcoded tiles.
+
+        Parameters
+        ----------
+        tiles: int
+            Number of tiles in batch.
+        start: float
+            Performance counter time at start of batch.
+        end: float
+            Performance counter time at end of batch.
+        """
+        with self._lock:
+            self._tiles += tiles
+            self._start = start if self._start is None else min(self._start, start)
+            self._end = end if self._end is None else max(self._end, end)
 
 
 class OpenTileImageData(BaseDicomizerImageData):
@@ -42,6 +104,9 @@ class OpenTileImageData(BaseDicomizerImageData):
         tiff_image: TiffImage,
         encoder: Encoder,
         force_transcoding: bool = False,
+        byte_range_reader: ByteRangeReader | None = None,
+        transcoding_executor: Executor | None = None,
+        transcoding_chunk_size: int = 1,
     ):
         """Wraps a TiffImage to ImageData.
 
@@ -53,9 +118,21 @@ class OpenTileImageData(BaseDicomizerImageData):
             Encoder to use.
         force_transcoding: bool
             Force transcoding of image data.
+        byte_range_reader: ByteRangeReader | None = None
+            Reader for reading passed through tiles by byte range, if supported
+            by the image. If None, tiles are read with opentile.
+        transcoding_executor: Executor | None = None
+            Executor for decoding and encoding the tiles of a batch in parallel
+            if transcoding. If None, the tiles are transcoded one by one.
+        transcoding_chunk_size: int = 1
+            Suggested minimum number of tiles in a batch if transcoding, e.g.
+            the number of workers of the executor.
         """
         super().__init__(encoder)
         self._tiff_image = tiff_image
+        self._transcoding_executor = transcoding_executor
+        self._transcoding_chunk_size = transcoding_chunk_size
+        self._transcoding_statistics = TranscodingStatistics()
 
         self._needs_transcoding = (
             not self.is_supported_transfer_syntax() or force_transcoding
@@ -64,6 +141,11 @@ class OpenTileImageData(BaseDicomizerImageData):
             self._transfer_syntax = self.encoder.transfer_syntax
         else:
             self._transfer_syntax = self.get_transfer_syntax()
+        self._tile_passthrough = None
+        if not self.needs_transcoding and byte_range_reader is not None:
+            self._tile_passthrough = TilePassthrough.create(
+                tiff_image, byte_range_reader
+            )
         self._image_size = Size(*self._tiff_image.image_size.to_tuple())
         self._tile_size = Size(*self._tiff_image.tile_size.to_tuple())
         self._tiled_size = Size(*self._tiff_image.tiled_size.to_tuple())
@@ -113,8 +195,17 @@ class OpenTileImageData(BaseDicomizerImageData):
     @property
     def suggested_minimum_chunk_size(self) -> int:
         """Return suggested minimum chunk size for optimal performance with
-        get_encoded_tiles()."""
-        return self._tiff_image.suggested_minimum_chunk_size
+        get_encoded_tiles(). If transcoding, a chunk should be large enough to be
+        transcoded in parallel."""
+        chunk_size = self._tiff_image.suggested_minimum_chunk_size
+        if self.needs_transcoding:
+            return max(chunk_size, self._transcoding_chunk_size)
+        return chunk_size
+
+    @property
+    def transcoding_statistics(self) -> "TranscodingStatistics":
+        """Statistics of the tiles transcoded."""
+        return self._transcoding_statistics
 
     @property
     def photometric_interpretation(self) -> str:
@@ -193,8 +284,7 @@ class OpenTileImageData(BaseDicomizerImageData):
         if z not in self.focal_planes or path not in self.optical_paths:
             raise ValueError("Requested focal plane or optical path not available.")
         if self.needs_transcoding:
-            decoded_tile = self._tiff_image.get_decoded_tile(tile.to_tuple())
-            return self.encoder.encode(decoded_tile)
+            return self._get_transcoded_tile(tile.to_tuple())
         return self._tiff_image.get_tile(tile.to_tuple())
 
     def get_decoded_tile(
@@ -207,7 +297,7 @@ class OpenTileImageData(BaseDicomizerImageData):
         """Return the pixels of a tile, as opentile produces it."""
         if z not in self.focal_planes or path not in self.optical_paths:
             raise ValueError
-        return self._tiff_image.get_decoded_tile(tile_point.to_tuple())
+        return self._get_decoded_tile(tile_point.to_tuple())
 
     def get_decoded_tiles(
         self,
@@ -219,20 +309,43 @@ class OpenTileImageData(BaseDicomizerImageData):
         """Return the pixels for multiple tiles, batched by opentile."""
         if z not in self.focal_planes or path not in self.optical_paths:
             raise ValueError
-        return iter(
-            self._tiff_image.get_decoded_tiles([tile.to_tuple() for tile in tiles])
-        )
+        tiles_tuples = [tile.to_tuple() for tile in tiles]
+        if not self.needs_transcoding:
+            return iter(self._tiff_image.get_decoded_tiles(tiles_tuples))
+        return iter(self._transcode(self._get_decoded_tile, tiles_tuples))
 
     def get_encoded_tiles(
         self, tiles: Iterable[Point], z: float, path: str
     ) -> Iterator[bytes]:
         if z not in self.focal_planes or path not in self.optical_paths:
             raise ValueError
+        if self._tile_passthrough is not None:
+            return iter(self._tile_passthrough.get_tiles(list(tiles)))
         tiles_tuples = [tile.to_tuple() for tile in tiles]
         if not self.needs_transcoding:
             return self._tiff_image.get_tiles(tiles_tuples)
-        decoded_tiles = self._tiff_image.get_decoded_tiles(tiles_tuples)
-        return (self.encoder.encode(tile) for tile in decoded_tiles)
+        return iter(self._transcode(self._get_transcoded_tile, tiles_tuples))
+
+    def _get_decoded_tile(self, tile: tuple[int, int]) -> np.ndarray:
+        return self._tiff_image.get_decoded_tile(tile)
+
+    def _get_transcoded_tile(self, tile: tuple[int, int]) -> bytes:
+        return self.encoder.encode(self._get_decoded_tile(tile))
+
+    def _transcode(
+        self,
+        function: Callable[[tuple[int, int]], TranscodedType],
+        tiles: Sequence[tuple[int, int]],
+    ) -> list[TranscodedType]:
+        """Run function for each tile, in parallel if an executor is set, and
+        record the tiles in the statistics."""
+        start = time.perf_counter()
+        if self._transcoding_executor is None or len(tiles) == 1:
+            result = [function(tile) for tile in tiles]
+        else:
+            result = list(self._transcoding_executor.map(function, tiles))
+        self._transcoding_statistics.add(len(tiles), start, time.perf_counter())
+        return result
 
     def is_supported_transfer_syntax(self) -> bool:
         """Return true if image data is encoded with Dicom-supported transfer
@@ -278,8 +391,18 @@ class OpenTileLevelImageData(OpenTileImageData):
         encoder: Encoder,
         imaged_size: SizeMm,
         force_transcoding: bool = False,
+        byte_range_reader: ByteRangeReader | None = None,
+        transcoding_executor: Executor | None = None,
+        transcoding_chunk_size: int = 1,
     ):
-        super().__init__(tiff_image, encoder, force_transcoding)
+        super().__init__(
+            tiff_image,
+            encoder,
+            force_transcoding,
+            byte_range_reader,
+            transcoding_executor,
+            transcoding_chunk_size,
+        )
         if (
             merged_metadata.pixel_spacing is not None
             and merged_metadata.pixel_spacing != image_metadata.pixel_spacing
@@ -326,6 +449,185 @@ class OpenTileLevelImageData(OpenTileImageData):
         return [self._tiff_image.optical_path]
 
 
+class OpenTileComposedLevelImageData(OpenTileLevelImageData):
+    """Level image data for levels whose stored tiles do not form a regular tile
+    grid, e.g. as they overlap their neighbours (Ventana, Trestle). If the stored
+    tiles do form the regular grid, tiles are used as stored. Otherwise the tiles
+    of the regular grid are composed from the stored tiles and transcoded.
+
+    When composing from baseline JPEG tiles into baseline JPEG with the same
+    photometric interpretation, a composed tile that lies within a single stored
+    tile, starting on its MCU grid, is instead cropped losslessly from the stored
+    tile in the DCT domain."""
+
+    def __init__(
+        self,
+        tiff_image: LevelTiffImage,
+        image_metadata: ImageMetadata,
+        merged_metadata: ImageMetadata,
+        encoder: Encoder,
+        imaged_size: SizeMm,
+        tile_size: int,
+        force_transcoding: bool = False,
+        byte_range_reader: ByteRangeReader | None = None,
+        transcoding_executor: Executor | None = None,
+        transcoding_chunk_size: int = 1,
+    ):
+        """
+        Parameters
+        ----------
+        tiff_image: LevelTiffImage
+            Level to wrap, with an overlap describing the placement of the stored
+            tiles.
+        image_metadata: ImageMetadata
+            Image metadata read from the file.
+        merged_metadata: ImageMetadata
+            Image metadata merged with user-specified metadata.
+        encoder: Encoder
+            Encoder to use.
+        imaged_size: SizeMm
+            Imaged size of the base level.
+        tile_size: int
+            Size of tiles to compose, if the stored tiles do not form a regular
+            tile grid.
+        force_transcoding: bool = False
+            Force transcoding of image data.
+        byte_range_reader: ByteRangeReader | None = None
+            Reader for reading passed through tiles by byte range.
+        transcoding_executor: Executor | None = None
+            Executor for composing and encoding the tiles of a batch in parallel.
+        transcoding_chunk_size: int = 1
+            Suggested minimum number of tiles in a batch if transcoding.
+        """
+        overlap = tiff_image.overlap
+        if overlap is None:
+            raise ValueError("Level has no overlap to compose tiles from.")
+        stored_tile_size = Size(*tiff_image.tile_size.to_tuple())
+        self._composer = TileComposer(
+            overlap,
+            stored_tile_size,
+            tiff_image.samples_per_pixel,
+            self._decode_stored_tile,
+        )
+        self._compose = not self._composer.is_stored_grid(stored_tile_size)
+        if self._compose:
+            self._composer = TileComposer(
+                overlap,
+                Size(tile_size, tile_size),
+                tiff_image.samples_per_pixel,
+                self._decode_stored_tile,
+            )
+        super().__init__(
+            tiff_image,
+            image_metadata,
+            merged_metadata,
+            encoder,
+            imaged_size,
+            force_transcoding or self._compose,
+            byte_range_reader,
+            transcoding_executor,
+            transcoding_chunk_size,
+        )
+        # Stored tiles outside the composed image are not used.
+        self._image_size = self._composer.image_size
+        self._tile_size = self._composer.tile_size
+        self._tiled_size = self._composer.tiled_size
+        self._stored_tile_size = stored_tile_size
+        self._jpeg = self._create_cropping_jpeg(force_transcoding)
+
+    @property
+    def suggested_minimum_chunk_size(self) -> int:
+        """If composing, a chunk should span a row of composed tiles, so that the
+        stored tiles they share are decoded once while cached."""
+        if not self._compose:
+            return super().suggested_minimum_chunk_size
+        return max(self.tiled_size.width, self._transcoding_chunk_size)
+
+    @property
+    def transcoder(self) -> Encoder | None:
+        """Return None if composed tiles are cropped losslessly, as the encoded
+        tiles are then already in the transfer syntax of the encoder."""
+        if self._jpeg is not None:
+            return None
+        return super().transcoder
+
+    def _get_decoded_tile(self, tile: tuple[int, int]) -> np.ndarray:
+        if not self._compose:
+            return super()._get_decoded_tile(tile)
+        return self._composer.get_tile(Point(*tile))
+
+    def _decode_stored_tile(self, tile: Point) -> np.ndarray:
+        return self._tiff_image.get_decoded_tile(tile.to_tuple())
+
+    def _get_transcoded_tile(self, tile: tuple[int, int]) -> bytes:
+        if self._jpeg is not None:
+            cropped = self._crop_tile(Point(*tile))
+            if cropped is not None:
+                return cropped
+        return super()._get_transcoded_tile(tile)
+
+    def _crop_tile(self, tile: Point) -> bytes | None:
+        """Return composed tile losslessly cropped from a stored tile, or None if
+        the composed tile is not aligned with the MCU grid of a single stored
+        tile."""
+        assert self._jpeg is not None
+        piece = self._composer.get_aligned_piece(
+            tile, self._get_mcu_size(), self._stored_tile_size
+        )
+        if piece is None:
+            return None
+        frame = self._tiff_image.get_tile(piece.tile.to_tuple())
+        try:
+            return self._jpeg.crop_multiple(
+                frame,
+                [(*piece.source.start.to_tuple(), *piece.source.size.to_tuple())],
+            )[0]
+        except JpegCropError:
+            logging.debug(f"Failed to crop tile {tile} of {self}, transcoding.")
+            return None
+
+    def _get_mcu_size(self) -> Size:
+        """Return the MCU size of the stored JPEG tiles."""
+        subsampling = self._tiff_image.subsampling
+        if subsampling is None:
+            return Size(8, 8)
+        return Size(8 * subsampling[0], 8 * subsampling[1])
+
+    def _create_cropping_jpeg(self, force_transcoding: bool) -> Jpeg | None:
+        """Return Jpeg for losslessly cropping composed tiles from the stored
+        tiles, or None if the composed tiles can not be cropped and must be
+        transcoded."""
+        if (
+            not self._compose
+            or force_transcoding
+            or not get_settings().lossless_jpeg_cropping
+        ):
+            return None
+        info = self._tiff_image.encoded_info
+        if (
+            not isinstance(info, JpegInfo)
+            or info.process != JpegProcess.BASELINE
+            or info.bit_depth != 8
+            or info.rgb_signalled
+        ):
+            return None
+        # Cropped and transcoded tiles of the level must have the same
+        # subsampling, given by the photometric interpretation.
+        if (
+            self.encoder.transfer_syntax != JPEGBaseline8Bit
+            or self.encoder.photometric_interpretation
+            != self._get_jpeg_photometric_interpretation(info)
+        ):
+            return None
+        try:
+            return Jpeg()
+        except (FileNotFoundError, OSError):
+            logging.debug(
+                f"Turbojpeg not available, composed tiles of {self} are transcoded."
+            )
+            return None
+
+
 class OpenTileAssociatedImageData(OpenTileImageData):
     def __init__(
         self,
@@ -14,28 +14,38 @@
 
 """Source for reading opentile compatible file."""
 
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 from opentile import OpenTile
+from opentile.tiler import Pyramid
 from pydicom import Dataset
 from upath import UPath
 from wsidicom.codec import Encoder
 from wsidicom.codec.settings import Channels
-from wsidicom.geometry import Size, SizeMm
-from wsidicom.metadata import UidGenerator
+from wsidicom.geometry import PointMm, Size, SizeMm
+from wsidicom.instance import WsiInstance
+from wsidicom.metadata import ImageCoordinateSystem, ImageType, UidGenerator
 from wsidicom.metadata.wsi import WsiMetadata
 
 from wsidicomizer.config import get_settings
 from wsidicomizer.dicomizer_source import DicomizerSource
 from wsidicomizer.image_data import BaseDicomizerImageData
 from wsidicomizer.metadata import MetadataPostProcessor, MetadataPreProcessor
+from wsidicomizer.sources.opentile.block_cache import get_block_cached_path
 from wsidicomizer.sources.opentile.opentile_image_data import (
     OpenTileAssociatedImageData,
+    OpenTileComposedLevelImageData,
+    OpenTileImageData,
     OpenTileLevelImageData,
 )
 from wsidicomizer.sources.opentile.opentile_metadata import OpenTileMetadata
+from wsidicomizer.sources.opentile.tile_passthrough import create_byte_range_reader
 from wsidicomizer.wsi_format import WsiFormat
 
 
@@ -66,7 +76,8 @@ class OpenTileSource(DicomizerSource):
         tile_size: int | None = None
             Preferred tile size to use, if not enforced by file. Falls back to
             `get_settings().default_tile_size` if `None`. Only has effect for NDPI
-            files where it controls how stripes are subdivided.
+            files where it controls how stripes are subdivided, and for levels
+            composed from overlapping tiles (e.g. Ventana, Trestle).
         metadata: Optional[WsiMetadata] = None
             User-specified metadata that will overload metadata from source image file.
         default_metadata: Optional[WsiMetadata] = None
@@ -90,7 +101,17 @@ class OpenTileSource(DicomizerSource):
         """
         if tile_size is None:
             tile_size = get_settings().default_tile_size
-        self._tiler = OpenTile.open(filepath, tile_size, file_options=file_options)
+        cached_filepath, cached_file_options = get_block_cached_path(
+            filepath, file_options
+        )
+        self._tiler = OpenTile.open(
+            cached_filepath, tile_size, file_options=cached_file_options
+        )
+        self._byte_range_reader = create_byte_range_reader(filepath, file_options)
+        self._transcoding_workers = (
+            get_settings().transcoding_workers or os.cpu_count() or 1
+        )
+        self._transcoding_executor = ThreadPoolExecutor(self._transcoding_workers)
         format_name = self._tiler.format.name
         try:
             self._wsi_format = WsiFormat[format_name]
@@ -119,7 +140,27 @@ class OpenTileSource(DicomizerSource):
         )
 
     def close(self):
+        self._log_transcoding_statistics()
         self._tiler.close()
+        self._byte_range_reader.close()
+        self._transcoding_executor.shutdown()
+
+    def _log_transcoding_statistics(self) -> None:
+        """Log the throughput of each level that has transcoded tiles."""
+        if "level_instances" not in self.__dict__:
+            return
+        for instance in self.level_instances:
+            image_data = instance.image_data
+            if not isinstance(image_data, OpenTileImageData):
+                continue
+            statistics = image_data.transcoding_statistics
+            if statistics.tiles_per_second is None:
+                continue
+            logging.info(
+                f"Transcoded {statistics.tiles} tiles of {image_data} in "
+                f"{statistics.seconds:.2f} s ({statistics.tiles_per_second:.1f} "
+                "tiles/s)."
+            )
 
     @property
     def _pixel_format(self) -> tuple[Channels, int]:
@@ -132,17 +173,47 @@ class OpenTileSource(DicomizerSource):
 
     @property
     def pyramid_levels(self) -> dict[tuple[int, float, str], int]:
-        pyramid_count = len(self._tiler.pyramids)
-        if pyramid_count > 1:
-            raise NotImplementedError(
-                f"File holds {pyramid_count} pyramids (e.g. several ROIs); only one is "
-                "supported."
-            )
+        """Levels of the first pyramid. See `level_instances` for how multiple
+        pyramids are handled."""
         return {
             (level.pyramid_index, level.focal_plane, level.optical_path): index
             for index, level in enumerate(self._tiler.levels)
         }
 
+    @cached_property
+    def level_instances(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self,
+    ) -> list[WsiInstance]:
+        """Return the level instances of each pyramid in the file. Each pyramid
+        (e.g. a ROI) is placed at its own position on the slide and is thus opened
+        as a separate pyramid. If the positions of the pyramids are not recorded,
+        only the first pyramid is opened."""
+        if not self._has_placed_pyramids:
+            return super().level_instances
+        return [
+            self._create_instance(
+                self._create_pyramid_level_image_data(pyramid_index, level_index),
+                ImageType.VOLUME,
+                level.pyramid_index,
+            )
+            for pyramid_index, pyramid in enumerate(self._tiler.pyramids)
+            for level_index, level in enumerate(pyramid.levels)
+        ]
+
+    @cached_property
+    def _has_placed_pyramids(self) -> bool:
+        """Return True if the file holds several pyramids with recorded positions
+        on the slide."""
+        if len(self._tiler.pyramids) <= 1:
+            return False
+        if any(pyramid.position is None for pyramid in self._tiler.pyramids):
+            logging.warning(
+                "File holds several pyramids (e.g. several ROIs) without recorded "
+                "positions on the slide, only the first pyramid is opened."
+            )
+            return False
+        return True
+
     @property
     def has_label(self) -> bool:
         return len(self._tiler.labels) > 0
@@ -155,22 +226,95 @@ class OpenTileSource(DicomizerSource):
     def is_supported(
         path: str | Path | UPath, file_options: dict[str, Any] | None = None
     ) -> bool:
-        """Return True if file in path is supported by OpenTile. Formats whose tiles
-        overlap (e.g. Trestle, Ventana) are not composed by this source yet and are
-        left for another source to handle."""
-        if OpenTile.detect_format(path, file_options) is None:
-            return False
-        with OpenTile.open(path, file_options=file_options) as tiler:
-            return tiler.get_level(0).overlap is None
+        """Return True if file in path is supported by OpenTile."""
+        return OpenTile.detect_format(path, file_options) is not None
 
     def _create_level_image_data(self, level_index: int) -> BaseDicomizerImageData:
+        return self._create_pyramid_level_image_data(0, level_index)
+
+    def _create_pyramid_level_image_data(
+        self, pyramid_index: int, level_index: int
+    ) -> OpenTileLevelImageData:
+        pyramid = self._tiler.pyramids[pyramid_index]
+        level = pyramid.levels[level_index]
+        merged_metadata = self.metadata.pyramid.image
+        if self._has_placed_pyramids:
+            merged_metadata = replace(
+                merged_metadata,
+                image_coordinate_system=self._get_pyramid_image_coordinate_system(
+                    merged_metadata.image_coordinate_system,
+                    self._tiler.pyramids[0],
+                    pyramid,
+                ),
+            )
+        if level.overlap is not None:
+            tile_size = self._tile_size or level.tile_size.width
+            return OpenTileComposedLevelImageData(
+                level,
+                self.base_metadata.pyramid.image,
+                merged_metadata,
+                self._encoder,
+                self._get_imaged_size(pyramid),
+                tile_size,
+                self._force_transcoding,
+                self._byte_range_reader,
+                self._transcoding_executor,
+                self._transcoding_workers,
+            )
         return OpenTileLevelImageData(
-            self._tiler.levels[level_index],
+            level,
             self.base_metadata.pyramid.image,
-            self.metadata.pyramid.image,
+            merged_metadata,
             self._encoder,
-            self._volume_imaged_size,
+            self._get_imaged_size(pyramid),
             self._force_transcoding,
+            self._byte_range_reader,
+            self._transcoding_executor,
+            self._transcoding_workers,
+        )
+
+    @staticmethod
+    def _get_pyramid_image_coordinate_system(
+        image_coordinate_system: ImageCoordinateSystem | None,
+        first_pyramid: Pyramid,
+        pyramid: Pyramid,
+    ) -> ImageCoordinateSystem:
+        """Return image coordinate system with origin moved to the position of the
+        pyramid, so that each pyramid is placed where it is on the slide. The
+        positions of the pyramids are offsets along the image axes.
+
+        Parameters
+        ----------
+        image_coordinate_system: ImageCoordinateSystem | None
+            Image coordinate system of the first pyramid. If None, the first
+            pyramid is placed at its position without rotation.
+        first_pyramid: Pyramid
+            First pyramid in the file.
+        pyramid: Pyramid
+            Pyramid to get image coordinate system for.
+
+        Returns
+        ----------
+        ImageCoordinateSystem
+            Image coordinate system of the pyramid.
+        """
+        if first_pyramid.position is None or pyramid.position is None:
+            raise ValueError("Pyramids without recorded positions can not be placed.")
+        first_position = PointMm(first_pyramid.position.x, first_pyramid.position.y)
+        position = PointMm(pyramid.position.x, pyramid.position.y)
+        if image_coordinate_system is None:
+            # Place the image the positions are offsets in without rotation.
+            image_coordinate_system = ImageCoordinateSystem(
+                origin=PointMm(0, 0), rotation=0
+            )
+            image_coordinate_system = replace(
+                image_coordinate_system,
+                origin=image_coordinate_system.image_to_slide(first_position),
+            )
+        offset = position - first_position
+        return replace(
+            image_coordinate_system,
+            origin=image_coordinate_system.image_to_slide(offset),
         )
 
     def _create_label_image_data(self) -> BaseDicomizerImageData | None:
@@ -214,12 +358,24 @@ class OpenTileSource(DicomizerSource):
             self._encoder,
             self._volume_imaged_size,
             self._force_transcoding,
+            transcoding_executor=self._transcoding_executor,
+            transcoding_chunk_size=self._transcoding_workers,
         )
 
     @cached_property
     def _volume_imaged_size(self):
         """Return the imaged size of the volume."""
-        base_level = self._tiler.levels[0]
+        return self._get_imaged_size(self._tiler.pyramids[0])
+
+    @staticmethod
+    def _get_imaged_size(pyramid: Pyramid) -> SizeMm:
+        """Return the imaged size of the base level of the pyramid. For levels with
+        overlapping tiles, the size of the composed level is used."""
+        base_level = pyramid.levels[0]
+        if base_level.overlap is not None:
+            image_size = base_level.overlap.image_size
+        else:
+            image_size = base_level.image_size
         return SizeMm(*base_level.pixel_spacing.to_tuple()) * Size(
-            *base_level.image_size.to_tuple()
+            *image_size.to_tuple()
         )
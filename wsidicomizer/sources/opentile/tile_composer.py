@@ -0,0 +1,272 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Composition of overlapping stored tiles into a regular tile grid."""
+
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from opentile.tile_overlap import TileOverlap
+from wsidicom.cache import lru_cached_method
+from wsidicom.geometry import Point, Region, Size
+
+from wsidicomizer.config import get_settings
+
+
+@dataclass(frozen=True)
+class ComposedPiece:
+    """A region of a stored tile placed in a composed tile.
+
+    Parameters
+    ----------
+    tile: Point
+        Position of the stored tile in the stored tile grid.
+    source: Region
+        Region within the decoded stored tile to place.
+    target: Point
+        Position within the composed tile to place the region at.
+    """
+
+    tile: Point
+    source: Region
+    target: Point
+
+
+class TileComposer:
+    """Composes tiles of a regular grid from stored tiles that overlap their
+    neighbours, or that are stored in a different tiling, as described by an
+    opentile `TileOverlap`.
+
+    The pieces covering each composed tile are computed once. Stored tiles are
+    decoded once and cached, as a stored tile is typically cropped into several
+    composed tiles. Where stored tiles overlap, pieces placed later are painted
+    over pieces placed earlier. Parts of a composed tile not covered by any
+    stored tile are white.
+    """
+
+    def __init__(
+        self,
+        overlap: TileOverlap,
+        tile_size: Size,
+        samples_per_pixel: int,
+        decode: Callable[[Point], np.ndarray],
+    ):
+        """
+        Parameters
+        ----------
+        overlap: TileOverlap
+            Placement of the stored tiles.
+        tile_size: Size
+            Size of composed tiles.
+        samples_per_pixel: int
+            Samples per pixel of the stored tiles.
+        decode: Callable[[Point], np.ndarray]
+            Function decoding the stored tile at a stored tile position.
+        """
+        self._image_size = Size(overlap.image_size.width, overlap.image_size.height)
+        self._tile_size = tile_size
+        self._samples_per_pixel = samples_per_pixel
+        self._decode = decode
+        self._pieces = self._create_pieces(overlap)
+
+    @property
+    def image_size(self) -> Size:
+        """Size of the composed image."""
+        return self._image_size
+
+    @property
+    def tile_size(self) -> Size:
+        """Size of composed tiles."""
+        return self._tile_size
+
+    @property
+    def tiled_size(self) -> Size:
+        """Number of composed tiles."""
+        return self._image_size.ceil_div(self._tile_size)
+
+    def is_stored_grid(self, stored_tile_size: Size) -> bool:
+        """Return True if every composed tile is the stored tile at the same
+        position, so that stored tiles can be used as they are.
+
+        Parameters
+        ----------
+        stored_tile_size: Size
+            Size of the stored tiles.
+        """
+        if stored_tile_size != self._tile_size:
+            return False
+        for tile in Region(Point(0, 0), self.tiled_size).iterate_all():
+            covered = self._get_covered_size(tile)
+            if self._pieces.get(tile) != [
+                ComposedPiece(tile, Region(Point(0, 0), covered), Point(0, 0))
+            ]:
+                return False
+        return True
+
+    def get_aligned_piece(
+        self, tile: Point, alignment: Size, stored_tile_size: Size
+    ) -> ComposedPiece | None:
+        """Return the piece of a single stored tile that the composed tile can be
+        cropped from, or None if there is none.
+
+        The composed tile must be covered by one piece only, the piece must start
+        on the alignment grid of the stored tile, and a full composed tile from
+        the start of the piece must fit within the stored tile. The returned
+        piece has the size of a full composed tile.
+
+        Parameters
+        ----------
+        tile: Point
+            Position of the composed tile.
+        alignment: Size
+            Grid the piece must start on, e.g. the JPEG MCU size.
+        stored_tile_size: Size
+            Size of the stored tiles.
+
+        Returns
+        ----------
+        ComposedPiece | None
+            The piece to crop, or None if the composed tile can not be cropped
+            from a single stored tile.
+        """
+        pieces = self._pieces.get(tile, [])
+        if len(pieces) != 1:
+            return None
+        piece = pieces[0]
+        start = piece.source.start
+        end = start + self._tile_size
+        if (
+            piece.target != Point(0, 0)
+            or piece.source.size != self._get_covered_size(tile)
+            or start.x % alignment.width != 0
+            or start.y % alignment.height != 0
+            or end.x > stored_tile_size.width
+            or end.y > stored_tile_size.height
+        ):
+            return None
+        return ComposedPiece(piece.tile, Region(start, self._tile_size), piece.target)
+
+    def get_tile(self, tile: Point) -> np.ndarray:
+        """Return the composed tile at tile position.
+
+        Parameters
+        ----------
+        tile: Point
+            Position of the composed tile.
+
+        Returns
+        ----------
+        np.ndarray
+            The composed tile.
+        """
+        composed: np.ndarray | None = None
+        for piece in self._pieces.get(tile, []):
+            stored = self._get_stored_tile(piece.tile)
+            if stored.ndim == 2:
+                stored = stored[:, :, np.newaxis]
+            if composed is None:
+                composed = self._create_blank_tile(stored.dtype)
+            # Crop the piece to the decoded tile, in case it is not padded.
+            width = min(piece.source.size.width, stored.shape[1] - piece.source.start.x)
+            height = min(
+                piece.source.size.height, stored.shape[0] - piece.source.start.y
+            )
+            composed[
+                piece.target.y : piece.target.y + height,
+                piece.target.x : piece.target.x + width,
+            ] = stored[
+                piece.source.start.y : piece.source.start.y + height,
+                piece.source.start.x : piece.source.start.x + width,
+            ]
+        if composed is None:
+            composed = self._create_blank_tile(np.dtype(np.uint8))
+        if self._samples_per_pixel == 1:
+            return composed[:, :, 0]
+        return composed
+
+    @lru_cached_method(maxsize=lambda: get_settings().overlap_tile_cache_size)
+    def _get_stored_tile(self, tile: Point) -> np.ndarray:
+        return self._decode(tile)
+
+    def _create_pieces(self, overlap: TileOverlap) -> dict[Point, list[ComposedPiece]]:
+        """Return the pieces covering each composed tile, in placement order."""
+        image = Region(Point(0, 0), self._image_size)
+        pieces: dict[Point, list[ComposedPiece]] = defaultdict(list)
+        for stored_tile, placements in overlap.placements.items():
+            stored_tile = Point(stored_tile.x, stored_tile.y)
+            for placement in placements:
+                # Positions are sub-pixel, place at the nearest pixel.
+                position = Point(
+                    int(np.floor(placement.position.x + 0.5)),
+                    int(np.floor(placement.position.y + 0.5)),
+                )
+                placed = Region(
+                    position,
+                    Size(placement.source.size.width, placement.source.size.height),
+                )
+                start = Point(
+                    max(placed.start.x, image.start.x),
+                    max(placed.start.y, image.start.y),
+                )
+                end = Point(
+                    min(placed.end.x, image.end.x), min(placed.end.y, image.end.y)
+                )
+                if end.x <= start.x or end.y <= start.y:
+                    continue
+                for tile in Region.from_points(
+                    start // self._tile_size, (end - 1) // self._tile_size + 1
+                ).iterate_all():
+                    tile_start = tile * self._tile_size
+                    piece_start = Point(
+                        max(start.x, tile_start.x), max(start.y, tile_start.y)
+                    )
+                    piece_end = Point(
+                        min(end.x, tile_start.x + self._tile_size.width),
+                        min(end.y, tile_start.y + self._tile_size.height),
+                    )
+                    source_start = Point(
+                        placement.source.start.x + piece_start.x - position.x,
+                        placement.source.start.y + piece_start.y - position.y,
+                    )
+                    pieces[tile].append(
+                        ComposedPiece(
+                            stored_tile,
+                            Region(
+                                source_start,
+                                Size(
+                                    piece_end.x - piece_start.x,
+                                    piece_end.y - piece_start.y,
+                                ),
+                            ),
+                            piece_start - tile_start,
+                        )
+                    )
+        return dict(pieces)
+
+    def _get_covered_size(self, tile: Point) -> Size:
+        """Return the size of the part of the composed tile inside the image."""
+        tile_start = tile * self._tile_size
+        return Size(
+            min(self._tile_size.width, self._image_size.width - tile_start.x),
+            min(self._tile_size.height, self._image_size.height - tile_start.y),
+        )
+
+    def _create_blank_tile(self, dtype: np.dtype) -> np.ndarray:
+        return np.full(
+            (self._tile_size.height, self._tile_size.width, self._samples_per_pixel),
+            np.iinfo(dtype).max if np.issubdtype(dtype, np.integer) else 1,
+            dtype=dtype,
+        )
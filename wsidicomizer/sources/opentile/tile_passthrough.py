@@ -0,0 +1,406 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Passthrough of natively tiled tiff tiles read by byte range."""
+
+import os
+import threading
+from abc import ABCMeta, abstractmethod
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fsspec import AbstractFileSystem
+from opentile.jpeg import Jpeg
+from opentile.tiff_image import TiffImage
+from opentile.tiff_image_bases import BaseTiffImage, NativeTiledTiffImage
+from tifffile import COMPRESSION, PHOTOMETRIC, TiffPage
+from upath import UPath
+from wsidicom.geometry import Point
+from wsidicom.paths import as_local_path, as_upath
+
+from wsidicomizer.config import get_settings
+
+
+@dataclass(frozen=True)
+class ByteRun:
+    """A range of bytes to read in one request, covering one or more frames.
+
+    Parameters
+    ----------
+    start: int
+        Offset of the first byte of the run.
+    end: int
+        Offset after the last byte of the run.
+    indices: list[int]
+        Indices of the frames, in the planned ranges, covered by the run.
+    """
+
+    start: int
+    end: int
+    indices: list[int]
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+def plan_byte_runs(
+    ranges: Sequence[tuple[int, int]], max_gap: int = 0
+) -> list[ByteRun]:
+    """Group frames stored close to each other into runs that can be read with
+    one request each.
+
+    Parameters
+    ----------
+    ranges: Sequence[tuple[int, int]]
+        Offset and length of the frames to read.
+    max_gap: int = 0
+        Largest number of bytes between two frames for them to be read in the
+        same run. The bytes in the gap are read and discarded.
+
+    Returns
+    ----------
+    list[ByteRun]
+        Runs, in offset order, covering all frames.
+    """
+    in_offset_order = sorted(range(len(ranges)), key=lambda index: ranges[index][0])
+    runs: list[ByteRun] = []
+    start = end = 0
+    indices: list[int] = []
+    for index in in_offset_order:
+        offset, length = ranges[index]
+        if indices and end <= offset <= end + max_gap:
+            end = max(end, offset + length)
+            indices.append(index)
+            continue
+        if indices:
+            runs.append(ByteRun(start, end, indices))
+        start, end, indices = offset, offset + length, [index]
+    if indices:
+        runs.append(ByteRun(start, end, indices))
+    return runs
+
+
+class ByteRangeReader(metaclass=ABCMeta):
+    """Reads byte ranges from a file."""
+
+    @property
+    def max_gap(self) -> int:
+        """Largest number of bytes between two frames for them to be read in the
+        same run."""
+        return 0
+
+    @abstractmethod
+    def read_runs(self, runs: Sequence[ByteRun]) -> list[memoryview]:
+        """Return the bytes of each run."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release any resources held by the reader."""
+        raise NotImplementedError()
+
+
+class LocalByteRangeReader(ByteRangeReader):
+    """Reads byte ranges from a local file with positioned reads into a buffer
+    per run, so that frames can be sliced out without copying."""
+
+    def __init__(self, path: Path):
+        self._fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        # Positioned reads do not move a shared file position. Where they are not
+        # available, a lock serializes seek and read.
+        self._lock = None if hasattr(os, "preadv") else threading.Lock()
+
+    def read_runs(self, runs: Sequence[ByteRun]) -> list[memoryview]:
+        return [self._read(run.start, run.length) for run in runs]
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def _read(self, offset: int, length: int) -> memoryview:
+        buffer = memoryview(bytearray(length))
+        read = 0
+        while read < length:
+            count = self._read_into(buffer[read:], offset + read)
+            if count == 0:
+                raise EOFError(
+                    f"Expected {length} bytes at offset {offset}, got {read}."
+                )
+            read += count
+        return buffer
+
+    def _read_into(self, buffer: memoryview, offset: int) -> int:
+        if self._lock is None:
+            return os.preadv(self._fd, [buffer], offset)
+        with self._lock:
+            os.lseek(self._fd, offset, os.SEEK_SET)
+            return os.readv(self._fd, [buffer])
+
+
+class FsspecByteRangeReader(ByteRangeReader):
+    """Reads byte ranges from a file on a fsspec filesystem, one request per
+    run, with a limited number of requests in flight for the file."""
+
+    def __init__(
+        self,
+        fs: AbstractFileSystem,
+        path: str,
+        max_gap: int,
+        max_connections: int,
+    ):
+        """
+        Parameters
+        ----------
+        fs: AbstractFileSystem
+            Filesystem the file is on.
+        path: str
+            Path to the file on the filesystem.
+        max_gap: int
+            Largest number of bytes between two frames for them to be read in
+            the same request.
+        max_connections: int
+            Largest number of requests in flight for the file, shared by all
+            threads reading from it.
+        """
+        self._fs = fs
+        self._path = path
+        self._max_gap = max_gap
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+
+    @property
+    def max_gap(self) -> int:
+        return self._max_gap
+
+    def read_runs(self, runs: Sequence[ByteRun]) -> list[memoryview]:
+        if len(runs) == 1:
+            # Still go through the executor to respect the connection limit.
+            return [self._executor.submit(self._read, runs[0]).result()]
+        return list(self._executor.map(self._read, runs))
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def _read(self, run: ByteRun) -> memoryview:
+        data = self._fs.cat_file(self._path, run.start, run.end)
+        if isinstance(data, Exception):
+            raise data
+        if not isinstance(data, bytes | bytearray):
+            raise TypeError(
+                f"Expected bytes at offset {run.start}, got {type(data).__name__}."
+            )
+        if len(data) != run.length:
+            raise EOFError(
+                f"Expected {run.length} bytes at offset {run.start}, got {len(data)}."
+            )
+        return memoryview(data)
+
+
+def create_byte_range_reader(
+    filepath: UPath, file_options: dict[str, Any] | None
+) -> ByteRangeReader:
+    """Return reader for passing through tiles by byte range, reading local
+    files directly and other files through their fsspec filesystem.
+
+    Parameters
+    ----------
+    filepath: UPath
+        Path to the file, on any filesystem.
+    file_options: dict[str, Any] | None
+        Options for the fsspec filesystem of the file.
+
+    Returns
+    ----------
+    ByteRangeReader
+        Reader for the file.
+    """
+    local_filepath = as_local_path(filepath)
+    if local_filepath is not None and not file_options:
+        return LocalByteRangeReader(local_filepath)
+    settings = get_settings()
+    filepath = as_upath(filepath, file_options)
+    return FsspecByteRangeReader(
+        filepath.fs,
+        filepath.path,
+        settings.remote_read_max_gap,
+        settings.remote_read_max_connections,
+    )
+
+
+class TilePassthrough:
+    """Reads the tiles of a natively tiled tiff image by byte range and returns
+    them as opentile would, but with the frames of a request read in as few reads
+    as possible and each tile copied only once when it is materialized.
+
+    Use `create()`, that only returns an instance for images whose tiles are
+    stored as complete or abbreviated (sharing JPEG tables) frames.
+    """
+
+    def __init__(
+        self,
+        page: TiffPage,
+        tiled_width: int,
+        reader: ByteRangeReader,
+        prefix: bytes | None,
+        scan_offset: int,
+    ):
+        """
+        Parameters
+        ----------
+        page: TiffPage
+            Page holding the tiles.
+        tiled_width: int
+            Number of tiles in a row.
+        reader: ByteRangeReader
+            Reader to read byte ranges with.
+        prefix: bytes | None
+            Header to replace the header of abbreviated frames with, or None if
+            frames are complete.
+        scan_offset: int
+            Offset of scan data in abbreviated frames.
+        """
+        self._offsets = page.dataoffsets
+        self._lengths = page.databytecounts
+        self._tiled_width = tiled_width
+        self._reader = reader
+        self._prefix = prefix
+        self._scan_offset = scan_offset
+
+    @classmethod
+    def create(
+        cls, tiff_image: TiffImage, reader: ByteRangeReader
+    ) -> "TilePassthrough | None":
+        """Return a passthrough for the tiles of the image, or None if the tiles
+        of the image are not read as stored or with JPEG tables added (e.g. ndpi
+        tiles, that are cropped from stripes, or sparse images)."""
+        if (
+            not isinstance(tiff_image, NativeTiledTiffImage)
+            or type(tiff_image).get_tiles is not NativeTiledTiffImage.get_tiles
+            or type(tiff_image)._read_frame is not BaseTiffImage._read_frame
+        ):
+            return None
+        # Opentile does not expose the page with the tile offsets.
+        page = getattr(tiff_image, "_page", None)
+        if (
+            not isinstance(page, TiffPage)
+            or not page.is_tiled
+            or len(page.dataoffsets) != tiff_image.tiled_size.area
+            or any(length == 0 for length in page.databytecounts)
+        ):
+            return None
+        stored = bytes(
+            reader.read_runs(
+                [
+                    ByteRun(
+                        page.dataoffsets[0],
+                        page.dataoffsets[0] + page.databytecounts[0],
+                        [0],
+                    )
+                ]
+            )[0]
+        )
+        tile = tiff_image.get_tile((0, 0))
+        if not page.jpegtables:
+            if stored != tile:
+                return None
+            return cls(page, tiff_image.tiled_size.width, reader, None, 0)
+        # The header opentile puts in front of the scan data is the same for all
+        # tiles of a page, use the one of the first tile.
+        _, scan_offset = Jpeg.calculate_prefix_and_scan_offset(stored, page.jpegtables)
+        scan = stored[scan_offset:]
+        if not tile.endswith(scan):
+            return None
+        prefix = tile[: len(tile) - len(scan)]
+        return cls(page, tiff_image.tiled_size.width, reader, prefix, scan_offset)
+
+    @classmethod
+    def from_page(
+        cls, page: TiffPage, reader: ByteRangeReader
+    ) -> "TilePassthrough | None":
+        """Return a passthrough for the JPEG tiles of a tiff page, with the JPEG
+        tables of the page added to each tile, or None if the page is not tiled
+        with one JPEG tile for each tile position.
+
+        Parameters
+        ----------
+        page: TiffPage
+            Page holding the tiles.
+        reader: ByteRangeReader
+            Reader to read byte ranges with.
+
+        Returns
+        ----------
+        TilePassthrough | None
+            Passthrough for the tiles of the page, or None if not supported.
+        """
+        if not page.is_tiled or page.compression != COMPRESSION.JPEG:
+            return None
+        tiled_width = -(-page.imagewidth // page.tilewidth)
+        tiled_height = -(-page.imagelength // page.tilelength)
+        if len(page.dataoffsets) != tiled_width * tiled_height or any(
+            length == 0 for length in page.databytecounts
+        ):
+            return None
+        if not page.jpegtables:
+            return cls(page, tiled_width, reader, None, 0)
+        stored = bytes(
+            reader.read_runs(
+                [
+                    ByteRun(
+                        page.dataoffsets[0],
+                        page.dataoffsets[0] + page.databytecounts[0],
+                        [0],
+                    )
+                ]
+            )[0]
+        )
+        # Without a color space marker, RGB samples would be read as YCbCr.
+        prefix, scan_offset = Jpeg.calculate_prefix_and_scan_offset(
+            stored, page.jpegtables, page.photometric == PHOTOMETRIC.RGB
+        )
+        return cls(page, tiled_width, reader, prefix, scan_offset)
+
+    def get_tiles(self, tiles: Sequence[Point]) -> list[bytes]:
+        """Return the tiles at the tile positions.
+
+        Parameters
+        ----------
+        tiles: Sequence[Point]
+            Positions of tiles to get.
+
+        Returns
+        ----------
+        list[bytes]
+            Tiles, in the order of the positions.
+        """
+        indices = [tile.y * self._tiled_width + tile.x for tile in tiles]
+        ranges = [(self._offsets[index], self._lengths[index]) for index in indices]
+        runs = plan_byte_runs(ranges, self._reader.max_gap)
+        result: list[bytes] = [b""] * len(ranges)
+        for run, data in zip(runs, self._reader.read_runs(runs), strict=True):
+            for index in run.indices:
+                offset, length = ranges[index]
+                start = offset - run.start
+                if self._prefix is None:
+                    result[index] = bytes(data[start : start + length])
+                else:
+                    result[index] = b"".join(
+                        (
+                            self._prefix,
+                            data[start + self._scan_offset : start + length],
+                        )
+                    )
+        return result
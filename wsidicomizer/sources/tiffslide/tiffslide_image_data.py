@@ -14,7 +14,12 @@
 
 """Image data for tiffslide compatible file."""
 
+from collections.abc import Iterable, Iterator
+
 import numpy as np
+from opentile.jpeg import Jpeg, JpegProcess
+from pydicom.uid import JPEGBaseline8Bit
+from tifffile import COMPRESSION, TiffPage
 from tiffslide import TiffSlide
 from wsidicom.codec import Encoder
 from wsidicom.errors import WsiDicomNotFoundError
@@ -22,6 +27,10 @@ from wsidicom.geometry import Point, Region, Size
 from wsidicom.metadata import Image as ImageMetadata
 
 from wsidicomizer.sources.openslide_like import OpenSlideLikeLevelImageData
+from wsidicomizer.sources.opentile.tile_passthrough import (
+    ByteRangeReader,
+    TilePassthrough,
+)
 
 
 class TiffSlideLevelImageData(OpenSlideLikeLevelImageData):
@@ -35,6 +44,7 @@ class TiffSlideLevelImageData(OpenSlideLikeLevelImageData):
         level_index: int,
         tile_size: int | None,
         encoder: Encoder,
+        byte_range_reader: ByteRangeReader | None = None,
     ):
         """Wraps a TiffSlide level to ImageData.
 
@@ -47,10 +57,26 @@ class TiffSlideLevelImageData(OpenSlideLikeLevelImageData):
         level_index: int
             Level in TiffSlide object to wrap
         tile_size: int
-            Output tile size.
+            Output tile size. If None and the JPEG tiles of the level can be
+            passed through, the tile size of the level is used.
         encoded: Encoder
             Encoder to use.
+        byte_range_reader: ByteRangeReader | None = None
+            Reader for passing through the JPEG tiles of the level by byte range,
+            if they are baseline JPEG matching the encoder and aligned with the
+            output tiles. If None, tiles are always re-encoded.
         """
+        page = self._get_level_page(tiff_slide, level_index)
+        if (
+            tile_size is None
+            and byte_range_reader is not None
+            and offset is None
+            and size is None
+            and page is not None
+            and page.compression == COMPRESSION.JPEG
+            and page.tilewidth == page.tilelength
+        ):
+            tile_size = page.tilewidth
         super().__init__(
             blank_color,
             offset,
@@ -61,6 +87,7 @@ class TiffSlideLevelImageData(OpenSlideLikeLevelImageData):
             level_index,
             tile_size,
             encoder,
+            self._get_native_tile_size(tiff_slide.properties, "tiffslide", level_index),
         )
         self._slide = tiff_slide
         axes = self._slide.properties["tiffslide.series-axes"]
@@ -68,6 +95,29 @@ class TiffSlideLevelImageData(OpenSlideLikeLevelImageData):
             self._samples_per_pixel = 1
         else:
             self._samples_per_pixel = 3
+        self._tile_passthrough = None
+        if (
+            byte_range_reader is not None
+            and offset is None
+            and size is None
+            and page is not None
+        ):
+            self._tile_passthrough = self._create_tile_passthrough(
+                page, byte_range_reader
+            )
+
+    @property
+    def transcoder(self) -> Encoder | None:
+        """Only return encoder if tiles are not passed through."""
+        if self._tile_passthrough is not None:
+            return None
+        return self.encoder
+
+    @property
+    def passthrough(self) -> bool:
+        """Return true if the JPEG tiles of the level are passed through without
+        re-encoding."""
+        return self._tile_passthrough is not None
 
     @property
     def samples_per_pixel(self) -> int:
@@ -101,32 +151,43 @@ class TiffSlideLevelImageData(OpenSlideLikeLevelImageData):
             return self._get_blank_decoded_frame(region.size)
         return image_data
 
-    def _get_region(self, region: Region) -> np.ndarray | None:
-        """Return Image read from region in tiffslide image. If image data for
-        region is blank, None is returned. Transparent pixels are made into
-        background color
+    def _read_level_region_data(
+        self, location: Point, level_index: int, size: Size
+    ) -> np.ndarray:
+        """Return a region of a native level as read by tiffslide.
 
         Parameters
         ----------
-        region: Region
-            Region to get image for.
+        location: Point
+            Position of the region in the base level.
+        level_index: int
+            Index of the native level to read from.
+        size: Size
+            Size of the region in the native level.
 
         Returns
         ----------
-        Optional[np.ndarray]
-            Image data of region, or None if region is blank.
+        np.ndarray
+            Region data, with samples on the last axis.
         """
-        if region.size.width < 0 or region.size.height < 0:
-            raise ValueError("Negative size not allowed")
+        return self._slide.read_region(
+            location.to_tuple(), level_index, size.to_tuple(), as_array=True
+        )
 
-        location_in_base_level = region.start * self._downsample + self._offset
+    def _get_tile_pixels(self, region_data: np.ndarray) -> np.ndarray | None:
+        """Return the pixels of region data. If the region data is blank, None is
+        returned.
 
-        region_data = self._slide.read_region(
-            location_in_base_level.to_tuple(),
-            self._level_index,
-            region.size.to_tuple(),
-            as_array=True,
-        )
+        Parameters
+        ----------
+        region_data: np.ndarray
+            Region data.
+
+        Returns
+        ----------
+        Optional[np.ndarray]
+            Pixels of region data, or None if region data is blank.
+        """
         if self._detect_blank_tile(region_data):
             return None
         if self.samples_per_pixel == 1:
@@ -155,11 +216,24 @@ class TiffSlideLevelImageData(OpenSlideLikeLevelImageData):
             raise WsiDicomNotFoundError(f"focal plane {z}", str(self))
         if path not in self.optical_paths:
             raise WsiDicomNotFoundError(f"optical path {path}", str(self))
+        if self._tile_passthrough is not None:
+            return self._tile_passthrough.get_tiles([tile])[0]
         decoded = self._get_region(Region(tile * self.tile_size, self.tile_size))
         if decoded is None:
             return self._get_blank_encoded_frame(self.tile_size)
         return self.encoder.encode(decoded)
 
+    def get_encoded_tiles(
+        self, tiles: Iterable[Point], z: float, path: str
+    ) -> Iterator[bytes]:
+        if self._tile_passthrough is None:
+            return super().get_encoded_tiles(tiles, z, path)
+        if z not in self.focal_planes:
+            raise WsiDicomNotFoundError(f"focal plane {z}", str(self))
+        if path not in self.optical_paths:
+            raise WsiDicomNotFoundError(f"optical path {path}", str(self))
+        return iter(self._tile_passthrough.get_tiles(list(tiles)))
+
     def get_decoded_tile(
         self,
         tile_point: Point,
@@ -192,6 +266,51 @@ class TiffSlideLevelImageData(OpenSlideLikeLevelImageData):
             return self._get_blank_decoded_frame(self.tile_size)
         return tile
 
+    def _create_tile_passthrough(
+        self, page: TiffPage, byte_range_reader: ByteRangeReader
+    ) -> TilePassthrough | None:
+        """Return passthrough for the JPEG tiles of the page if they are aligned
+        with the output tiles and are baseline JPEG compatible with the encoder,
+        so that they can be passed through without re-encoding. Otherwise return
+        None."""
+        if (
+            Size(page.tilewidth, page.tilelength) != self.tile_size
+            or Size(page.imagewidth, page.imagelength) != self.image_size
+            or page.bitspersample != 8
+            or self.encoder.transfer_syntax != JPEGBaseline8Bit
+        ):
+            return None
+        tile_passthrough = TilePassthrough.from_page(page, byte_range_reader)
+        if tile_passthrough is None:
+            return None
+        info = Jpeg.info(tile_passthrough.get_tiles([Point(0, 0)])[0])
+        if (
+            info.process != JpegProcess.BASELINE
+            or info.bit_depth != 8
+            or info.components != self.samples_per_pixel
+        ):
+            return None
+        # Blank tiles are encoded, and must match the passed through tiles.
+        if (
+            self._get_jpeg_photometric_interpretation(info)
+            != self.photometric_interpretation
+        ):
+            return None
+        return tile_passthrough
+
+    @staticmethod
+    def _get_level_page(tiff_slide: TiffSlide, level_index: int) -> TiffPage | None:
+        """Return the page holding the level, or None if the level is not held by
+        a single page."""
+        series_index = tiff_slide.properties["tiffslide.series-index"]
+        level = tiff_slide.ts_tifffile.series[series_index].levels[level_index]
+        if len(level.pages) != 1:
+            return None
+        page = level.pages[0]
+        if not isinstance(page, TiffPage):
+            return None
+        return page
+
     def _detect_blank_tile2(self, data: np.ndarray) -> bool:
         """Detect if tile data is a blank tile, i.e. either has full
         transparency or is filled with background color. First checks if the
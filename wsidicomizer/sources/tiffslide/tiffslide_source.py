@@ -45,6 +45,8 @@ from wsidicomizer.sources.openslide_like import (
 from wsidicomizer.sources.openslide_like.openslide_like_metadata import (
     OpenSlideLikeMetadata,
 )
+from wsidicomizer.sources.opentile.block_cache import get_block_cached_path
+from wsidicomizer.sources.opentile.tile_passthrough import create_byte_range_reader
 from wsidicomizer.sources.tiffslide.tiffslide_image_data import (
     TiffSlideLevelImageData,
 )
@@ -72,10 +74,14 @@ class TiffSlideSource(OpenSlideLikeSource):
         filepath: UPath
             Path to the file.
         encoder: Encoder | None
-            Encoder to use. Pyramid is always re-encoded using the encoder.
-            If None, the source picks a default matching its pixel format.
+            Encoder to use. Levels of baseline JPEG tiles matching the encoder
+            and the tile size are passed through, other levels are re-encoded
+            using the encoder. If None, the source picks a default matching its
+            pixel format.
         tile_size: Optional[int] = None,
-            Tile size to use. If None, the default tile size is used.
+            Tile size to use. If None, the tile size of levels of JPEG tiles
+            that can be passed through, otherwise the default tile size, is
+            used.
         metadata: Optional[WsiMetadata] = None
             User-specified metadata that will overload metadata from source image file.
         default_metadata: Optional[WsiMetadata] = None
@@ -95,50 +101,62 @@ class TiffSlideSource(OpenSlideLikeSource):
             Options forwarded to the fsspec filesystem when reading a fsspec
             path. Ignored by sources that only read local files.
         """
+        cached_filepath, cached_file_options = get_block_cached_path(
+            filepath, file_options
+        )
         # TiffSlide reads an UPath, but types its path parameter without it.
         self._tiffslide = TiffSlide(
-            filepath,  # pyright: ignore[reportArgumentType]
-            storage_options=file_options,
+            cached_filepath,  # pyright: ignore[reportArgumentType]
+            storage_options=cached_file_options,
             **source_args,
         )
-        properties = OpenSlideLikeProperties(
-            background_color=self._tiffslide.properties.get(
-                PROPERTY_NAME_BACKGROUND_COLOR
-            ),
-            bounds_x=self._tiffslide.properties.get(PROPERTY_NAME_BOUNDS_X),
-            bounds_y=self._tiffslide.properties.get(PROPERTY_NAME_BOUNDS_Y),
-            bounds_height=self._tiffslide.properties.get(PROPERTY_NAME_BOUNDS_HEIGHT),
-            bounds_width=self._tiffslide.properties.get(PROPERTY_NAME_BOUNDS_WIDTH),
-            objective_power=self._tiffslide.properties.get(
-                PROPERTY_NAME_OBJECTIVE_POWER
-            ),
-            vendor=self._tiffslide.properties.get(PROPERTY_NAME_VENDOR),
-            mpp_x=self._tiffslide.properties.get(PROPERTY_NAME_MPP_X),
-            mpp_y=self._tiffslide.properties.get(PROPERTY_NAME_MPP_Y),
-            raw_properties=dict(self._tiffslide.properties),
-        )
+        self._byte_range_reader = create_byte_range_reader(filepath, file_options)
+        try:
+            properties = OpenSlideLikeProperties(
+                background_color=self._tiffslide.properties.get(
+                    PROPERTY_NAME_BACKGROUND_COLOR
+                ),
+                bounds_x=self._tiffslide.properties.get(PROPERTY_NAME_BOUNDS_X),
+                bounds_y=self._tiffslide.properties.get(PROPERTY_NAME_BOUNDS_Y),
+                bounds_height=self._tiffslide.properties.get(
+                    PROPERTY_NAME_BOUNDS_HEIGHT
+                ),
+                bounds_width=self._tiffslide.properties.get(PROPERTY_NAME_BOUNDS_WIDTH),
+                objective_power=self._tiffslide.properties.get(
+                    PROPERTY_NAME_OBJECTIVE_POWER
+                ),
+                vendor=self._tiffslide.properties.get(PROPERTY_NAME_VENDOR),
+                mpp_x=self._tiffslide.properties.get(PROPERTY_NAME_MPP_X),
+                mpp_y=self._tiffslide.properties.get(PROPERTY_NAME_MPP_Y),
+                raw_properties=dict(self._tiffslide.properties),
+            )
 
-        super().__init__(
-            filepath=filepath,
-            properties=properties,
-            level_downsamples=self._tiffslide.level_downsamples,
-            level_dimensions=self._tiffslide.level_dimensions,
-            associated_images=self._tiffslide.associated_images,
-            base_metadata=OpenSlideLikeMetadata(
-                properties, self._tiffslide.color_profile
-            ),
-            encoder=encoder,
-            tile_size=tile_size,
-            metadata=metadata,
-            default_metadata=default_metadata,
-            include_confidential=include_confidential,
-            metadata_post_processor=metadata_post_processor,
-            metadata_pre_processor=metadata_pre_processor,
-            uid_generator=uid_generator,
-        )
+            super().__init__(
+                filepath=filepath,
+                properties=properties,
+                level_downsamples=self._tiffslide.level_downsamples,
+                level_dimensions=self._tiffslide.level_dimensions,
+                associated_images=self._tiffslide.associated_images,
+                base_metadata=OpenSlideLikeMetadata(
+                    properties, self._tiffslide.color_profile
+                ),
+                encoder=encoder,
+                tile_size=tile_size,
+                metadata=metadata,
+                default_metadata=default_metadata,
+                include_confidential=include_confidential,
+                metadata_post_processor=metadata_post_processor,
+                metadata_pre_processor=metadata_pre_processor,
+                uid_generator=uid_generator,
+            )
+        except BaseException:
+            self._byte_range_reader.close()
+            self._tiffslide.close()
+            raise
 
     def close(self):
         self._tiffslide.close()
+        self._byte_range_reader.close()
 
     @property
     def _pixel_format(self) -> tuple[Channels, int]:
@@ -173,4 +191,5 @@ class TiffSlideSource(OpenSlideLikeSource):
             level_index,
             self._tile_size,
             self._encoder,
+            self._byte_range_reader,
         )
@@ -76,6 +76,7 @@ class WsiDicomizer(WsiDicom):
         file_options: dict[str, Any] | None = None,
         *,
         settings: Settings | None = None,
+        add_scaled_levels: bool = False,
         **source_args,
     ) -> WsiDicom:
         """Open data in file in filepath as WsiDicom.
@@ -114,6 +115,10 @@ class WsiDicomizer(WsiDicom):
             path (e.g. credentials). Ignored by sources that read local files.
         settings: Settings | None = None
             Settings to use for this object instead of the process-wide default.
+        add_scaled_levels: bool = False
+            If to add the dyadic levels missing above levels of stored baseline
+            JPEG tiles (up to a scale of 8), decoded downscaled from the JPEG
+            level.
         **source_args
             Optional keyword args to pass to source.
 
@@ -144,6 +149,8 @@ class WsiDicomizer(WsiDicom):
                 metadata_pre_processor=metadata_pre_processor,
                 **source_args,
             )
+            if add_scaled_levels:
+                source.add_scaled_levels()
             return cls(source, True, settings=settings)
 
     @classmethod
@@ -200,7 +207,10 @@ class WsiDicomizer(WsiDicom):
             Generator used to populate UIDs on the metadata if not already set and to
             generate UIDs for created instances.
         add_missing_levels: bool = False
-            If to add missing dyadic levels up to the single tile level.
+            If to add missing dyadic levels up to the single tile level. Levels
+            up to a scale of 8 above levels of stored baseline JPEG tiles are
+            decoded downscaled from the JPEG level, other levels are generated by
+            downsampling.
         regenerate_pyramid: bool = False
             If True, only the base level is read from the source and every
             other written level is re-derived by downsampling from the base.
@@ -295,6 +305,7 @@ class WsiDicomizer(WsiDicom):
                 uid_generator,
                 file_options,
                 settings=settings,
+                add_scaled_levels=add_missing_levels and not regenerate_pyramid,
                 **source_args,
             ) as wsi,
         ):